@@ -0,0 +1,67 @@
+"""
+A local stand-in for the geolocation API, answering every address with the same
+location after a configurable delay.
+"""
+
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+import json
+import threading
+import time
+
+
+RESPONSE = json.dumps({"countryName": "USA", "regionName": "FLORIDA", "cityName": "MIAMI"}).encode()
+
+
+class StandInServer:
+    def __init__(self, latency: float = 0.0):
+        """
+        Starts a threaded HTTP server on a free localhost port.
+
+        Args:
+            latency (float, optional): Seconds every response is delayed by. Defaults to 0.
+        """
+        self.latency = latency
+        self.requests = 0
+        self._lock = threading.Lock()
+        server = self
+
+        class Handler(BaseHTTPRequestHandler):
+            protocol_version = "HTTP/1.1"
+            # Headers and body leave in one segment, so keep-alive clients do not wait for delayed ACKs.
+            wbufsize = 65536
+            disable_nagle_algorithm = True
+
+            def do_GET(self):
+                with server._lock:
+                    server.requests += 1
+                if server.latency:
+                    time.sleep(server.latency)
+                self.send_response(200)
+                self.send_header("Content-Type", "application/json")
+                self.send_header("Content-Length", str(len(RESPONSE)))
+                self.end_headers()
+                self.wfile.write(RESPONSE)
+
+            def log_message(self, format, *args):
+                pass
+
+        self._server = ThreadingHTTPServer(("127.0.0.1", 0), Handler)
+        self._server.daemon_threads = True
+        self._thread = threading.Thread(target=self._server.serve_forever, daemon=True)
+        self._thread.start()
+
+    @property
+    def base_url(self) -> str:
+        host, port = self._server.server_address[:2]
+        return f"http://{host}:{port}/api/json"
+
+    def __enter__(self) -> "StandInServer":
+        return self
+
+    def __exit__(self, *exc_info):
+        self.close()
+
+    def close(self):
+        self._server.shutdown()
+        self._server.server_close()
@@ -0,0 +1,79 @@
+"""
+Measures the memory per account, the deposit throughput and the rounding error of
+float balances and of integer minor-unit balances.
+
+The instance layout compares an account, which declares __slots__, with an object
+keeping the same attributes in an instance dict.
+
+Usage:
+    python -m benchmarks.bench_account_memory [--accounts N] [--operations N]
+"""
+
+from typing import Callable
+
+import argparse
+import sys
+import time
+import tracemalloc
+
+from dfm18.bank_account import BankAccount, MinorUnitsBankAccount, SimpleBankAccount
+
+
+class DictLayout:
+    def __init__(self, account: SimpleBankAccount):
+        for name in SimpleBankAccount.__slots__:
+            if name != "__weakref__":
+                setattr(self, name, getattr(account, name))
+
+
+def instance_bytes(instance: object) -> int:
+    size = sys.getsizeof(instance)
+    if hasattr(instance, "__dict__"):
+        size += sys.getsizeof(instance.__dict__)
+    return size
+
+
+def bytes_per_account(account_type: Callable[[], BankAccount], accounts: int) -> float:
+    tracemalloc.start()
+    try:
+        start = tracemalloc.get_traced_memory()[0]
+        created = [account_type() for _ in range(accounts)]
+        size = tracemalloc.get_traced_memory()[0] - start
+    finally:
+        tracemalloc.stop()
+    del created
+    return size / accounts
+
+
+def deposits_per_second(account: BankAccount, operations: int) -> float:
+    start = time.perf_counter()
+    for _ in range(operations):
+        account.deposit(0.01)
+    return operations / (time.perf_counter() - start)
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--accounts", type=int, default=10_000)
+    parser.add_argument("--operations", type=int, default=200_000)
+    args = parser.parse_args()
+
+    account = SimpleBankAccount()
+    print("instance layout")
+    print(f"  __slots__      {instance_bytes(account):6d} bytes")
+    print(f"  instance dict  {instance_bytes(DictLayout(account)):6d} bytes")
+
+    expected = round(args.operations * 0.01, 2)
+    print()
+    print(f"{'account':24} {'bytes/account':>14} {'deposits/s':>12} {'balance error':>14}")
+    for account_type in (SimpleBankAccount, MinorUnitsBankAccount):
+        size = bytes_per_account(account_type, args.accounts)
+        account = account_type()
+        rate = deposits_per_second(account, args.operations)
+        error = account.get_balance() - expected
+        print(f"{account_type.__name__:24} {size:14.0f} {rate:12.0f} {error:14.3g}")
+    print(f"(balance error after {args.operations} deposits of 0.01)")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,72 @@
+"""
+Measures the memory and the bulk deposit throughput of an AccountStore against a list of
+SimpleBankAccount objects holding the same balances.
+
+The store keeps every balance in one int64 array and deposits into many accounts with
+one deposit_many call; the list deposits into every account with its own call. Account
+logging is disabled, so it does not dominate the per-account deposits.
+
+Usage:
+    python -m benchmarks.bench_account_store [--accounts N] [--repeat N]
+"""
+
+from typing import Callable, Tuple
+
+import argparse
+import logging
+import time
+import tracemalloc
+
+from dfm18.bank_account import AccountStore, SimpleBankAccount
+
+
+def traced(create: Callable[[], object]) -> Tuple[object, int]:
+    tracemalloc.start()
+    try:
+        created = create()
+        size = tracemalloc.get_traced_memory()[0]
+    finally:
+        tracemalloc.stop()
+    return created, size
+
+
+def best_seconds(function: Callable[[], object], repeat: int) -> float:
+    best = float("inf")
+    for _ in range(repeat):
+        start = time.perf_counter()
+        function()
+        best = min(best, time.perf_counter() - start)
+    return best
+
+
+def create_store(accounts: int) -> AccountStore:
+    store = AccountStore()
+    for _ in range(accounts):
+        store.add_account(balance=100)
+    return store
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--accounts", type=int, default=100_000)
+    parser.add_argument("--repeat", type=int, default=5)
+    args = parser.parse_args()
+
+    logging.disable(logging.INFO)
+    store, store_bytes = traced(lambda: create_store(args.accounts))
+    accounts, list_bytes = traced(lambda: [SimpleBankAccount(balance=100) for _ in range(args.accounts)])
+
+    indices = list(range(args.accounts))
+    store_seconds = best_seconds(lambda: store.deposit_many(indices, 0.01), args.repeat)
+    list_seconds = best_seconds(lambda: [account.deposit(0.01) for account in accounts], args.repeat)
+
+    print(f"{'':26} {'bytes/account':>14} {'deposits/s':>12}")
+    for name, size, seconds in (
+        ("AccountStore", store_bytes, store_seconds),
+        ("list of SimpleBankAccount", list_bytes, list_seconds),
+    ):
+        print(f"{name:26} {size / args.accounts:14.0f} {args.accounts / seconds:12.0f}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,62 @@
+"""
+Measures the throughput of AccrualEngine.compute from 1 to N processes.
+
+Every run computes the accruals of the same random balances; runs with more than one
+process include starting their pool, so with few balances or few CPUs the pool can be
+slower than the serial run. Results are checked against the serial run. The end-to-end
+accrue_store of an AccountStore holding the balances is reported for reference.
+
+Usage:
+    python -m benchmarks.bench_accrual_engine [--balances N] [--max-processes N] [--chunk-size N]
+"""
+
+import argparse
+import os
+import random
+import time
+
+from dfm18.bank_account import AccountStore, AccrualEngine, RateSchedule
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--balances", type=int, default=2_000_000)
+    parser.add_argument("--max-processes", type=int, default=os.cpu_count() or 1)
+    parser.add_argument("--chunk-size", type=int, default=65536)
+    args = parser.parse_args()
+
+    schedule = RateSchedule([(0, 0.001), (1000, 0.002), (10_000, 0.003)], fee=1, fee_waiver_balance=5000)
+    balances = [random.randrange(0, 5_000_000) for _ in range(args.balances)]
+
+    print(f"{os.cpu_count()} CPUs, {args.balances} balances")
+    expected = None
+    serial_seconds = None
+    # Powers of two up to --max-processes, and --max-processes itself.
+    counts = [1 << power for power in range(max(args.max_processes, 1).bit_length())]
+    if counts[-1] < args.max_processes:
+        counts.append(args.max_processes)
+    for processes in counts:
+        engine = AccrualEngine(schedule, processes=processes, chunk_size=args.chunk_size)
+        start = time.perf_counter()
+        accruals = engine.compute(balances)
+        elapsed = time.perf_counter() - start
+
+        if expected is None:
+            expected, serial_seconds = accruals, elapsed
+        assert accruals == expected
+        print(
+            f"{f'compute, {processes} processes':24} {args.balances / elapsed:12.0f} accounts/s"
+            f" ({serial_seconds / elapsed:.2f}x serial)"
+        )
+
+    store = AccountStore()
+    for balance in balances:
+        store.add_account(balance=balance / 100)
+    start = time.perf_counter()
+    result = AccrualEngine(schedule, chunk_size=args.chunk_size).accrue_store(store)
+    elapsed = time.perf_counter() - start
+    print(f"{'accrue_store, 1 process':24} {args.balances / elapsed:12.0f} accounts/s ({result.applied} applied)")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,73 @@
+"""
+Measures applying a batch of deposits and withdrawals with apply_batch against calling
+deposit and withdraw once per operation.
+
+The account has a WithdrawalTimeRestrictionPolicy, which evaluates a batch at once, and
+a policy without apply_batch, which is applied to every amount of a batch. Account logs
+are discarded, so only the operations and their policies are measured.
+
+Usage:
+    python -m benchmarks.bench_apply_batch [--operations N] [--repeat N]
+"""
+
+from typing import Callable, List, Tuple
+
+import argparse
+import logging
+import timeit
+
+from dfm18.bank_account import BankAccount, SimpleBankAccount
+from dfm18.bank_account.policies import PolicyOperation, WithdrawalTimeRestrictionPolicy
+
+
+class MaxAmountPolicy:
+    def __init__(self, max_amount: float):
+        self.max_amount = max_amount
+
+    def apply(self, account: BankAccount, amount: float):
+        if amount > self.max_amount:
+            raise ValueError("Amount over the limit")
+
+    def supports(self, operation: PolicyOperation) -> bool:
+        return True
+
+
+def per_call_loop(account: SimpleBankAccount, ops: List[Tuple[PolicyOperation, float]]):
+    for operation, amount in ops:
+        if operation == PolicyOperation.DEPOSIT:
+            account.deposit(amount)
+        else:
+            account.withdraw(amount)
+
+
+def best_ns_per_op(function: Callable[[], object], operations: int, repeat: int) -> float:
+    return min(timeit.repeat(function, number=1, repeat=repeat)) / operations * 1e9
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--operations", type=int, default=100_000)
+    parser.add_argument("--repeat", type=int, default=5)
+    args = parser.parse_args()
+
+    logging.disable(logging.INFO)
+    policies = [WithdrawalTimeRestrictionPolicy(0, 24, clock=lambda: 12), MaxAmountPolicy(1000)]
+    account = SimpleBankAccount(balance=1_000_000, policies=policies)
+    operations = (PolicyOperation.DEPOSIT, PolicyOperation.WITHDRAW)
+
+    print(f"{'batch size':>10} {'per call':>12} {'apply_batch':>12}")
+    for size in (1, 10, 100, 1000):
+        ops = [(operations[index % 2], 1) for index in range(size)]
+        batches = max(args.operations // size, 1)
+        loop_ns = best_ns_per_op(
+            lambda: [per_call_loop(account, ops) for _ in range(batches)], batches * size, args.repeat
+        )
+        batch_ns = best_ns_per_op(
+            lambda: [account.apply_batch(ops) for _ in range(batches)], batches * size, args.repeat
+        )
+        print(f"{size:10d} {loop_ns:9.0f} ns {batch_ns:9.0f} ns")
+    print("(per operation)")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,60 @@
+"""
+Measures the element-wise calculator operations against a loop of scalar calls.
+
+Operands are lists of integers; divisors are never zero, except in the run of
+divide_elementwise with zero_division over divisors of which one is zero.
+
+Usage:
+    python -m benchmarks.bench_calculator [--size N] [--repeat N]
+"""
+
+from typing import Callable
+
+import argparse
+import random
+import timeit
+
+from dfm18 import calculator
+
+
+def best_ns_per_element(function: Callable[[], object], size: int, repeat: int) -> float:
+    return min(timeit.repeat(function, number=1, repeat=repeat)) / size * 1e9
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--size", type=int, default=1_000_000)
+    parser.add_argument("--repeat", type=int, default=5)
+    args = parser.parse_args()
+
+    dividends = [random.randrange(1, 1_000_000) for _ in range(args.size)]
+    divisors = [random.randrange(1, 1000) for _ in range(args.size)]
+    with_zero = divisors[:-1] + [0]
+
+    print(f"{'operation':40} {'scalar loop':>14} {'elementwise':>14}")
+    for name, scalar, elementwise, operand in (
+        ("add", calculator.add, calculator.add_elementwise, divisors),
+        ("divide", calculator.divide, calculator.divide_elementwise, divisors),
+        (
+            "divide, zero_division=0",
+            lambda a, b: calculator.divide(a, b) if b else 0,
+            lambda a, b: calculator.divide_elementwise(a, b, zero_division=0),
+            divisors,
+        ),
+        (
+            "divide, zero_division=0, one zero divisor",
+            lambda a, b: calculator.divide(a, b) if b else 0,
+            lambda a, b: calculator.divide_elementwise(a, b, zero_division=0),
+            with_zero,
+        ),
+    ):
+        scalar_ns = best_ns_per_element(
+            lambda: [scalar(a, b) for a, b in zip(dividends, operand)], args.size, args.repeat
+        )
+        elementwise_ns = best_ns_per_element(lambda: elementwise(dividends, operand), args.size, args.repeat)
+        print(f"{name:40} {scalar_ns:11.1f} ns {elementwise_ns:11.1f} ns")
+    print("(per element)")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,86 @@
+"""
+Measures adaptive evaluation order of composite policies over a mixed policy set.
+
+The set lists two expensive checks that rarely reject before two cheap ones, one of which
+rejects 40% of the withdrawals. AllOfPolicy and AnyOfPolicy evaluate it in the given
+order (reorder_interval=0) and with adaptive reordering, over the same random amounts;
+both orders reject the same withdrawals, which is checked.
+
+Usage:
+    python -m benchmarks.bench_composite_policies [--withdrawals N] [--reorder-interval N]
+"""
+
+from typing import Callable, List, Sequence, Tuple, Type
+
+import argparse
+import random
+import time
+
+from dfm18.bank_account import BankAccount, SimpleBankAccount
+from dfm18.bank_account.policies import AllOfPolicy, AnyOfPolicy, Policy, PolicyOperation
+
+
+class CheckPolicy(Policy):
+    def __init__(self, name: str, work: int, rejects: Callable[[float], bool]):
+        self.name = name
+        self.work = work
+        self.rejects = rejects
+
+    def apply(self, account: BankAccount, amount: float):
+        # Stands in for the cost of the check, such as a scoring model or a lookup.
+        for _ in range(self.work):
+            pass
+        if self.rejects(amount):
+            raise ValueError(f"Rejected by {self.name}")
+
+    def supports(self, operation: PolicyOperation) -> bool:
+        return operation == PolicyOperation.WITHDRAW
+
+    def __repr__(self) -> str:
+        return self.name
+
+
+def mixed_policies() -> List[Policy]:
+    return [
+        CheckPolicy("fraud score", 2000, lambda amount: amount > 99),
+        CheckPolicy("geo check", 1000, lambda amount: amount % 50 == 0),
+        CheckPolicy("blocklist", 0, lambda amount: False),
+        CheckPolicy("amount limit", 0, lambda amount: amount > 60),
+    ]
+
+
+def evaluate(
+    composite_type: Type[Policy], amounts: Sequence[int], reorder_interval: int
+) -> Tuple[float, List[bool], Policy]:
+    policy = composite_type(mixed_policies(), PolicyOperation.WITHDRAW, reorder_interval=reorder_interval)
+    account = SimpleBankAccount()
+    rejected = []
+    start = time.perf_counter()
+    for amount in amounts:
+        try:
+            policy.apply(account, amount)
+            rejected.append(False)
+        except ValueError:
+            rejected.append(True)
+    return (time.perf_counter() - start) / len(amounts) * 1e6, rejected, policy
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--withdrawals", type=int, default=50_000)
+    parser.add_argument("--reorder-interval", type=int, default=1000)
+    args = parser.parse_args()
+
+    amounts = [random.randint(1, 100) for _ in range(args.withdrawals)]
+    for composite_type in (AllOfPolicy, AnyOfPolicy):
+        fixed_us, fixed_rejected, _ = evaluate(composite_type, amounts, 0)
+        adaptive_us, adaptive_rejected, policy = evaluate(composite_type, amounts, args.reorder_interval)
+        assert fixed_rejected == adaptive_rejected
+
+        print(f"{composite_type.__name__}, {sum(fixed_rejected) / len(amounts):.0%} rejected")
+        print(f"  given order     {fixed_us:8.2f} us/withdrawal")
+        print(f"  adaptive order  {adaptive_us:8.2f} us/withdrawal, ends as {list(policy.policies)}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,73 @@
+"""
+Measures a fee expression built with dfm18.expression against the same nested calculator
+calls written by hand.
+
+The fee repeats its subexpressions, as fee formulas chained from calculator calls do.
+Hand-written calls compute them every time, the compiled expression once per row, and
+evaluate reuses memoized results for repeated variable values. Rows hold integer
+amounts, so every result is checked against the nested calls.
+
+Usage:
+    python -m benchmarks.bench_expression [--rows N] [--distinct N] [--repeat N]
+"""
+
+from typing import Callable, Dict, List
+
+import argparse
+import random
+import timeit
+
+from dfm18.calculator import add, divide, multiply, subtract
+from dfm18.expression import Expression, variable
+
+
+def nested_fee(amount: int, rate: int, base: int) -> int:
+    return add(
+        subtract(
+            multiply(add(amount, base), rate),
+            divide(multiply(add(amount, base), rate), 100),
+        ),
+        divide(multiply(add(multiply(add(amount, base), rate), base), 3), add(rate, 1)),
+    )
+
+
+def fee_expression() -> Expression:
+    amount, rate, base = variable("amount"), variable("rate"), variable("base")
+    gross = (amount + base) * rate
+    return gross - gross // 100 + (gross + base) * 3 // (rate + 1)
+
+
+def best_us_per_row(function: Callable[[], object], rows: int, repeat: int) -> float:
+    return min(timeit.repeat(function, number=1, repeat=repeat)) / rows * 1e6
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--rows", type=int, default=100_000)
+    parser.add_argument("--distinct", type=int, default=1000, help="Distinct rows, repeated to --rows rows.")
+    parser.add_argument("--repeat", type=int, default=5)
+    args = parser.parse_args()
+
+    distinct = [
+        {"amount": random.randrange(1, 10_000), "rate": random.randrange(1, 20), "base": random.randrange(100)}
+        for _ in range(args.distinct)
+    ]
+    rows: List[Dict[str, int]] = [distinct[index % args.distinct] for index in range(args.rows)]
+    compiled = fee_expression().compile()
+
+    expected = [nested_fee(**row) for row in rows]
+    assert compiled.evaluate_rows(rows) == expected
+    assert [compiled.evaluate(row) for row in rows] == expected
+
+    print(f"{len(compiled)} calculator calls per compiled evaluation, 13 per nested evaluation")
+    timings = {
+        "nested calls": lambda: [nested_fee(**row) for row in rows],
+        "evaluate, memoized": lambda: [compiled.evaluate(row) for row in rows],
+        "evaluate_rows": lambda: compiled.evaluate_rows(rows),
+    }
+    for name, function in timings.items():
+        print(f"{name:20} {best_us_per_row(function, args.rows, args.repeat):8.3f} us/row")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,77 @@
+"""
+Measures FreeIpClient against bare requests.get calls through a local stand-in API.
+
+Login events repeat addresses, so every address appears --repeats times. Bare calls open
+a connection per request and fetch every event; the client reuses pooled connections,
+fetches every distinct address once, and get_locations fans the requests out over
+--workers threads. A last run shows the same events answered from the cache.
+
+Usage:
+    python -m benchmarks.bench_free_ip_client [--ips N] [--repeats N] [--latency SECONDS] [--workers N]
+"""
+
+from typing import Callable, List
+
+import argparse
+import asyncio
+import random
+import time
+
+import requests
+
+from free_ip_client import FreeIpClient
+
+from benchmarks._server import StandInServer
+
+
+def bare_calls(server: StandInServer, events: List[str]):
+    for ip in events:
+        response = requests.get(f"{server.base_url}/{ip}", timeout=10)
+        response.raise_for_status()
+        response.json()
+
+
+def report(name: str, server: StandInServer, events: List[str], function: Callable[[], object]):
+    requests_before = server.requests
+    start = time.perf_counter()
+    function()
+    elapsed = time.perf_counter() - start
+    print(
+        f"{name:32} {elapsed:8.3f} s {len(events) / elapsed:10.0f} events/s"
+        f" {server.requests - requests_before:6d} API requests"
+    )
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--ips", type=int, default=200, help="Distinct addresses.")
+    parser.add_argument("--repeats", type=int, default=5, help="Events per address.")
+    parser.add_argument("--latency", type=float, default=0.01, help="Seconds the stand-in API takes to answer.")
+    parser.add_argument("--workers", type=int, default=8)
+    args = parser.parse_args()
+
+    ips = [f"10.0.{index >> 8 & 255}.{index & 255}" for index in range(args.ips)]
+    events = ips * args.repeats
+    random.shuffle(events)
+
+    with StandInServer(args.latency) as server:
+        report("bare requests.get", server, events, lambda: bare_calls(server, events))
+
+        with FreeIpClient(base_url=server.base_url, pool_size=args.workers, max_workers=args.workers) as client:
+            report("client, get_location", server, events, lambda: [client.get_location(ip) for ip in events])
+
+        with FreeIpClient(base_url=server.base_url, pool_size=args.workers, max_workers=args.workers) as client:
+            report(f"client, get_locations x{args.workers}", server, events, lambda: client.get_locations(events))
+            report("client, get_locations cached", server, events, lambda: client.get_locations(events))
+
+        with FreeIpClient(base_url=server.base_url, pool_size=args.workers, max_workers=args.workers) as client:
+            report(
+                f"client, aget_locations x{args.workers}",
+                server,
+                events,
+                lambda: asyncio.run(client.aget_locations(events)),
+            )
+
+
+if __name__ == "__main__":
+    main()
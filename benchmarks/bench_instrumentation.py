@@ -0,0 +1,61 @@
+"""
+Measures the cost of instrumentation on deposits.
+
+Compares the uninstrumented deposit code, which an account runs directly, with deposits
+of an account without instrumentation, which first test that it has none, and deposits
+of an account with an instrumentation. Account logging is disabled unless --log is
+given, so it does not hide the difference.
+
+Usage:
+    python -m benchmarks.bench_instrumentation [--operations N] [--repeat N] [--log]
+"""
+
+from typing import Callable, Dict
+
+import argparse
+import logging
+import timeit
+
+from dfm18.bank_account import Instrumentation, SimpleBankAccount
+from dfm18.bank_account.policies import PolicyOperation
+
+
+def best_ns_per_op(functions: Dict[str, Callable[[], object]], operations: int, repeat: int) -> Dict[str, float]:
+    # Rounds alternate between the functions, so they all run in the same conditions.
+    best = dict.fromkeys(functions, float("inf"))
+    for _ in range(repeat):
+        for name, function in functions.items():
+            best[name] = min(best[name], timeit.timeit(function, number=operations) / operations * 1e9)
+    return best
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--operations", type=int, default=200_000)
+    parser.add_argument("--repeat", type=int, default=5)
+    parser.add_argument("--log", action="store_true", help="Keep account logging, which dominates a deposit.")
+    args = parser.parse_args()
+
+    if not args.log:
+        logging.disable(logging.INFO)
+    disabled = SimpleBankAccount()
+    enabled = SimpleBankAccount(instrumentation=Instrumentation())
+
+    deposit = PolicyOperation.DEPOSIT
+    timings = best_ns_per_op(
+        {
+            "uninstrumented deposit code": lambda: disabled._apply_operation(deposit, 1),
+            "deposit without instrumentation": lambda: disabled.deposit(1),
+            "deposit with instrumentation": lambda: enabled.deposit(1),
+        },
+        args.operations,
+        args.repeat,
+    )
+
+    baseline_ns = timings["uninstrumented deposit code"]
+    for name, ns in timings.items():
+        print(f"{name + ':':33} {ns:10.0f} ns/op ({ns / baseline_ns - 1:+.1%})")
+
+
+if __name__ == "__main__":
+    main()
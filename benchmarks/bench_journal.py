@@ -0,0 +1,65 @@
+"""
+Measures the write throughput of a TransactionJournal and the time to recover balances
+from it.
+
+Deposits of --accounts accounts are recorded in turn, with a snapshot every
+--snapshot-interval operations of an account. Recovery reads the journal backwards to
+the latest snapshot of an account, so it depends on the snapshot interval and the number
+of accounts, not on the size of the journal; a full scan of the journal is timed for
+comparison. Every record takes 33 bytes, so --records 100000000 needs about 3.3 GB.
+
+Usage:
+    python -m benchmarks.bench_journal [--records N] [--accounts N] [--snapshot-interval N] [--fsync POLICY]
+"""
+
+import argparse
+import os
+import tempfile
+import time
+
+from dfm18.bank_account import FsyncPolicy, RecordKind, TransactionJournal
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--records", type=int, default=2_000_000)
+    parser.add_argument("--accounts", type=int, default=100)
+    parser.add_argument("--snapshot-interval", type=int, default=1000)
+    parser.add_argument("--fsync", choices=[policy.value for policy in FsyncPolicy], default=FsyncPolicy.ON_FLUSH.value)
+    args = parser.parse_args()
+
+    account_ids = [f"account{index}" for index in range(args.accounts)]
+    balances = [0] * args.accounts
+
+    with tempfile.TemporaryDirectory() as directory:
+        path = os.path.join(directory, "journal.bin")
+        with TransactionJournal(
+            path, fsync=FsyncPolicy(args.fsync), snapshot_interval=args.snapshot_interval
+        ) as journal:
+            start = time.perf_counter()
+            for index in range(args.records):
+                account = index % args.accounts
+                balances[account] += 1
+                journal.record(RecordKind.DEPOSIT, account_ids[account], 1, balances[account])
+            journal.flush()
+            elapsed = time.perf_counter() - start
+            size = os.path.getsize(path)
+            print(f"write     {args.records / elapsed:12.0f} records/s, {size / 1e6:.1f} MB in {elapsed:.2f} s")
+
+            start = time.perf_counter()
+            recovered = journal.recover_balance(account_ids[-1])
+            print(f"recover   {(time.perf_counter() - start) * 1e3:12.3f} ms for one account")
+            assert recovered == balances[-1]
+
+            start = time.perf_counter()
+            for account, account_id in enumerate(account_ids):
+                assert journal.recover_balance(account_id) == balances[account]
+            print(f"recover   {time.perf_counter() - start:12.3f} s for all {args.accounts} accounts")
+
+            start = time.perf_counter()
+            records = sum(1 for _ in journal)
+            print(f"scan      {time.perf_counter() - start:12.3f} s for all {records} records")
+
+
+if __name__ == "__main__":
+    main()
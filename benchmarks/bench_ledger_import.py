@@ -0,0 +1,85 @@
+"""
+Measures the throughput and the memory of LedgerImporter on a large generated file.
+
+A CSV or JSON Lines file of deposits and withdrawals over --accounts accounts is written
+first, then imported. The peak resident memory of the process is reported as the import
+progresses: it stays flat while the file is streamed. A CSV row takes about 22 bytes, so
+--rows 100000000 writes a file of about 2.2 GB. Account logging is disabled.
+
+Usage:
+    python -m benchmarks.bench_ledger_import [--rows N] [--accounts N] [--format {csv,jsonl}] [--batch-size N]
+"""
+
+import argparse
+import json
+import logging
+import os
+import resource
+import sys
+import tempfile
+import time
+
+from dfm18.bank_account import ImportProgress, LedgerImporter, SimpleBankAccount
+
+
+def peak_rss_mb() -> float:
+    peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    # Linux reports kilobytes, macOS bytes.
+    return peak / 1e6 if sys.platform == "darwin" else peak / 1e3
+
+
+def write_ledger(path: str, rows: int, accounts: int, format: str):
+    with open(path, "w", newline="") as file:
+        if format == "csv":
+            file.write("account_id,operation,amount\n")
+        for row in range(rows):
+            account_id = f"account{row % accounts}"
+            operation = "withdraw" if row % 3 == 2 else "deposit"
+            amount = row % 100 + 1
+            if format == "csv":
+                file.write(f"{account_id},{operation},{amount}\n")
+            else:
+                file.write(json.dumps({"account_id": account_id, "operation": operation, "amount": amount}) + "\n")
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--rows", type=int, default=5_000_000)
+    parser.add_argument("--accounts", type=int, default=1000)
+    parser.add_argument("--format", choices=["csv", "jsonl"], default="csv")
+    parser.add_argument("--batch-size", type=int, default=10000)
+    args = parser.parse_args()
+
+    logging.disable(logging.INFO)
+    accounts = {
+        f"account{index}": SimpleBankAccount(balance=1_000_000_000, account_id=f"account{index}")
+        for index in range(args.accounts)
+    }
+
+    with tempfile.TemporaryDirectory() as directory:
+        path = os.path.join(directory, f"ledger.{args.format}")
+        start = time.perf_counter()
+        write_ledger(path, args.rows, args.accounts, args.format)
+        size_mb = os.path.getsize(path) / 1e6
+        print(f"wrote {size_mb:.0f} MB in {time.perf_counter() - start:.1f} s, peak RSS {peak_rss_mb():.0f} MB")
+
+        checkpoints = [args.rows * step // 10 for step in range(1, 11)]
+
+        def progress(counters: ImportProgress):
+            if checkpoints and counters.rows_read >= checkpoints[0]:
+                checkpoints.pop(0)
+                print(f"  {counters.rows_read:12d} rows read, peak RSS {peak_rss_mb():8.0f} MB")
+
+        importer = LedgerImporter(accounts, batch_size=args.batch_size, progress=progress)
+        start = time.perf_counter()
+        counters = importer.import_file(path)
+        elapsed = time.perf_counter() - start
+
+    print(
+        f"imported {counters.rows_applied} rows in {elapsed:.1f} s:"
+        f" {counters.rows_read / elapsed:.0f} rows/s, {size_mb / elapsed:.1f} MB/s"
+    )
+
+
+if __name__ == "__main__":
+    main()
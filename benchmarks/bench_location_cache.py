@@ -0,0 +1,83 @@
+"""
+Measures a warm restart with a persistent location cache, and the cost of the cache
+operations of a large SQLite cache.
+
+A client looks up addresses through a local stand-in API, then a new client, as after
+a restart, looks them up again: with a SqliteLocationCache on the same file they are
+all cache hits, with an in-memory LocationCache they are all requested again.
+
+Usage:
+    python -m benchmarks.bench_location_cache [--ips N] [--latency SECONDS] [--rows N]
+"""
+
+from typing import List
+
+import argparse
+import os
+import tempfile
+import time
+
+from free_ip_client import FreeIpClient, LocationCache, LocationCacheBackend, SqliteLocationCache
+
+from benchmarks._server import StandInServer
+
+
+LOCATION = {"country": "USA", "region": "FLORIDA", "city": "MIAMI"}
+
+
+def look_up(server: StandInServer, cache: LocationCacheBackend, ips: List[str], name: str):
+    requests = server.requests
+    with FreeIpClient(base_url=server.base_url, cache=cache) as client:
+        start = time.perf_counter()
+        client.get_locations(ips)
+        elapsed = time.perf_counter() - start
+    print(f"{name:28} {elapsed:8.3f} s, {server.requests - requests:6d} API requests")
+
+
+def cache_operations(path: str, rows: int):
+    with SqliteLocationCache(path, max_size=rows) as cache:
+        # Filled in one transaction, set is timed on the full cache below.
+        with cache._connection as connection:
+            connection.execute("BEGIN")
+            connection.executemany(
+                "INSERT INTO locations VALUES (?, 'USA', 'FLORIDA', 'MIAMI', ?)",
+                (
+                    (f"10.{index >> 16 & 255}.{index >> 8 & 255}.{index & 255}", time.time() + cache.ttl)
+                    for index in range(rows)
+                ),
+            )
+
+        operations = 2000
+        start = time.perf_counter()
+        for index in range(operations):
+            cache.set(f"11.0.{index >> 8 & 255}.{index & 255}", LOCATION)
+        set_ms = (time.perf_counter() - start) / operations * 1e3
+        start = time.perf_counter()
+        for index in range(operations):
+            cache.get(f"10.0.{index >> 8 & 255}.{index & 255}")
+        get_ms = (time.perf_counter() - start) / operations * 1e3
+    print(f"full cache of {rows} rows: set {set_ms:.3f} ms, get {get_ms:.3f} ms")
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--ips", type=int, default=2000)
+    parser.add_argument("--latency", type=float, default=0.02, help="Seconds the stand-in API takes to answer.")
+    parser.add_argument("--rows", type=int, default=150_000, help="Rows of the cache timing set and get.")
+    args = parser.parse_args()
+
+    ips = [f"10.0.{index >> 8 & 255}.{index & 255}" for index in range(args.ips)]
+
+    with tempfile.TemporaryDirectory() as directory, StandInServer(args.latency) as server:
+        path = os.path.join(directory, "locations.db")
+        with SqliteLocationCache(path) as cache:
+            look_up(server, cache, ips, "cold start")
+        with SqliteLocationCache(path) as cache:
+            look_up(server, cache, ips, "restart, SQLite cache")
+        look_up(server, LocationCache(max_size=args.ips), ips, "restart, in-memory cache")
+
+        cache_operations(os.path.join(directory, "large.db"), args.rows)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,73 @@
+"""
+Measures a LocationIndex holding millions of IPv4 networks: building it, writing and
+mapping its binary file, lookups, and networks added one by one as populate_index does.
+
+Networks are every other /24 network from 1.0.0.0, with one of 1000 locations each.
+Lookups pick random addresses, about half of them outside every network. Building the
+index parses every network, which takes about 15 s per million networks; from_file maps
+the written table without parsing it.
+
+Usage:
+    python -m benchmarks.bench_location_index [--ranges N] [--lookups N] [--adds N]
+"""
+
+import argparse
+import ipaddress
+import os
+import random
+import tempfile
+import time
+
+from free_ip_client import Location, LocationIndex
+
+
+def location(index: int) -> Location:
+    return {"country": f"Country {index % 10}", "region": f"Region {index % 100}", "city": f"City {index % 1000}"}
+
+
+def network(index: int) -> str:
+    return f"{ipaddress.IPv4Address((1 << 24) + (index << 9))}/24"
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--ranges", type=int, default=2_000_000)
+    parser.add_argument("--lookups", type=int, default=1_000_000)
+    parser.add_argument("--adds", type=int, default=100_000)
+    args = parser.parse_args()
+
+    # Every other /24 network is left free for the added ones.
+    start = time.perf_counter()
+    index = LocationIndex.from_networks((network(number), location(number)) for number in range(args.ranges))
+    print(f"from_networks {time.perf_counter() - start:10.3f} s for {args.ranges} networks")
+
+    with tempfile.TemporaryDirectory() as directory:
+        path = os.path.join(directory, "index.bin")
+        start = time.perf_counter()
+        index.to_file(path)
+        print(f"to_file       {time.perf_counter() - start:10.3f} s, {os.path.getsize(path) / 1e6:.1f} MB")
+
+        start = time.perf_counter()
+        index = LocationIndex.from_file(path)
+        print(f"from_file     {(time.perf_counter() - start) * 1e3:10.3f} ms")
+
+        last = (1 << 24) + (args.ranges << 9)
+        addresses = [ipaddress.IPv4Address(random.randrange(1 << 24, last)) for _ in range(args.lookups)]
+        start = time.perf_counter()
+        found = sum(index.lookup(address) is not None for address in addresses)
+        elapsed = time.perf_counter() - start
+        print(f"lookup        {elapsed / args.lookups * 1e9:10.0f} ns/lookup ({found} found)")
+
+        # The /24 networks between the loaded ones, in random order.
+        added = [f"{ipaddress.IPv4Address((1 << 24) + (number << 9) + 256)}/24" for number in range(args.adds)]
+        random.shuffle(added)
+        start = time.perf_counter()
+        for number, added_network in enumerate(added):
+            index.add(added_network, location(number))
+        elapsed = time.perf_counter() - start
+        print(f"add           {elapsed / args.adds * 1e6:10.1f} us/network for {args.adds} networks")
+        del index
+
+
+if __name__ == "__main__":
+    main()
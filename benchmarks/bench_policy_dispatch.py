@@ -0,0 +1,67 @@
+"""
+Measures the cost of resolving the policies of an operation on deposits.
+
+Accounts get 1, 10 or 100 policies, of which only one supports deposits. Compares asking
+every policy whether it supports the operation on every call, as accounts did before
+policies were resolved once per operation, with the resolved policies of the account,
+and reports the cost of a whole deposit for reference.
+
+Usage:
+    python -m benchmarks.bench_policy_dispatch [--operations N] [--repeat N]
+"""
+
+from typing import Callable
+
+import argparse
+import timeit
+
+from dfm18.bank_account import BankAccount, SimpleBankAccount
+from dfm18.bank_account.policies import Policy, PolicyOperation
+
+
+class NoOpPolicy(Policy):
+    def __init__(self, operation: PolicyOperation):
+        self.supported_operations = operation
+
+    def apply(self, account: BankAccount, amount: float):
+        pass
+
+    def supports(self, operation: PolicyOperation) -> bool:
+        return bool(self.supported_operations & operation)
+
+
+def best_ns_per_op(function: Callable[[], object], operations: int, repeat: int) -> float:
+    return min(timeit.repeat(function, number=operations, repeat=repeat)) / operations * 1e9
+
+
+def check_every_policy(account: SimpleBankAccount, operation: PolicyOperation, amount: float):
+    for policy in account.policies:
+        if policy.supports(operation):
+            policy.apply(account, amount)
+
+
+def check_resolved_policies(account: SimpleBankAccount, operation: PolicyOperation, amount: float):
+    for policy in account._policies_for(operation):
+        policy.apply(account, amount)
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--operations", type=int, default=100_000)
+    parser.add_argument("--repeat", type=int, default=5)
+    args = parser.parse_args()
+
+    deposit = PolicyOperation.DEPOSIT
+    print(f"{'policies':>8} {'supports() per call':>20} {'resolved':>12} {'deposit':>12}")
+    for count in (1, 10, 100):
+        policies = [NoOpPolicy(deposit)] + [NoOpPolicy(PolicyOperation.WITHDRAW) for _ in range(count - 1)]
+        account = SimpleBankAccount(policies=policies)
+
+        every_ns = best_ns_per_op(lambda: check_every_policy(account, deposit, 1), args.operations, args.repeat)
+        resolved_ns = best_ns_per_op(lambda: check_resolved_policies(account, deposit, 1), args.operations, args.repeat)
+        deposit_ns = best_ns_per_op(lambda: account.deposit(1), args.operations, args.repeat)
+        print(f"{count:8d} {every_ns:17.0f} ns {resolved_ns:9.0f} ns {deposit_ns:9.0f} ns")
+
+
+if __name__ == "__main__":
+    main()
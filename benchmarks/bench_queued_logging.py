@@ -0,0 +1,68 @@
+"""
+Measures the latency of deposits writing a transaction log file.
+
+Compares accounts logging through a FileHandler, which writes and flushes every record
+on the calling thread, with accounts using queued logging, which only enqueue records.
+The queued run also reports the time to drain the queue once every deposit returned.
+The gap grows with the cost of writes, so point --log-dir at the storage used in
+production rather than at a local temporary directory.
+
+Usage:
+    python -m benchmarks.bench_queued_logging [--operations N] [--log-dir DIR]
+"""
+
+from typing import List
+
+import argparse
+import os
+import tempfile
+import time
+
+from dfm18.bank_account import SimpleBankAccount
+
+
+def run(log_file: str, queued: bool, operations: int):
+    """
+    Returns the nanoseconds spent in every deposit and the seconds spent flushing the log afterwards.
+    """
+    account = SimpleBankAccount(log_file=log_file, queued_logging=queued)
+    clock = time.perf_counter_ns
+    latencies: List[int] = []
+    try:
+        for _ in range(operations):
+            start = clock()
+            account.deposit(1)
+            latencies.append(clock() - start)
+        flush_start = time.perf_counter()
+        account.flush_log()
+        return latencies, time.perf_counter() - flush_start
+    finally:
+        account.close()
+
+
+def report(name: str, latencies: List[int], flush: float):
+    latencies = sorted(latencies)
+
+    def percentile(fraction: float) -> int:
+        return latencies[min(len(latencies) - 1, int(len(latencies) * fraction))]
+
+    print(
+        f"{name:15} mean {sum(latencies) / len(latencies):8.0f} ns, p50 {percentile(0.5):8d} ns, "
+        f"p99 {percentile(0.99):8d} ns, max {latencies[-1]:10d} ns, flush {flush * 1e3:8.2f} ms"
+    )
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--operations", type=int, default=50_000)
+    parser.add_argument("--log-dir", default=None, help="Directory of the log files. Defaults to the temporary directory.")
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory(dir=args.log_dir) as directory:
+        for name, queued in (("file handler", False), ("queued logging", True)):
+            log_file = os.path.join(directory, f"{name.replace(' ', '_')}.log")
+            report(name, *run(log_file, queued, args.operations))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,72 @@
+"""
+Measures the deposit and withdrawal throughput of thread-safe accounts across 1 to 16
+threads.
+
+Threads either share one thread-safe account, contending for its lock, or use one
+thread-safe account each. Every thread deposits and withdraws the same amount, so the
+final balances are checked against the initial ones. A single thread on an account that
+is not thread-safe gives the cost of the lock itself. Account logging is disabled.
+
+Usage:
+    python -m benchmarks.bench_thread_safe_account [--operations N] [--max-threads N]
+"""
+
+from typing import List
+
+import argparse
+import logging
+import os
+import threading
+import time
+
+from dfm18.bank_account import SimpleBankAccount
+
+
+def operations_per_second(accounts: List[SimpleBankAccount], operations: int) -> float:
+    # Every thread runs operations / len(accounts) deposit and withdrawal pairs on its account.
+    pairs = max(operations // len(accounts) // 2, 1)
+    barrier = threading.Barrier(len(accounts) + 1)
+
+    def worker(account: SimpleBankAccount):
+        barrier.wait()
+        for _ in range(pairs):
+            account.deposit(1)
+            account.withdraw(1)
+
+    threads = [threading.Thread(target=worker, args=(account,)) for account in accounts]
+    for thread in threads:
+        thread.start()
+    barrier.wait()
+    start = time.perf_counter()
+    for thread in threads:
+        thread.join()
+    elapsed = time.perf_counter() - start
+
+    assert all(account.get_balance() == 1000 for account in accounts)
+    return pairs * 2 * len(accounts) / elapsed
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--operations", type=int, default=200_000, help="Operations per measurement.")
+    parser.add_argument("--max-threads", type=int, default=16)
+    args = parser.parse_args()
+
+    logging.disable(logging.INFO)
+    unlocked = operations_per_second([SimpleBankAccount(balance=1000)], args.operations)
+    print(f"{os.cpu_count()} CPUs; 1 thread, account not thread-safe: {unlocked:.0f} ops/s")
+    print(f"{'threads':>7} {'shared account':>15} {'account per thread':>19}")
+
+    threads = 1
+    while threads <= args.max_threads:
+        shared = SimpleBankAccount(balance=1000, thread_safe=True)
+        shared_rate = operations_per_second([shared] * threads, args.operations)
+        own_rate = operations_per_second(
+            [SimpleBankAccount(balance=1000, thread_safe=True) for _ in range(threads)], args.operations
+        )
+        print(f"{threads:7d} {shared_rate:9.0f} ops/s {own_rate:13.0f} ops/s")
+        threads *= 2
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,97 @@
+"""
+Measures many concurrent transfers over a shared pool of thread-safe accounts.
+
+Every thread moves random amounts between random accounts of the pool, with transfer,
+with transfer_many batches, and with the withdraw and deposit pair transfers replace.
+The total balance of the pool is checked after every run; a small pool makes threads
+contend for the same account locks. Account logging is disabled.
+
+Usage:
+    python -m benchmarks.bench_transfers [--accounts N] [--threads N] [--transfers N] [--batch N]
+"""
+
+from typing import Callable, List, Tuple
+
+import argparse
+import logging
+import random
+import threading
+import time
+
+from dfm18.bank_account import SimpleBankAccount, transfer, transfer_many
+
+
+Transfer = Tuple[SimpleBankAccount, SimpleBankAccount, float]
+
+
+def withdraw_and_deposit(transfers: List[Transfer], batch: int):
+    for src, dst, amount in transfers:
+        src.withdraw(amount)
+        dst.deposit(amount)
+
+
+def one_transfer_per_call(transfers: List[Transfer], batch: int):
+    for src, dst, amount in transfers:
+        transfer(src, dst, amount)
+
+
+def transfer_batches(transfers: List[Transfer], batch: int):
+    for start in range(0, len(transfers), batch):
+        transfer_many(transfers[start:start + batch])
+
+
+def random_transfers(pool: List[SimpleBankAccount], count: int) -> List[Transfer]:
+    transfers = []
+    for _ in range(count):
+        src, dst = random.sample(pool, 2)
+        transfers.append((src, dst, random.randrange(1, 10)))
+    return transfers
+
+
+def transfers_per_second(
+    apply: Callable[[List[Transfer], int], None], pool: List[SimpleBankAccount], args: argparse.Namespace
+) -> float:
+    total = sum(account.get_balance() for account in pool)
+    work = [random_transfers(pool, args.transfers) for _ in range(args.threads)]
+    barrier = threading.Barrier(args.threads + 1)
+
+    def worker(transfers: List[Transfer]):
+        barrier.wait()
+        apply(transfers, args.batch)
+
+    threads = [threading.Thread(target=worker, args=(transfers,)) for transfers in work]
+    for thread in threads:
+        thread.start()
+    barrier.wait()
+    start = time.perf_counter()
+    for thread in threads:
+        thread.join()
+    elapsed = time.perf_counter() - start
+
+    assert sum(account.get_balance() for account in pool) == total
+    return args.threads * args.transfers / elapsed
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--accounts", type=int, default=100)
+    parser.add_argument("--threads", type=int, default=8)
+    parser.add_argument("--transfers", type=int, default=20_000, help="Transfers per thread.")
+    parser.add_argument("--batch", type=int, default=100, help="Transfers per transfer_many call.")
+    args = parser.parse_args()
+
+    logging.disable(logging.INFO)
+    # Balances large enough for every withdrawal to succeed.
+    pool = [SimpleBankAccount(balance=10 * args.threads * args.transfers, thread_safe=True) for _ in range(args.accounts)]
+
+    print(f"{args.threads} threads, {args.accounts} accounts")
+    for name, apply in (
+        ("withdraw and deposit", withdraw_and_deposit),
+        ("transfer", one_transfer_per_call),
+        (f"transfer_many, {args.batch} per call", transfer_batches),
+    ):
+        print(f"{name:30} {transfers_per_second(apply, pool, args):10.0f} transfers/s")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,60 @@
+"""
+Measures the creation of users from synthetic (name, email) records.
+
+Compares the constructor, which validates every email, with User.from_records in the
+current process and in a process pool. Synthetic emails repeat, like the emails of an
+import, so from_records validates every distinct email once. The constructor only runs
+over --sample records, which is enough to measure its cost per record.
+
+Usage:
+    python -m benchmarks.bench_user_records [--users N] [--distinct N] [--sample N] [--processes N]
+"""
+
+from typing import Callable, List, Tuple
+
+import argparse
+import time
+
+from dfm18.user import User, _email_errors
+
+
+def synthetic_records(users: int, distinct: int) -> List[Tuple[str, str]]:
+    emails = [f"user{index}@domain{index % 97}.example.com" for index in range(distinct)]
+    return [(f"User {index}", emails[index % distinct]) for index in range(users)]
+
+
+def per_record_us(function: Callable[[List[Tuple[str, str]]], object], records: List[Tuple[str, str]]) -> float:
+    start = time.perf_counter()
+    function(records)
+    return (time.perf_counter() - start) / len(records) * 1e6
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--users", type=int, default=1_000_000)
+    parser.add_argument(
+        "--distinct", type=int, default=50_000, help="Distinct emails among the records, at most the cache size."
+    )
+    parser.add_argument("--sample", type=int, default=20_000, help="Records created with the constructor.")
+    parser.add_argument("--processes", type=int, default=4)
+    args = parser.parse_args()
+
+    records = synthetic_records(args.users, args.distinct)
+
+    constructor = per_record_us(lambda sample: [User(name, email) for name, email in sample], records[: args.sample])
+    print(f"constructor                    {constructor:8.2f} us/user")
+
+    _email_errors.clear()
+    bulk = per_record_us(User.from_records, records)
+    print(f"from_records                   {bulk:8.2f} us/user")
+
+    bulk_cached = per_record_us(User.from_records, records)
+    print(f"from_records, cached emails    {bulk_cached:8.2f} us/user")
+
+    _email_errors.clear()
+    pooled = per_record_us(lambda records: User.from_records(records, processes=args.processes), records)
+    print(f"from_records, {args.processes} processes    {pooled:8.2f} us/user")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,67 @@
+"""
+Measures a UserRegistry holding many users: the bulk load, lookups by email, prefix
+searches and total balance reads. Every user tracks its total balance, which the
+registry maintains incrementally.
+
+Users are created without validating their email, so only the registry is measured.
+Every user takes about 1 KB, so --users 10000000 needs about 10 GB of memory.
+
+Usage:
+    python -m benchmarks.bench_user_registry [--users N] [--lookups N]
+"""
+
+import argparse
+import random
+import time
+
+from dfm18.bank_account import SimpleBankAccount
+from dfm18.user import User, UserRegistry
+
+
+def create_user(index: int) -> User:
+    user = User.__new__(User)
+    user._init_attributes(f"User {index:08d}", f"user{index}@example.com", track_balance=True)
+    return user
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--users", type=int, default=1_000_000)
+    parser.add_argument("--lookups", type=int, default=1_000_000)
+    args = parser.parse_args()
+
+    users = [create_user(index) for index in range(args.users)]
+    for user in users[:1000]:
+        user.add_account(SimpleBankAccount(balance=100))
+
+    registry = UserRegistry()
+    start = time.perf_counter()
+    for user in users:
+        registry.add(user)
+    elapsed = time.perf_counter() - start
+    print(f"add          {elapsed:10.3f} s for {args.users} users ({elapsed / args.users * 1e9:.0f} ns/user)")
+
+    emails = [users[random.randrange(args.users)].email for _ in range(args.lookups)]
+    start = time.perf_counter()
+    for email in emails:
+        registry.get(email)
+    elapsed = time.perf_counter() - start
+    print(f"get          {elapsed / args.lookups * 1e9:10.0f} ns/lookup")
+
+    start = time.perf_counter()
+    registry.find_by_name_prefix("user 0000001")
+    print(f"first prefix {(time.perf_counter() - start) * 1e3:10.3f} ms (sorts the names added in bulk)")
+    start = time.perf_counter()
+    for index in range(1000):
+        registry.find_by_name_prefix(f"user {index:06d}")
+    print(f"prefix       {(time.perf_counter() - start) / 1000 * 1e6:10.1f} us/search")
+
+    start = time.perf_counter()
+    for _ in range(1000):
+        registry.get_total_balance()
+    elapsed = (time.perf_counter() - start) / 1000
+    print(f"total        {elapsed * 1e6:10.1f} us/read")
+
+
+if __name__ == "__main__":
+    main()
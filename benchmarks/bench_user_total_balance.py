@@ -0,0 +1,61 @@
+"""
+Measures User.get_total_balance for users holding thousands of accounts, with and
+without tracking their total balance.
+
+A user tracking its balance keeps a running total updated by its accounts, so reading it
+does not depend on the number of accounts; other users sum every account balance. The
+cost of the deposits updating the tracked total is reported alongside, and both totals
+are checked with is_total_balance_consistent.
+
+Usage:
+    python -m benchmarks.bench_user_total_balance [--reads N] [--deposits N] [--repeat N]
+"""
+
+from typing import Callable
+
+import argparse
+import logging
+import timeit
+
+from dfm18.bank_account import SimpleBankAccount
+from dfm18.user import User
+
+
+def best_us_per_call(function: Callable[[], object], calls: int, repeat: int) -> float:
+    return min(timeit.repeat(function, number=calls, repeat=repeat)) / calls * 1e6
+
+
+def user_with_accounts(accounts: int, track_balance: bool) -> User:
+    user = User("Ann Smith", "ann@example.com", track_balance=track_balance)
+    for _ in range(accounts):
+        user.add_account(SimpleBankAccount(balance=100))
+    return user
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--reads", type=int, default=1000)
+    parser.add_argument("--deposits", type=int, default=20_000)
+    parser.add_argument("--repeat", type=int, default=5)
+    args = parser.parse_args()
+
+    logging.disable(logging.INFO)
+    print(f"{'accounts':>8} {'untracked read':>15} {'tracked read':>13} {'deposit':>10} {'tracked deposit':>16}")
+    for accounts in (10, 100, 1000, 10_000):
+        untracked = user_with_accounts(accounts, track_balance=False)
+        tracked = user_with_accounts(accounts, track_balance=True)
+
+        untracked_us = best_us_per_call(untracked.get_total_balance, args.reads, args.repeat)
+        tracked_us = best_us_per_call(tracked.get_total_balance, args.reads, args.repeat)
+        deposit_us = best_us_per_call(lambda: untracked.accounts[0].deposit(1), args.deposits, args.repeat)
+        tracked_deposit_us = best_us_per_call(lambda: tracked.accounts[0].deposit(1), args.deposits, args.repeat)
+
+        assert untracked.is_total_balance_consistent() and tracked.is_total_balance_consistent()
+        print(
+            f"{accounts:8d} {untracked_us:12.2f} us {tracked_us:10.2f} us"
+            f" {deposit_us:7.2f} us {tracked_deposit_us:13.2f} us"
+        )
+
+
+if __name__ == "__main__":
+    main()
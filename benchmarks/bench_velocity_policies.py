@@ -0,0 +1,110 @@
+"""
+Measures the cost of a withdrawal check and record of the velocity policies as the
+withdrawal history of an account grows.
+
+A simulated clock advances 1 ms per withdrawal and the window lasts 60 seconds, so the
+window keeps sliding and limits are never reached. WithdrawalRateLimitPolicy and
+WithdrawalAmountLimitPolicy keep bounded ring buffers per account; a policy keeping
+every withdrawal time and counting those in the window on every check is timed for
+comparison, up to --naive-history withdrawals.
+
+Usage:
+    python -m benchmarks.bench_velocity_policies [--max-history N] [--naive-history N] [--calls N]
+"""
+
+from typing import List
+
+import argparse
+import time
+
+from dfm18.bank_account import BankAccount, SimpleBankAccount
+from dfm18.bank_account.policies import (
+    Policy,
+    PolicyOperation,
+    WithdrawalAmountLimitPolicy,
+    WithdrawalRateLimitPolicy,
+)
+
+WINDOW_SECONDS = 60
+STEP_SECONDS = 0.001
+
+
+class SimulatedClock:
+    def __init__(self):
+        self.now = 0.0
+
+    def __call__(self) -> float:
+        return self.now
+
+
+class ScanningRateLimitPolicy:
+    def __init__(self, max_withdrawals: int, window_seconds: float, clock: SimulatedClock):
+        self.max_withdrawals = max_withdrawals
+        self.window_seconds = window_seconds
+        self.clock = clock
+        self.times: List[float] = []
+
+    def apply(self, account: BankAccount, amount: float):
+        now = self.clock()
+        if sum(1 for time_ in self.times if now - time_ < self.window_seconds) >= self.max_withdrawals:
+            raise ValueError("Too many withdrawals")
+
+    def commit(self, account: BankAccount, amounts: List[float]):
+        self.times.extend([self.clock()] * len(amounts))
+
+    def supports(self, operation: PolicyOperation) -> bool:
+        return operation == PolicyOperation.WITHDRAW
+
+
+def grow_history(policy: Policy, account: BankAccount, clock: SimulatedClock, withdrawals: int):
+    for _ in range(withdrawals):
+        clock.now += STEP_SECONDS
+        policy.commit(account, (1,))
+
+
+def ns_per_call(policy: Policy, account: BankAccount, clock: SimulatedClock, calls: int) -> float:
+    start = time.perf_counter()
+    for _ in range(calls):
+        clock.now += STEP_SECONDS
+        policy.apply(account, 1)
+        policy.commit(account, (1,))
+    return (time.perf_counter() - start) / calls * 1e9
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--max-history", type=int, default=1_000_000)
+    parser.add_argument("--naive-history", type=int, default=100_000)
+    parser.add_argument("--calls", type=int, default=2000, help="Timed withdrawals per history size.")
+    args = parser.parse_args()
+
+    # Limits above the withdrawals of a window, so no withdrawal is rejected.
+    max_withdrawals = int(WINDOW_SECONDS / STEP_SECONDS) + 1
+    policies = {
+        "rate limit": lambda clock: WithdrawalRateLimitPolicy(max_withdrawals, WINDOW_SECONDS, clock=clock),
+        "amount limit": lambda clock: WithdrawalAmountLimitPolicy(float("inf"), WINDOW_SECONDS, clock=clock),
+        "scanning rate limit": lambda clock: ScanningRateLimitPolicy(max_withdrawals, WINDOW_SECONDS, clock),
+    }
+    instances = {}
+    for name, create in policies.items():
+        clock = SimulatedClock()
+        instances[name] = (create(clock), SimpleBankAccount(), clock)
+
+    print(f"{'history':>9}" + "".join(f" {name:>22}" for name in policies))
+    history = 0
+    size = 1000
+    while size <= args.max_history:
+        row = f"{size:9d}"
+        for name, (policy, account, clock) in instances.items():
+            if name.startswith("scanning") and size > args.naive_history:
+                row += f" {'-':>22}"
+                continue
+            grow_history(policy, account, clock, size - history)
+            row += f" {ns_per_call(policy, account, clock, args.calls):19.0f} ns"
+        print(row)
+        history = size + args.calls
+        size *= 10
+
+
+if __name__ == "__main__":
+    main()
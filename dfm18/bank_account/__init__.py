@@ -1,5 +1,37 @@
-__all__ = ["BankAccount", "SimpleBankAccount"]
+__all__ = [
+    "AccountStore",
+    "AccountSummary",
+    "AccrualEngine",
+    "AccrualError",
+    "AccrualResult",
+    "BankAccount",
+    "FsyncPolicy",
+    "ImportProgress",
+    "ImportRowError",
+    "Instrumentation",
+    "JournalReader",
+    "JournalRecord",
+    "LatencyHistogram",
+    "LedgerImporter",
+    "MinorUnitsBankAccount",
+    "Posting",
+    "RateSchedule",
+    "RecordKind",
+    "SimpleBankAccount",
+    "StoredAccount",
+    "TransactionJournal",
+    "read_postings",
+    "transfer",
+    "transfer_many",
+]
 
 
 from ._base import BankAccount
-from ._simple import SimpleBankAccount
+from ._journal import FsyncPolicy, JournalRecord, RecordKind, TransactionJournal
+from ._history import AccountSummary, JournalReader
+from ._simple import SimpleBankAccount, transfer, transfer_many
+from ._minor_units import MinorUnitsBankAccount
+from ._store import AccountStore, StoredAccount
+from ._accrual import AccrualEngine, AccrualError, AccrualResult, RateSchedule
+from ._ledger import ImportProgress, ImportRowError, LedgerImporter, Posting, read_postings
+from ._instrumentation import Instrumentation, LatencyHistogram
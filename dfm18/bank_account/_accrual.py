@@ -0,0 +1,234 @@
+from typing import List, NamedTuple, Optional, Sequence, Tuple
+
+from array import array
+
+from bisect import bisect_right
+
+from concurrent.futures import ProcessPoolExecutor
+
+from ._base import BankAccount
+
+from ._store import AccountStore, StoredAccount
+
+
+class AccrualError(NamedTuple):
+    index: int
+    amount: float
+    error: str
+
+
+class AccrualResult(NamedTuple):
+    applied: int
+    credited: float
+    debited: float
+    errors: List[AccrualError]
+
+
+class RateSchedule:
+    def __init__(
+        self,
+        tiers: Sequence[Tuple[float, float]],
+        fee: float = 0.0,
+        fee_waiver_balance: Optional[float] = None,
+        minor_units: int = 100,
+    ):
+        """
+        Initializes a schedule of interest rates by balance tier and a flat fee.
+        A balance earns the rate of the highest tier whose minimum balance it reaches,
+        and amounts are rounded to the nearest minor unit.
+
+        Args:
+            tiers (Sequence[Tuple[float, float]]): Pairs of minimum balance and rate for the period.
+            fee (float, optional): Fee charged to every account for the period. Defaults to 0.0.
+            fee_waiver_balance (Optional[float], optional): Balance from which the fee is waived. Defaults to None.
+            minor_units (int, optional): Number of minor units in one unit of currency. Defaults to 100.
+
+        Example:
+            >>> schedule = RateSchedule([(0, 0.01), (1000, 0.02)], fee=1)
+            >>> list(schedule.accruals([50000, 200000]))
+            [400, 3900]
+        """
+        if minor_units <= 0:
+            raise ValueError("Minor units must be greater than zero")
+        if fee < 0:
+            raise ValueError("Fee must not be negative")
+
+        tiers = sorted(tiers)
+        self.minor_units = minor_units
+        self._thresholds = [round(minimum * minor_units) for minimum, _ in tiers]
+        self._rates = [rate for _, rate in tiers]
+        self._fee = round(fee * minor_units)
+        self._fee_waiver = (
+            None if fee_waiver_balance is None else round(fee_waiver_balance * minor_units)
+        )
+
+    def accruals(self, balances: Sequence[int]) -> array:
+        """
+        Computes the net accrual of every balance, both in minor units.
+
+        Args:
+            balances (Sequence[int]): The balances, in minor units.
+
+        Returns:
+            array: The interest minus the fee of every balance, in minor units.
+        """
+        thresholds, rates = self._thresholds, self._rates
+        fee, fee_waiver = self._fee, self._fee_waiver
+
+        result = array("q", bytes(8 * len(balances)))
+        for position, balance in enumerate(balances):
+            tier = bisect_right(thresholds, balance)
+            delta = round(balance * rates[tier - 1]) if tier and balance > 0 else 0
+            if fee and (fee_waiver is None or balance < fee_waiver):
+                delta -= fee
+            result[position] = delta
+        return result
+
+
+def _accruals(schedule: RateSchedule, balances: array) -> array:
+    return schedule.accruals(balances)
+
+
+class AccrualEngine:
+    def __init__(
+        self,
+        schedule: RateSchedule,
+        processes: Optional[int] = None,
+        chunk_size: int = 65536,
+    ):
+        """
+        Initializes an engine applying a rate schedule to many accounts at once.
+        Accruals are computed in chunks of balances, in a process pool when processes is
+        greater than one, and applied as deposits and withdrawals so that the policies of
+        every account are enforced. Rejected accruals are reported instead of aborting the run.
+
+        Args:
+            schedule (RateSchedule): The schedule to apply.
+            processes (Optional[int], optional): Computes accruals in a pool of this many processes.
+                Defaults to None, computing them in the current process.
+            chunk_size (int, optional): Balances per unit of work. Defaults to 65536.
+
+        Example:
+            >>> from dfm18.bank_account import SimpleBankAccount
+            >>> engine = AccrualEngine(RateSchedule([(0, 0.1)], fee=2))
+            >>> accounts = [SimpleBankAccount(balance=100), SimpleBankAccount(balance=10)]
+            >>> engine.accrue(accounts).applied
+            2
+            >>> [account.get_balance() for account in accounts]
+            [108.0, 9.0]
+        """
+        if chunk_size <= 0:
+            raise ValueError("Chunk size must be greater than zero")
+
+        self.schedule = schedule
+        self.processes = processes
+        self.chunk_size = chunk_size
+
+    def compute(self, balances: Sequence[int]) -> array:
+        """
+        Computes the net accrual of every balance, both in minor units.
+        """
+        balances = balances if isinstance(balances, array) else array("q", balances)
+        chunks = [
+            balances[start:start + self.chunk_size]
+            for start in range(0, len(balances), self.chunk_size)
+        ]
+
+        result = array("q")
+        if self.processes is not None and self.processes > 1 and len(chunks) > 1:
+            with ProcessPoolExecutor(max_workers=self.processes) as executor:
+                for deltas in executor.map(_accruals, [self.schedule] * len(chunks), chunks):
+                    result.extend(deltas)
+        else:
+            for chunk in chunks:
+                result.extend(self.schedule.accruals(chunk))
+        return result
+
+    def accrue(self, accounts: Sequence[BankAccount]) -> AccrualResult:
+        """
+        Applies the schedule to accounts, depositing interest and withdrawing fees.
+
+        Args:
+            accounts (Sequence[BankAccount]): The accounts.
+
+        Returns:
+            AccrualResult: The number of accruals applied, the total credited and debited
+                amounts, and the errors of the rejected accruals.
+        """
+        minor_units = self.schedule.minor_units
+        deltas = self.compute(
+            [round(account.get_balance() * minor_units) for account in accounts]
+        )
+        return self._apply(
+            (index, account, delta)
+            for index, (account, delta) in enumerate(zip(accounts, deltas))
+            if delta
+        )
+
+    def accrue_store(self, store: AccountStore) -> AccrualResult:
+        """
+        Applies the schedule to every account of a store. Accruals of accounts without
+        policies are added to the balance array directly.
+
+        Args:
+            store (AccountStore): The store.
+
+        Returns:
+            AccrualResult: The number of accruals applied, the total credited and debited
+                amounts, and the errors of the rejected accruals.
+        """
+        if store.minor_units != self.schedule.minor_units:
+            raise ValueError("The store and the schedule must use the same minor units")
+
+        deltas = self.compute(store._balances)
+        balances, policy_set_ids = store._balances, store._policy_set_ids
+
+        applied, credited, debited = 0, 0, 0
+        with_policies: List[int] = []
+        for index, delta in enumerate(deltas):
+            if not delta:
+                continue
+            if policy_set_ids[index]:
+                with_policies.append(index)
+                continue
+            balances[index] += delta
+            applied += 1
+            if delta > 0:
+                credited += delta
+            else:
+                debited -= delta
+
+        result = self._apply(
+            (index, StoredAccount(store, index), deltas[index]) for index in with_policies
+        )
+        minor_units = store.minor_units
+        return AccrualResult(
+            applied + result.applied,
+            credited / minor_units + result.credited,
+            debited / minor_units + result.debited,
+            result.errors,
+        )
+
+    def _apply(self, accruals) -> AccrualResult:
+        minor_units = self.schedule.minor_units
+        applied, credited, debited = 0, 0, 0
+        errors: List[AccrualError] = []
+
+        for index, account, delta in accruals:
+            amount = abs(delta) / minor_units
+            try:
+                if delta > 0:
+                    account.deposit(amount)
+                else:
+                    account.withdraw(amount)
+            except Exception as e:
+                errors.append(AccrualError(index, delta / minor_units, str(e)))
+                continue
+
+            applied += 1
+            if delta > 0:
+                credited += delta
+            else:
+                debited -= delta
+
+        return AccrualResult(applied, credited / minor_units, debited / minor_units, errors)
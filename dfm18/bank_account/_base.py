@@ -1,10 +1,15 @@
-from typing import Protocol, runtime_checkable
+from typing import TYPE_CHECKING, Iterable, Protocol, Tuple, runtime_checkable
 
 from abc import abstractmethod
 
+if TYPE_CHECKING:
+    from .policies import PolicyOperation
+
 
 @runtime_checkable
 class BankAccount(Protocol):
+    __slots__ = ()
+
     @abstractmethod
     def deposit(self, amount: float) -> float:
         """
@@ -31,6 +36,21 @@ class BankAccount(Protocol):
         """
         ...
 
+    @abstractmethod
+    def apply_batch(self, ops: Iterable[Tuple["PolicyOperation", float]]) -> float:
+        """
+        Applies a batch of deposits and withdrawals atomically and returns the updated balance.
+        Either every operation is applied or, if any of them is rejected, none is.
+
+        Args:
+            ops (Iterable[Tuple[PolicyOperation, float]]): Pairs of operation and amount.
+                Every amount must be greater than zero.
+
+        Returns:
+            float: The updated account balance.
+        """
+        ...
+
     @abstractmethod
     def get_balance(self) -> float:
         """
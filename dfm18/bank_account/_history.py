@@ -0,0 +1,165 @@
+from typing import Dict, Iterator, List, NamedTuple, Optional, Tuple
+
+from bisect import bisect_left
+
+from ._journal import RECORD_FORMAT, RECORD_SIZE, JournalRecord, RecordKind, _decode
+
+import mmap
+import os
+
+
+class AccountSummary(NamedTuple):
+    count: int
+    deposited: float
+    withdrawn: float
+    min_balance: float
+    max_balance: float
+
+
+class JournalReader:
+    def __init__(self, path: str, index_interval: int = 1024):
+        """
+        Initializes a read-only view of a TransactionJournal file. The file is memory-mapped,
+        so records are decoded straight from the mapping without loading the file, and the
+        timestamp of every index_interval-th record is kept to answer time-range queries
+        with a binary search. Timestamps are expected not to decrease along the file.
+
+        Args:
+            path (str): Path of the journal file.
+            index_interval (int, optional): Records between two entries of the timestamp index. Defaults to 1024.
+        """
+        if index_interval <= 0:
+            raise ValueError("Index interval must be greater than zero")
+
+        self.path = path
+        self.index_interval = index_interval
+        self._file = open(path, "rb")
+        self._size = os.fstat(self._file.fileno()).st_size // RECORD_SIZE
+
+        if self._size:
+            self._mmap: Optional[mmap.mmap] = mmap.mmap(
+                self._file.fileno(), 0, access=mmap.ACCESS_READ
+            )
+            self._view = memoryview(self._mmap)[: self._size * RECORD_SIZE]
+        else:
+            self._mmap = None
+            self._view = memoryview(b"")
+
+        self._index = [
+            RECORD_FORMAT.unpack_from(self._view, position * RECORD_SIZE)[2]
+            for position in range(0, self._size, index_interval)
+        ]
+
+    def __enter__(self) -> "JournalReader":
+        return self
+
+    def __exit__(self, *exc_info):
+        self.close()
+
+    def __len__(self) -> int:
+        return self._size
+
+    def close(self):
+        self._view.release()
+        if self._mmap is not None:
+            self._mmap.close()
+        self._file.close()
+
+    def __iter__(self) -> Iterator[JournalRecord]:
+        return self.records()
+
+    def records(self, start: int = 0, end: Optional[int] = None) -> Iterator[JournalRecord]:
+        """
+        Iterates over the records between two positions of the journal.
+
+        Args:
+            start (int, optional): Position of the first record. Defaults to 0.
+            end (Optional[int], optional): Position after the last record. Defaults to the end of the journal.
+        """
+        end = self._size if end is None else min(end, self._size)
+        for position in range(start, end):
+            yield _decode(self._view, position * RECORD_SIZE)
+
+    def find_range(
+        self, start_ns: Optional[int] = None, end_ns: Optional[int] = None
+    ) -> Tuple[int, int]:
+        """
+        Finds the positions of the records with a timestamp in [start_ns, end_ns).
+
+        Args:
+            start_ns (Optional[int], optional): First timestamp included, in nanoseconds. Defaults to None.
+            end_ns (Optional[int], optional): First timestamp excluded, in nanoseconds. Defaults to None.
+
+        Returns:
+            Tuple[int, int]: The position of the first record and the position after the last record.
+        """
+        start = 0 if start_ns is None else self._position(start_ns)
+        end = self._size if end_ns is None else self._position(end_ns)
+        return start, max(start, end)
+
+    def between(
+        self, start_ns: Optional[int] = None, end_ns: Optional[int] = None
+    ) -> Iterator[JournalRecord]:
+        """
+        Iterates over the records with a timestamp in [start_ns, end_ns).
+        """
+        return self.records(*self.find_range(start_ns, end_ns))
+
+    def _position(self, timestamp_ns: int) -> int:
+        block = max(0, bisect_left(self._index, timestamp_ns) - 1)
+        start = block * self.index_interval
+        end = min(self._size, start + 2 * self.index_interval)
+
+        timestamps = [
+            RECORD_FORMAT.unpack_from(self._view, position * RECORD_SIZE)[2]
+            for position in range(start, end)
+        ]
+        return start + bisect_left(timestamps, timestamp_ns)
+
+    def summarize(
+        self, start_ns: Optional[int] = None, end_ns: Optional[int] = None
+    ) -> Dict[str, AccountSummary]:
+        """
+        Aggregates the operations of every account with a timestamp in [start_ns, end_ns).
+        Balances are rebuilt from the start of the journal, using snapshots when present.
+
+        Args:
+            start_ns (Optional[int], optional): First timestamp included, in nanoseconds. Defaults to None.
+            end_ns (Optional[int], optional): First timestamp excluded, in nanoseconds. Defaults to None.
+
+        Returns:
+            Dict[str, AccountSummary]: The summary of every account with operations in the range.
+        """
+        start, end = self.find_range(start_ns, end_ns)
+
+        balances: Dict[bytes, float] = {}
+        totals: Dict[bytes, List[float]] = {}
+        deposit, withdraw = RecordKind.DEPOSIT, RecordKind.WITHDRAW
+
+        records = RECORD_FORMAT.iter_unpack(self._view[: end * RECORD_SIZE])
+        for position, (kind, account_id, _, amount) in enumerate(records):
+            if kind == deposit:
+                balance = balances.get(account_id, 0.0) + amount
+            elif kind == withdraw:
+                balance = balances.get(account_id, 0.0) - amount
+            else:
+                balance = amount
+            balances[account_id] = balance
+
+            if position < start or (kind != deposit and kind != withdraw):
+                continue
+
+            total = totals.get(account_id)
+            if total is None:
+                total = totals[account_id] = [0, 0.0, 0.0, balance, balance]
+            total[0] += 1
+            total[1 if kind == deposit else 2] += amount
+            if balance < total[3]:
+                total[3] = balance
+            if balance > total[4]:
+                total[4] = balance
+
+        return {
+            account_id.rstrip(b"\0").decode(): AccountSummary(int(total[0]), *total[1:])
+            for account_id, total in totals.items()
+        }
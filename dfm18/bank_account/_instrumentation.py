@@ -0,0 +1,267 @@
+from typing import Dict, List, Optional, Sequence
+
+from bisect import bisect_left
+
+from .policies import Policy
+from .policies._base import apply_policy_batch, check_policies
+
+from ._base import BankAccount
+
+import json
+import os
+import threading
+import time
+
+
+DEFAULT_BUCKETS = (
+    0.000001,
+    0.0000025,
+    0.000005,
+    0.00001,
+    0.000025,
+    0.00005,
+    0.0001,
+    0.00025,
+    0.0005,
+    0.001,
+    0.0025,
+    0.005,
+    0.01,
+    0.1,
+    1.0,
+)
+
+
+class LatencyHistogram:
+    __slots__ = ("buckets", "counts", "count", "sum")
+
+    def __init__(self, buckets: Sequence[float] = DEFAULT_BUCKETS):
+        """
+        Initializes a histogram of durations with fixed bucket upper bounds, in seconds.
+        Durations above the last bound are counted in an overflow bucket.
+
+        Args:
+            buckets (Sequence[float], optional): Increasing upper bounds. Defaults to DEFAULT_BUCKETS.
+        """
+        if list(buckets) != sorted(set(buckets)):
+            raise ValueError("Buckets must be strictly increasing")
+
+        self.buckets = tuple(buckets)
+        self.counts = [0] * (len(self.buckets) + 1)
+        self.count = 0
+        self.sum = 0.0
+
+    def observe(self, seconds: float):
+        self.counts[bisect_left(self.buckets, seconds)] += 1
+        self.count += 1
+        self.sum += seconds
+
+    def cumulative_counts(self) -> List[int]:
+        """
+        Retrieves the number of durations up to every bucket bound, then the total count.
+        """
+        counts: List[int] = []
+        total = 0
+        for count in self.counts:
+            total += count
+            counts.append(total)
+        return counts
+
+
+class Instrumentation:
+    def __init__(self, prefix: str = "dfm18_bank_account", buckets: Sequence[float] = DEFAULT_BUCKETS):
+        """
+        Initializes a collector of counters and latency histograms, by name. Accounts given an
+        instrumentation time every phase of their deposits, withdrawals, batches and transfers
+        and every policy they apply. Accounts without one do not pay for timing.
+
+        Args:
+            prefix (str, optional): Prefix of the exported metric names. Defaults to "dfm18_bank_account".
+            buckets (Sequence[float], optional): Bucket upper bounds of the histograms, in seconds.
+                Defaults to DEFAULT_BUCKETS.
+
+        Example:
+            >>> instrumentation = Instrumentation()
+            >>> instrumentation.increment("deposit.count")
+            >>> instrumentation.observe("deposit.total", 0.0002)
+            >>> print(instrumentation.to_prometheus())  # doctest: +ELLIPSIS
+            # TYPE dfm18_bank_account_events_total counter
+            dfm18_bank_account_events_total{name="deposit.count"} 1
+            # TYPE dfm18_bank_account_duration_seconds histogram
+            dfm18_bank_account_duration_seconds_bucket{name="deposit.total",le="1e-06"} 0
+            ...
+            dfm18_bank_account_duration_seconds_count{name="deposit.total"} 1
+        """
+        self.prefix = prefix
+        self.buckets = tuple(buckets)
+        self._counters: Dict[str, int] = {}
+        self._histograms: Dict[str, LatencyHistogram] = {}
+        self._lock = threading.Lock()
+
+    def increment(self, name: str, value: int = 1):
+        with self._lock:
+            self._counters[name] = self._counters.get(name, 0) + value
+
+    def observe(self, name: str, seconds: float):
+        with self._lock:
+            histogram = self._histograms.get(name)
+            if histogram is None:
+                histogram = self._histograms[name] = LatencyHistogram(self.buckets)
+            histogram.observe(seconds)
+
+    def check_policies(
+        self,
+        policies: Sequence[Policy],
+        account: BankAccount,
+        amounts: Sequence[float],
+        batch: bool = False,
+    ):
+        """
+        Checks amounts against policies like check_policies, or apply_policy_batch for a batch,
+        timing every policy as policy.<type name> and counting its rejections as
+        policy.<type name>.rejected.
+        """
+        for policy in policies:
+            name = f"policy.{type(policy).__name__}"
+            start = time.perf_counter()
+            try:
+                if batch:
+                    apply_policy_batch(policy, account, amounts)
+                else:
+                    check_policies((policy,), account, amounts)
+            except Exception:
+                self.increment(f"{name}.rejected")
+                raise
+            finally:
+                self.observe(name, time.perf_counter() - start)
+
+    def counter(self, name: str) -> int:
+        return self._counters.get(name, 0)
+
+    def histogram(self, name: str) -> Optional[LatencyHistogram]:
+        return self._histograms.get(name)
+
+    def reset(self):
+        with self._lock:
+            self._counters.clear()
+            self._histograms.clear()
+
+    def to_dict(self) -> dict:
+        """
+        Retrieves every counter and histogram as plain data, ready to be serialized as JSON.
+        """
+        with self._lock:
+            return {
+                "counters": dict(self._counters),
+                "histograms": {
+                    name: {
+                        "buckets": list(histogram.buckets),
+                        "counts": list(histogram.counts),
+                        "count": histogram.count,
+                        "sum": histogram.sum,
+                    }
+                    for name, histogram in self._histograms.items()
+                },
+            }
+
+    def to_prometheus(self) -> str:
+        """
+        Retrieves every counter and histogram in the Prometheus text exposition format.
+        """
+        counter_name = f"{self.prefix}_events_total"
+        histogram_name = f"{self.prefix}_duration_seconds"
+
+        with self._lock:
+            lines = [f"# TYPE {counter_name} counter"]
+            for name, value in sorted(self._counters.items()):
+                lines.append(f'{counter_name}{{name="{name}"}} {value}')
+
+            lines.append(f"# TYPE {histogram_name} histogram")
+            for name, histogram in sorted(self._histograms.items()):
+                bounds = [repr(bound) for bound in histogram.buckets] + ["+Inf"]
+                for bound, count in zip(bounds, histogram.cumulative_counts()):
+                    lines.append(f'{histogram_name}_bucket{{name="{name}",le="{bound}"}} {count}')
+                lines.append(f'{histogram_name}_sum{{name="{name}"}} {histogram.sum!r}')
+                lines.append(f'{histogram_name}_count{{name="{name}"}} {histogram.count}')
+        return "\n".join(lines)
+
+    def export(self, path: str, format: str = "json"):
+        """
+        Writes every counter and histogram to a file, replacing it atomically.
+
+        Args:
+            path (str): Path of the file.
+            format (str, optional): "json" or "prometheus". Defaults to "json".
+        """
+        if format == "json":
+            content = json.dumps(self.to_dict(), indent=2)
+        elif format == "prometheus":
+            content = self.to_prometheus()
+        else:
+            raise ValueError(f"Unsupported format: {format}")
+
+        temporary_path = f"{path}.tmp"
+        with open(temporary_path, "w") as file:
+            file.write(content + "\n")
+        os.replace(temporary_path, path)
+
+
+class OperationTimer:
+    __slots__ = ("instrumentations", "name", "_start", "_last")
+
+    def __init__(
+        self,
+        instrumentations: Sequence[Instrumentation],
+        name: str,
+        start: Optional[float] = None,
+    ):
+        """
+        Initializes a timer of the phases of one operation, recorded on every instrumentation
+        as <name>.<phase> histograms.
+
+        Args:
+            instrumentations (Sequence[Instrumentation]): The instrumentations recording the operation.
+            name (str): The name of the operation.
+            start (Optional[float], optional): The time.perf_counter value the operation started at.
+                Defaults to None, starting now.
+        """
+        self.instrumentations = instrumentations
+        self.name = name
+        self._start = self._last = time.perf_counter() if start is None else start
+
+    def phase(self, phase: str):
+        """
+        Records the time elapsed since the previous phase ended as the duration of a phase.
+        """
+        now = time.perf_counter()
+        for instrumentation in self.instrumentations:
+            instrumentation.observe(f"{self.name}.{phase}", now - self._last)
+        self._last = now
+
+    def finish(self, rejected: bool = False):
+        """
+        Counts the operation, and its rejection if any, and records its total duration.
+        """
+        elapsed = time.perf_counter() - self._start
+        for instrumentation in self.instrumentations:
+            if rejected:
+                instrumentation.increment(f"{self.name}.rejected")
+            instrumentation.increment(f"{self.name}.count")
+            instrumentation.observe(f"{self.name}.total", elapsed)
+
+
+class NullOperationTimer(OperationTimer):
+    __slots__ = ()
+
+    def __init__(self):
+        """
+        Initializes a timer recording nothing, shared by operations of accounts without
+        instrumentation so they run the same code without timing it.
+        """
+        super().__init__((), "", 0.0)
+
+    def phase(self, phase: str):
+        pass
+
+    def finish(self, rejected: bool = False):
+        pass
@@ -0,0 +1,240 @@
+from typing import Dict, Iterator, List, NamedTuple, Optional
+
+from enum import Enum, IntEnum
+
+import math
+import os
+import struct
+import threading
+import time
+
+
+class RecordKind(IntEnum):
+    DEPOSIT = 1
+    WITHDRAW = 2
+    SNAPSHOT = 3
+
+
+class FsyncPolicy(Enum):
+    NEVER = "never"
+    ON_FLUSH = "on_flush"
+    ALWAYS = "always"
+
+
+class JournalRecord(NamedTuple):
+    kind: RecordKind
+    account_id: str
+    timestamp_ns: int
+    amount: float
+
+
+RECORD_FORMAT = struct.Struct("<B16sqd")
+RECORD_SIZE = RECORD_FORMAT.size
+ACCOUNT_ID_SIZE = 16
+
+
+def _decode(data: bytes, offset: int = 0) -> JournalRecord:
+    kind, account_id, timestamp_ns, amount = RECORD_FORMAT.unpack_from(data, offset)
+    return JournalRecord(
+        RecordKind(kind), account_id.rstrip(b"\0").decode(), timestamp_ns, amount
+    )
+
+
+class TransactionJournal:
+    def __init__(
+        self,
+        path: str,
+        fsync: FsyncPolicy = FsyncPolicy.ON_FLUSH,
+        snapshot_interval: int = 1000,
+        buffer_size: int = 64 * 1024,
+    ):
+        """
+        Initializes an append-only journal of fixed-size binary records. Every account writes
+        a balance snapshot every snapshot_interval operations, so its balance can be recovered
+        from the latest snapshot and the operations written after it.
+
+        Args:
+            path (str): Path of the journal file. Records are appended to an existing file,
+                after dropping a partially written last record.
+            fsync (FsyncPolicy, optional): When written records are forced to disk. Defaults to FsyncPolicy.ON_FLUSH.
+            snapshot_interval (int, optional): Operations of an account between snapshots. Defaults to 1000.
+            buffer_size (int, optional): Bytes buffered before records are written to the file. Defaults to 65536.
+
+        Example:
+            >>> import os, tempfile
+            >>> path = os.path.join(tempfile.mkdtemp(), "journal.bin")
+            >>> with TransactionJournal(path) as journal:
+            ...     journal.snapshot("acc", 100)
+            ...     journal.record(RecordKind.DEPOSIT, "acc", 50)
+            ...     journal.recover_balance("acc")
+            150.0
+        """
+        if snapshot_interval <= 0:
+            raise ValueError("Snapshot interval must be greater than zero")
+
+        self.path = path
+        self.fsync = fsync
+        self.snapshot_interval = snapshot_interval
+        self._truncate_torn_record(path)
+        self._file = open(path, "ab", buffering=buffer_size)
+        self._operations_since_snapshot: Dict[str, int] = {}
+        self._lock = threading.Lock()
+
+    @staticmethod
+    def _truncate_torn_record(path: str):
+        # A crash while writing can leave part of a record at the end of the file, which
+        # would misalign every record appended after it.
+        try:
+            size = os.path.getsize(path)
+        except FileNotFoundError:
+            return
+        if size % RECORD_SIZE:
+            os.truncate(path, size - size % RECORD_SIZE)
+
+    def __enter__(self) -> "TransactionJournal":
+        return self
+
+    def __exit__(self, *exc_info):
+        self.close()
+
+    def close(self):
+        with self._lock:
+            if self._file.closed:
+                return
+            self._flush()
+            self._file.close()
+
+    def flush(self):
+        """
+        Writes buffered records to the file, forcing them to disk unless the policy is FsyncPolicy.NEVER.
+        """
+        with self._lock:
+            self._flush()
+
+    def _flush(self):
+        self._file.flush()
+        if self.fsync is not FsyncPolicy.NEVER:
+            os.fsync(self._file.fileno())
+
+    def _write(self, kind: RecordKind, account_id: str, amount: float):
+        encoded_id = account_id.encode()
+        if len(encoded_id) > ACCOUNT_ID_SIZE:
+            raise ValueError(f"Account id must be at most {ACCOUNT_ID_SIZE} bytes long")
+
+        self._file.write(RECORD_FORMAT.pack(kind, encoded_id, time.time_ns(), amount))
+        if self.fsync is FsyncPolicy.ALWAYS:
+            self._flush()
+
+    def snapshot(self, account_id: str, balance: float):
+        """
+        Records the balance of an account.
+
+        Args:
+            account_id (str): Identifier of the account, at most 16 bytes long once encoded.
+            balance (float): The current balance of the account.
+        """
+        with self._lock:
+            self._write(RecordKind.SNAPSHOT, account_id, balance)
+            self._operations_since_snapshot[account_id] = 0
+
+    def record(
+        self,
+        kind: RecordKind,
+        account_id: str,
+        amount: float,
+        balance: Optional[float] = None,
+    ):
+        """
+        Records an operation of an account, followed by a snapshot when one is due.
+
+        Args:
+            kind (RecordKind): RecordKind.DEPOSIT or RecordKind.WITHDRAW.
+            account_id (str): Identifier of the account, at most 16 bytes long once encoded.
+            amount (float): The amount of the operation.
+            balance (Optional[float], optional): The balance after the operation, needed to
+                write periodic snapshots. Defaults to None.
+        """
+        if kind is RecordKind.SNAPSHOT:
+            raise ValueError("Use snapshot to record balances")
+
+        with self._lock:
+            self._write(kind, account_id, amount)
+
+            operations = self._operations_since_snapshot.get(account_id, 0) + 1
+            if balance is not None and operations >= self.snapshot_interval:
+                self._write(RecordKind.SNAPSHOT, account_id, balance)
+                operations = 0
+            self._operations_since_snapshot[account_id] = operations
+
+    def __iter__(self) -> Iterator[JournalRecord]:
+        """
+        Iterates over every complete record of the journal, oldest first.
+        """
+        self.flush()
+
+        with open(self.path, "rb") as file:
+            while True:
+                chunk = file.read(RECORD_SIZE * 4096)
+                for offset in range(0, len(chunk) - RECORD_SIZE + 1, RECORD_SIZE):
+                    yield _decode(chunk, offset)
+                if len(chunk) < RECORD_SIZE * 4096:
+                    return
+
+    def replay(self, account_id: str) -> List[JournalRecord]:
+        """
+        Retrieves the latest snapshot of an account followed by its later operations.
+        The journal is read backwards from its end, so recent snapshots are found quickly.
+
+        Args:
+            account_id (str): Identifier of the account.
+
+        Returns:
+            List[JournalRecord]: The records, oldest first. The first one is a snapshot unless
+                the account never wrote one.
+        """
+        self.flush()
+
+        records: List[JournalRecord] = []
+        chunk_records = 4096
+
+        with open(self.path, "rb") as file:
+            end = os.fstat(file.fileno()).st_size // RECORD_SIZE
+            while end > 0:
+                start = max(0, end - chunk_records)
+                file.seek(start * RECORD_SIZE)
+                chunk = file.read((end - start) * RECORD_SIZE)
+
+                for offset in range(len(chunk) - RECORD_SIZE, -1, -RECORD_SIZE):
+                    record = _decode(chunk, offset)
+                    if record.account_id != account_id:
+                        continue
+                    records.append(record)
+                    if record.kind is RecordKind.SNAPSHOT:
+                        records.reverse()
+                        return records
+                end = start
+
+        records.reverse()
+        return records
+
+    def recover_balance(self, account_id: str) -> float:
+        """
+        Rebuilds the balance of an account from its latest snapshot and later operations.
+
+        Args:
+            account_id (str): Identifier of the account.
+
+        Returns:
+            float: The recovered balance.
+
+        Raises:
+            KeyError: If the journal has no record of the account.
+        """
+        records = self.replay(account_id)
+        if not records:
+            raise KeyError(account_id)
+
+        return math.fsum(
+            -record.amount if record.kind is RecordKind.WITHDRAW else record.amount
+            for record in records
+        )
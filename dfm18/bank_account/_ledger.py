@@ -0,0 +1,263 @@
+from typing import Callable, Dict, Iterable, Iterator, List, Mapping, NamedTuple, Optional, Tuple, Union
+
+from .policies import PolicyOperation
+
+from ._base import BankAccount
+
+import csv
+import json
+import math
+import queue
+import threading
+
+
+class Posting(NamedTuple):
+    account_id: str
+    operation: PolicyOperation
+    amount: float
+
+
+class ImportRowError(NamedTuple):
+    line: int
+    error: str
+
+
+class ImportProgress(NamedTuple):
+    rows_read: int
+    rows_applied: int
+    rows_rejected: int
+    batches: int
+
+
+_OPERATIONS = {
+    "deposit": PolicyOperation.DEPOSIT,
+    "withdraw": PolicyOperation.WITHDRAW,
+    "withdrawal": PolicyOperation.WITHDRAW,
+}
+
+ParsedRow = Tuple[int, Union[Posting, ImportRowError]]
+
+
+def _to_posting(line: int, record: Mapping) -> Union[Posting, ImportRowError]:
+    try:
+        account_id = record["account_id"]
+        operation = _OPERATIONS.get(str(record["operation"]).strip().lower())
+        amount = float(record["amount"])
+    except KeyError as e:
+        return ImportRowError(line, f"Missing field: {e.args[0]}")
+    except (TypeError, ValueError):
+        return ImportRowError(line, f"Invalid amount: {record['amount']!r}")
+
+    if not math.isfinite(amount):
+        return ImportRowError(line, f"Invalid amount: {record['amount']!r}")
+    if not account_id:
+        return ImportRowError(line, "Missing account id")
+    if operation is None:
+        return ImportRowError(line, f"Unsupported operation: {record['operation']!r}")
+    if not amount > 0:
+        return ImportRowError(line, "Amount must be greater than zero")
+    return Posting(str(account_id), operation, amount)
+
+
+def read_postings(path: str, format: Optional[str] = None) -> Iterator[ParsedRow]:
+    """
+    Streams the postings of a CSV or JSON Lines file with account_id, operation and amount
+    fields, one row at a time. Invalid rows are yielded as errors.
+
+    Args:
+        path (str): Path of the file.
+        format (Optional[str], optional): "csv" or "jsonl". Defaults to None, guessing from the file extension.
+
+    Returns:
+        Iterator[Tuple[int, Union[Posting, ImportRowError]]]: The line number and the posting or error of every row.
+    """
+    if format is None:
+        format = "jsonl" if path.endswith((".jsonl", ".ndjson")) else "csv"
+
+    if format == "csv":
+        with open(path, newline="") as file:
+            reader = csv.DictReader(file)
+            for record in reader:
+                yield reader.line_num, _to_posting(reader.line_num, record)
+    elif format == "jsonl":
+        with open(path) as file:
+            for line, text in enumerate(file, start=1):
+                if not text.strip():
+                    continue
+                try:
+                    record = json.loads(text)
+                except json.JSONDecodeError as e:
+                    yield line, ImportRowError(line, f"Invalid JSON: {e.msg}")
+                    continue
+                if not isinstance(record, dict):
+                    yield line, ImportRowError(line, "Row must be a JSON object")
+                    continue
+                yield line, _to_posting(line, record)
+    else:
+        raise ValueError(f"Unsupported format: {format}")
+
+
+class LedgerImporter:
+    def __init__(
+        self,
+        accounts: Mapping[str, BankAccount],
+        batch_size: int = 10000,
+        max_pending_batches: int = 4,
+        max_errors: int = 1000,
+        progress: Optional[Callable[[ImportProgress], None]] = None,
+    ):
+        """
+        Initializes a streaming importer of postings into accounts. Rows are read by a
+        background thread, in batches, into a bounded queue, so reading pauses while
+        max_pending_batches are waiting and memory stays bounded whatever the file size.
+        The postings of every batch are grouped by account and applied with apply_batch,
+        so every account applies all its postings of a batch, or none if one is rejected.
+
+        Args:
+            accounts (Mapping[str, BankAccount]): The accounts, by account id.
+            batch_size (int, optional): Rows per batch. Defaults to 10000.
+            max_pending_batches (int, optional): Batches read ahead of the ones applied. Defaults to 4.
+            max_errors (int, optional): Row errors kept, further errors are only counted. Defaults to 1000.
+            progress (Optional[Callable[[ImportProgress], None]], optional): Called after every batch. Defaults to None.
+
+        Example:
+            >>> import os, tempfile
+            >>> from dfm18.bank_account import SimpleBankAccount
+            >>> path = os.path.join(tempfile.mkdtemp(), "ledger.csv")
+            >>> with open(path, "w") as file:
+            ...     _ = file.write("account_id,operation,amount\\nacc,deposit,100\\nacc,withdraw,30\\n")
+            >>> account = SimpleBankAccount(account_id="acc")
+            >>> LedgerImporter({"acc": account}).import_file(path)
+            ImportProgress(rows_read=2, rows_applied=2, rows_rejected=0, batches=1)
+            >>> account.get_balance()
+            70.0
+        """
+        if batch_size <= 0:
+            raise ValueError("Batch size must be greater than zero")
+        if max_pending_batches <= 0:
+            raise ValueError("Max pending batches must be greater than zero")
+
+        self.accounts = accounts
+        self.batch_size = batch_size
+        self.max_pending_batches = max_pending_batches
+        self.max_errors = max_errors
+        self.progress = progress
+        self.errors: List[ImportRowError] = []
+        self._rows_read = 0
+        self._rows_applied = 0
+        self._rows_rejected = 0
+        self._batches = 0
+
+    @property
+    def counters(self) -> ImportProgress:
+        return ImportProgress(self._rows_read, self._rows_applied, self._rows_rejected, self._batches)
+
+    def import_file(self, path: str, format: Optional[str] = None) -> ImportProgress:
+        """
+        Imports the postings of a CSV or JSON Lines file, see read_postings.
+
+        Returns:
+            ImportProgress: The counters of the importer.
+        """
+        return self.import_rows(read_postings(path, format))
+
+    def import_rows(self, rows: Iterable[ParsedRow]) -> ImportProgress:
+        """
+        Imports parsed rows, reading them in a background thread.
+
+        Args:
+            rows (Iterable[Tuple[int, Union[Posting, ImportRowError]]]): The line number and the posting or error of every row.
+
+        Returns:
+            ImportProgress: The counters of the importer.
+        """
+        batches: "queue.Queue[Optional[List[ParsedRow]]]" = queue.Queue(self.max_pending_batches)
+        stopped = threading.Event()
+        failure: List[BaseException] = []
+
+        reader = threading.Thread(
+            target=self._read, args=(rows, batches, stopped, failure), name="ledger-reader", daemon=True
+        )
+        reader.start()
+        try:
+            while True:
+                batch = batches.get()
+                if batch is None:
+                    break
+                self._apply(batch)
+        finally:
+            stopped.set()
+            reader.join()
+
+        if failure:
+            raise failure[0]
+        return self.counters
+
+    def _read(
+        self,
+        rows: Iterable[ParsedRow],
+        batches: "queue.Queue[Optional[List[ParsedRow]]]",
+        stopped: threading.Event,
+        failure: List[BaseException],
+    ):
+        try:
+            batch: List[ParsedRow] = []
+            for row in rows:
+                batch.append(row)
+                if len(batch) >= self.batch_size:
+                    if not self._put(batches, stopped, batch):
+                        return
+                    batch = []
+            if batch and not self._put(batches, stopped, batch):
+                return
+        except BaseException as e:
+            failure.append(e)
+        self._put(batches, stopped, None)
+
+    @staticmethod
+    def _put(
+        batches: "queue.Queue[Optional[List[ParsedRow]]]",
+        stopped: threading.Event,
+        batch: Optional[List[ParsedRow]],
+    ) -> bool:
+        # Waits for room in the queue, giving up once the import has stopped.
+        while not stopped.is_set():
+            try:
+                batches.put(batch, timeout=0.1)
+                return True
+            except queue.Full:
+                continue
+        return False
+
+    def _apply(self, batch: List[ParsedRow]):
+        grouped: Dict[str, List[Tuple[int, Posting]]] = {}
+        for line, row in batch:
+            if isinstance(row, ImportRowError):
+                self._reject(row)
+            else:
+                grouped.setdefault(row.account_id, []).append((line, row))
+
+        for account_id, postings in grouped.items():
+            account = self.accounts.get(account_id)
+            if account is None:
+                for line, _ in postings:
+                    self._reject(ImportRowError(line, f"Unknown account: {account_id}"))
+                continue
+
+            try:
+                account.apply_batch((posting.operation, posting.amount) for _, posting in postings)
+            except Exception as e:
+                for line, _ in postings:
+                    self._reject(ImportRowError(line, str(e)))
+                continue
+            self._rows_applied += len(postings)
+
+        self._rows_read += len(batch)
+        self._batches += 1
+        if self.progress is not None:
+            self.progress(self.counters)
+
+    def _reject(self, error: ImportRowError):
+        self._rows_rejected += 1
+        if len(self.errors) < self.max_errors:
+            self.errors.append(error)
@@ -0,0 +1,222 @@
+from typing import Dict, List, Optional
+
+from logging.handlers import QueueHandler
+
+import hashlib
+import logging
+import os
+import queue
+import threading
+import time
+
+
+LOG_FORMAT = "%(asctime)s - [%(account_id)s] %(message)s"
+LOG_DATE_FORMAT = "%b %d, %Y %H:%M:%S"
+
+
+def create_file_handler(log_file: str) -> logging.FileHandler:
+    """
+    Creates a file handler using the transaction log format.
+
+    Args:
+        log_file (str): Path of the log file.
+
+    Returns:
+        logging.FileHandler: The configured file handler.
+    """
+    file_handler = logging.FileHandler(log_file)
+    file_handler.setLevel(logging.INFO)
+    file_handler.setFormatter(logging.Formatter(LOG_FORMAT, datefmt=LOG_DATE_FORMAT))
+    return file_handler
+
+
+class QueuedFileHandler(QueueHandler):
+    def __init__(self, log_file: str, batch_size: int = 100, flush_interval: float = 1.0):
+        """
+        Initializes a queue-backed file handler. Logging a record only enqueues it, a
+        background thread writes records to the file in batches, with one write and one
+        flush per batch. A batch is written once it holds batch_size records or once its
+        first record has waited flush_interval seconds.
+
+        Args:
+            log_file (str): Path of the log file.
+            batch_size (int, optional): Number of records buffered before they are written. Defaults to 100.
+            flush_interval (float, optional): Seconds a record waits at most before being written. Defaults to 1.0.
+        """
+        if batch_size <= 0:
+            raise ValueError("Batch size must be greater than zero")
+        if flush_interval <= 0:
+            raise ValueError("Flush interval must be greater than zero")
+
+        super().__init__(queue.SimpleQueue())
+        self.setLevel(logging.INFO)
+
+        self.batch_size = batch_size
+        self.flush_interval = flush_interval
+        self._file_handler = create_file_handler(log_file)
+        self._writer = threading.Thread(target=self._write_batches, name="log-writer", daemon=True)
+        self._writer.start()
+        self._closed = False
+
+    def prepare(self, record: logging.LogRecord) -> logging.LogRecord:
+        # The queue stays in the process, so records need no copy and are formatted by the
+        # writer thread rather than by the logging caller.
+        return record
+
+    def _write_batches(self):
+        lines: List[str] = []
+        record: Optional[logging.LogRecord] = None
+        deadline = 0.0
+
+        while True:
+            timeout = max(0.0, deadline - time.monotonic()) if lines else None
+            try:
+                item = self.queue.get(timeout=timeout)
+            except queue.Empty:
+                lines = self._write(lines, record)
+                continue
+
+            if item is None or isinstance(item, threading.Event):
+                lines = self._write(lines, record)
+                if item is None:
+                    return
+                item.set()
+                continue
+
+            try:
+                if not lines:
+                    deadline = time.monotonic() + self.flush_interval
+                lines.append(self._file_handler.format(item))
+                record = item
+            except Exception:
+                self._file_handler.handleError(item)
+            if len(lines) >= self.batch_size:
+                lines = self._write(lines, record)
+
+    def _write(self, lines: List[str], record: Optional[logging.LogRecord]) -> List[str]:
+        if lines:
+            stream = self._file_handler.stream
+            terminator = self._file_handler.terminator
+            try:
+                stream.write(terminator.join(lines) + terminator)
+                stream.flush()
+            except Exception:
+                # Reported like a failed emit of the file handler, with the last record of the batch.
+                self._file_handler.handleError(record)
+        return []
+
+    def flush(self):
+        """
+        Writes every enqueued record to the file.
+        """
+        self.acquire()
+        try:
+            if self._closed:
+                return
+            written = threading.Event()
+            self.queue.put(written)
+            written.wait()
+        finally:
+            self.release()
+
+    def close(self):
+        """
+        Writes every enqueued record to the file and releases the file.
+        """
+        self.acquire()
+        try:
+            if self._closed:
+                return
+            self._closed = True
+            self.queue.put(None)
+            self._writer.join()
+            self._file_handler.close()
+        finally:
+            self.release()
+        super().close()
+
+
+class _LogEntry:
+    def __init__(self, logger: logging.Logger, handler: logging.Handler):
+        self.logger = logger
+        self.handler = handler
+        self.references = 0
+
+
+class LogHandlerRegistry:
+    def __init__(self, logger_name: str):
+        """
+        Initializes a registry sharing one logger and one handler per log file.
+
+        Args:
+            logger_name (str): Name of the parent logger of the per-file loggers.
+        """
+        self.logger_name = logger_name
+        self._entries: Dict[str, _LogEntry] = {}
+        self._lock = threading.Lock()
+
+    def acquire(self, log_file: str, queued: bool = False) -> logging.Logger:
+        """
+        Returns the logger writing to the given log file, creating its handler on first use.
+        The handler type is chosen by the first account acquiring the file.
+
+        Args:
+            log_file (str): Path of the log file.
+            queued (bool, optional): Uses a QueuedFileHandler instead of a FileHandler. Defaults to False.
+
+        Returns:
+            logging.Logger: The logger writing to the log file.
+        """
+        key = os.path.abspath(log_file)
+
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None:
+                handler = QueuedFileHandler(log_file) if queued else create_file_handler(log_file)
+                logger = self._logger_for(key)
+                logger.addHandler(handler)
+                entry = self._entries[key] = _LogEntry(logger, handler)
+
+            entry.references += 1
+            return entry.logger
+
+    def release(self, log_file: str):
+        """
+        Releases a log file acquired with acquire, closing its handler when no account uses it anymore.
+
+        Args:
+            log_file (str): Path of the log file.
+        """
+        key = os.path.abspath(log_file)
+
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None:
+                return
+
+            entry.references -= 1
+            if entry.references > 0:
+                return
+
+            del self._entries[key]
+            entry.logger.removeHandler(entry.handler)
+
+        entry.handler.close()
+
+    def handler_for(self, log_file: str) -> Optional[logging.Handler]:
+        """
+        Returns the handler currently writing to the given log file, if any.
+        """
+        entry = self._entries.get(os.path.abspath(log_file))
+        return entry.handler if entry is not None else None
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+    def _logger_for(self, key: str) -> logging.Logger:
+        # Loggers are never freed by the logging module, so a log file always reuses the
+        # logger named after its path.
+        digest = hashlib.sha1(key.encode()).hexdigest()[:16]
+        logger = logging.getLogger(f"{self.logger_name}.file_{digest}")
+        logger.setLevel(logging.INFO)
+        return logger
@@ -0,0 +1,106 @@
+from typing import Optional, List
+
+from ._simple import SimpleBankAccount
+
+from ._journal import TransactionJournal
+
+from ._instrumentation import Instrumentation
+
+from .policies import Policy
+
+
+def to_minor_units(amount: float, minor_units: int) -> int:
+    """
+    Converts an amount to an integer number of minor units.
+
+    Args:
+        amount (float): The amount to convert.
+        minor_units (int): Number of minor units in one unit of currency.
+
+    Returns:
+        int: The amount in minor units.
+
+    Raises:
+        ValueError: If the amount is not a multiple of one minor unit.
+    """
+    units = amount * minor_units
+    rounded = round(units)
+    if abs(units - rounded) > 1e-6:
+        raise ValueError(f"Amount must be a multiple of 1/{minor_units}")
+    return rounded
+
+
+class MinorUnitsBankAccount(SimpleBankAccount):
+    __slots__ = ("minor_units",)
+
+    def __init__(
+        self,
+        balance: float = 0,
+        log_file: Optional[str] = None,
+        policies: Optional[List[Policy]] = None,
+        queued_logging: bool = False,
+        account_id: Optional[str] = None,
+        thread_safe: bool = False,
+        journal: Optional[TransactionJournal] = None,
+        minor_units: int = 100,
+        instrumentation: Optional[Instrumentation] = None,
+    ):
+        """
+        Initializes a bank account storing its balance as an integer number of minor units
+        (e.g. cents), so repeated operations do not accumulate rounding errors.
+
+        Args:
+            balance (float, optional): Initial account balance. Defaults to 0.
+            log_file (Optional[str], optional): Optional log file for logging transactions. Defaults to None.
+            policies (Optional[List[Policy]], optional): List of policies to enforce on operations. Defaults to None.
+            queued_logging (bool, optional): Writes the log file from a background thread in batches. Defaults to False.
+            account_id (Optional[str], optional): Identifier tagged on every log record of the account. Defaults to None.
+            thread_safe (bool, optional): Guards every operation with a per-account lock. Defaults to False.
+            journal (Optional[TransactionJournal], optional): Journal recording every operation. Defaults to None.
+            minor_units (int, optional): Number of minor units in one unit of currency. Defaults to 100.
+            instrumentation (Optional[Instrumentation], optional): Collects the duration of every operation
+                phase. Defaults to None.
+
+        Example:
+            >>> account = MinorUnitsBankAccount(balance=0.1)
+            >>> account.deposit(0.2)
+            0.3
+            >>> account.balance_in_minor_units
+            30
+        """
+        if minor_units <= 0:
+            raise ValueError("Minor units must be greater than zero")
+
+        self.minor_units = minor_units
+        super().__init__(
+            balance,
+            log_file,
+            policies,
+            queued_logging,
+            account_id,
+            thread_safe,
+            journal,
+            instrumentation,
+        )
+
+    def _to_balance_units(self, amount: float) -> int:
+        return to_minor_units(amount, self.minor_units)
+
+    @property
+    def balance_in_minor_units(self) -> int:
+        """
+        Retrieves the current account balance in minor units.
+
+        Returns:
+            int: The current account balance in minor units.
+        """
+        return self._balance
+
+    def get_balance(self) -> float:
+        """
+        Retrieves the current account balance.
+
+        Returns:
+            float: The current account balance.
+        """
+        return self._balance / self.minor_units
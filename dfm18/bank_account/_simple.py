@@ -1,18 +1,92 @@
-from typing import Optional, List
+from typing import Callable, Dict, Iterable, Optional, List, Sequence, Tuple
 
 from ._base import BankAccount
 
 from .policies import Policy, PolicyOperation
 
+from .policies._base import apply_policy_batch, check_policies, commit_policies
+
+from ._logging import LogHandlerRegistry
+
+from ._journal import RecordKind, TransactionJournal
+
+from ._instrumentation import Instrumentation, NullOperationTimer, OperationTimer
+
+from contextlib import ExitStack, nullcontext
+
+import itertools
 import logging
+import threading
+import time
+
+
+_log_handlers = LogHandlerRegistry(__name__)
+_account_ids = itertools.count(1)
+
+# nullcontext keeps no state, so accounts that are not thread-safe share one instance.
+_NO_LOCK = nullcontext()
+_NO_TIMER = NullOperationTimer()
+
+BalanceListener = Callable[["SimpleBankAccount", float], None]
+
+
+def split_batch(
+    ops: Iterable[Tuple[PolicyOperation, float]],
+) -> Tuple[List[float], List[float]]:
+    """
+    Splits a batch of operations into deposit and withdrawal amounts, validating every amount.
+
+    Args:
+        ops (Iterable[Tuple[PolicyOperation, float]]): Pairs of operation and amount.
+
+    Returns:
+        Tuple[List[float], List[float]]: The deposit amounts and the withdrawal amounts.
+    """
+    deposits: List[float] = []
+    withdrawals: List[float] = []
+
+    for operation, amount in ops:
+        if operation == PolicyOperation.DEPOSIT:
+            deposits.append(amount)
+        elif operation == PolicyOperation.WITHDRAW:
+            withdrawals.append(amount)
+        else:
+            raise ValueError(f"Unsupported batch operation: {operation}")
+
+    if (deposits and min(deposits) <= 0) or (withdrawals and min(withdrawals) <= 0):
+        raise ValueError("Amount must be greater than zero")
+
+    return deposits, withdrawals
 
 
 class SimpleBankAccount(BankAccount):
+    __slots__ = (
+        "_balance",
+        "log_file",
+        "queued_logging",
+        "account_id",
+        "_balance_listeners",
+        "_log_extra",
+        "_log_file_acquired",
+        "_logger",
+        "_policies",
+        "_policies_by_operation",
+        "_lock",
+        "_journal",
+        "_instrumentation",
+        "__weakref__",
+    )
+
     def __init__(
         self,
         balance: float = 0,
         log_file: Optional[str] = None,
         policies: Optional[List[Policy]] = None,
+        queued_logging: bool = False,
+        account_id: Optional[str] = None,
+        thread_safe: bool = False,
+        journal: Optional[TransactionJournal] = None,
+        instrumentation: Optional[Instrumentation] = None,
     ):
         """
         Initializes a simple bank account with an optional initial balance, logging, and policies.
@@ -21,6 +95,17 @@ class SimpleBankAccount(BankAccount):
             balance (float, optional): Initial account balance. Defaults to 0.
             log_file (Optional[str], optional): Optional log file for logging transactions. Defaults to None.
             policies (Optional[List[Policy]], optional): List of policies to enforce on operations. Defaults to None.
+                Policies supporting an operation are resolved once and reused until the policies change.
+            queued_logging (bool, optional): Writes the log file from a background thread in batches
+                instead of on every operation. Defaults to False.
+            account_id (Optional[str], optional): Identifier tagged on every log record of the account.
+                Defaults to a process-wide sequence number.
+            thread_safe (bool, optional): Guards every operation with a per-account lock so policies
+                and the balance update are applied atomically. Defaults to False.
+            journal (Optional[TransactionJournal], optional): Journal recording the initial balance
+                and every operation of the account. Defaults to None.
+            instrumentation (Optional[Instrumentation], optional): Collects the duration of every phase
+                of deposits and withdrawals and of every policy. Defaults to None, timing nothing.
 
         Example:
             >>> account = SimpleBankAccount(balance=100)
@@ -31,31 +116,155 @@ class SimpleBankAccount(BankAccount):
             >>> account.withdraw(30)
             120
         """
-        self._balance = balance
+        self._balance = self._to_balance_units(balance)
         self.log_file = log_file
         self.policies = policies or []
+        self.queued_logging = queued_logging
+        self.account_id = account_id if account_id is not None else str(next(_account_ids))
+        self._balance_listeners: List[BalanceListener] = []
+        self._lock = threading.RLock() if thread_safe else _NO_LOCK
+        self._journal = journal
+        self._instrumentation = instrumentation
+        if journal is not None:
+            journal.snapshot(self.account_id, self.get_balance())
         self._setup_logger()
 
-    def _setup_logger(self):
+    @classmethod
+    def from_journal(
+        cls, journal: TransactionJournal, account_id: str, **kwargs
+    ) -> "SimpleBankAccount":
+        """
+        Rebuilds an account from the latest snapshot and later operations recorded in a journal.
+
+        Args:
+            journal (TransactionJournal): The journal of the account, which keeps recording its operations.
+            account_id (str): Identifier of the account.
+            **kwargs: Other arguments of the account constructor.
+
+        Returns:
+            SimpleBankAccount: The rebuilt account.
+        """
+        balance = journal.recover_balance(account_id)
+        return cls(balance=balance, account_id=account_id, journal=journal, **kwargs)
+
+    def _to_balance_units(self, amount: float):
+        return amount
 
-        self._logger = logging.getLogger(__name__)
-        self._logger.setLevel(logging.INFO)
+    def _setup_logger(self):
+        self._log_extra = {"account_id": self.account_id}
+        self._log_file_acquired = self.log_file is not None
 
         if self.log_file is not None:
-            file_handler = logging.FileHandler(self.log_file)
-            file_handler.setLevel(logging.INFO)
+            self._logger = _log_handlers.acquire(self.log_file, self.queued_logging)
+        else:
+            self._logger = logging.getLogger(__name__)
+            self._logger.setLevel(logging.INFO)
+
+    def flush_log(self):
+        """
+        Writes any pending transaction log records to the log file.
+        """
+        if self._log_file_acquired:
+            handler = _log_handlers.handler_for(self.log_file)
+            if handler is not None:
+                handler.flush()
+
+    def close(self):
+        """
+        Flushes the transaction log and releases the log file shared with other accounts.
+        The log file is closed once every account writing to it is closed.
+        """
+        if self._log_file_acquired:
+            self._log_file_acquired = False
+            _log_handlers.release(self.log_file)
+            self._logger = logging.getLogger(__name__)
+
+    def add_balance_listener(self, listener: BalanceListener):
+        """
+        Registers a callback invoked with the account and the balance change after every operation.
+
+        Args:
+            listener (BalanceListener): The callback to register.
+        """
+        self._balance_listeners.append(listener)
+
+    def remove_balance_listener(self, listener: BalanceListener):
+        """
+        Unregisters a callback registered with add_balance_listener.
+
+        Args:
+            listener (BalanceListener): The callback to unregister.
+
+        Raises:
+            ValueError: If the callback is not registered.
+        """
+        self._balance_listeners.remove(listener)
+
+    def _notify_balance_change(self, delta: float):
+        for listener in self._balance_listeners:
+            listener(self, delta)
+
+    @property
+    def policies(self) -> Tuple[Policy, ...]:
+        """
+        Retrieves the policies enforced on operations, in evaluation order.
+
+        Returns:
+            Tuple[Policy, ...]: The policies of the account.
+        """
+        return self._policies
+
+    @policies.setter
+    def policies(self, policies: Sequence[Policy]):
+        self._policies = tuple(policies)
+        self._policies_by_operation: Dict[PolicyOperation, Tuple[Policy, ...]] = {}
 
-            formatter = logging.Formatter(
-                "%(asctime)s - %(message)s", datefmt="%b %d, %Y %H:%M:%S"
+    def add_policy(self, policy: Policy):
+        """
+        Adds a policy to be enforced after the current ones.
+
+        Args:
+            policy (Policy): The policy to add.
+        """
+        self.policies = self._policies + (policy,)
+
+    def remove_policy(self, policy: Policy):
+        """
+        Removes a policy from the account.
+
+        Args:
+            policy (Policy): The policy to remove.
+
+        Raises:
+            ValueError: If the policy is not enforced on the account.
+        """
+        policies = list(self._policies)
+        policies.remove(policy)
+        self.policies = policies
+
+    def _policies_for(self, operation: PolicyOperation) -> Tuple[Policy, ...]:
+        policies = self._policies_by_operation.get(operation)
+        if policies is None:
+            policies = tuple(
+                policy for policy in self._policies if policy.supports(operation)
             )
-            file_handler.setFormatter(formatter)
+            self._policies_by_operation[operation] = policies
+        return policies
 
-            self._logger.addHandler(file_handler)
+    def _check_policies(self, operation: PolicyOperation, amounts: Sequence[float], batch: bool = False):
+        policies = self._policies_for(operation)
+        if self._instrumentation is not None:
+            self._instrumentation.check_policies(policies, self, amounts, batch)
+        elif batch:
+            for policy in policies:
+                apply_policy_batch(policy, self, amounts)
+        else:
+            check_policies(policies, self, amounts)
 
-    def _apply_policies(self, amount, operation: PolicyOperation):
-        for policy in self.policies:
-            if policy.supports(operation):
-                policy.apply(self, amount)
+    def _start_timer(self, name: str) -> OperationTimer:
+        if self._instrumentation is None:
+            return _NO_TIMER
+        return OperationTimer((self._instrumentation,), name)
 
     def deposit(self, amount: float) -> float:
         """
@@ -72,14 +281,9 @@ class SimpleBankAccount(BankAccount):
             >>> account.deposit(50)
             50
         """
-        if amount <= 0:
-            raise ValueError("Amount must be greater than zero")
-
-        self._apply_policies(amount, PolicyOperation.DEPOSIT)
-
-        self._balance += amount
-        self._logger.info("Deposited %.2f. New balance: %.2f", amount, self.balance)
-        return self._balance
+        if self._instrumentation is not None:
+            return self._timed_operation(PolicyOperation.DEPOSIT, amount)
+        return self._apply_operation(PolicyOperation.DEPOSIT, amount)
 
     def withdraw(self, amount: float) -> float:
         """
@@ -98,14 +302,151 @@ class SimpleBankAccount(BankAccount):
             >>> account.withdraw(20)
             40
         """
+        if self._instrumentation is not None:
+            return self._timed_operation(PolicyOperation.WITHDRAW, amount)
+        return self._apply_operation(PolicyOperation.WITHDRAW, amount)
+
+    def _apply_operation(self, operation: PolicyOperation, amount: float) -> float:
         if amount <= 0:
             raise ValueError("Amount must be greater than zero")
 
-        self._apply_policies(amount, PolicyOperation.WITHDRAW)
+        delta = self._to_balance_units(amount)
+        with self._lock:
+            check_policies(self._policies_for(operation), self, (amount,))
+            balance = self._update_balance(operation, amount, delta)
 
-        self._balance -= amount
-        self._logger.info("Withdrew %.2f. New balance: %.2f", amount, self.balance)
-        return self._balance
+        self._log_operation(operation, amount, balance)
+        return balance
+
+    def _timed_operation(self, operation: PolicyOperation, amount: float) -> float:
+        timer = OperationTimer(
+            (self._instrumentation,), "deposit" if operation is PolicyOperation.DEPOSIT else "withdraw"
+        )
+
+        try:
+            if amount <= 0:
+                raise ValueError("Amount must be greater than zero")
+
+            delta = self._to_balance_units(amount)
+            timer.phase("validation")
+
+            with self._lock:
+                self._check_policies(operation, (amount,))
+                timer.phase("policies")
+                balance = self._update_balance(operation, amount, delta)
+                timer.phase("balance_update")
+
+            self._log_operation(operation, amount, balance)
+            timer.phase("logging")
+        except Exception:
+            timer.finish(rejected=True)
+            raise
+
+        timer.finish()
+        return balance
+
+    def _update_balance(self, operation: PolicyOperation, amount: float, delta: float) -> float:
+        deposit = operation is PolicyOperation.DEPOSIT
+        self._balance += delta if deposit else -delta
+        balance = self.get_balance()
+        if self._journal is not None:
+            kind = RecordKind.DEPOSIT if deposit else RecordKind.WITHDRAW
+            self._journal.record(kind, self.account_id, amount, balance)
+        commit_policies(self._policies_for(operation), self, (amount,))
+        if self._balance_listeners:
+            self._notify_balance_change(amount if deposit else -amount)
+        return balance
+
+    def _log_operation(self, operation: PolicyOperation, amount: float, balance: float):
+        self._logger.info(
+            "Deposited %.2f. New balance: %.2f"
+            if operation is PolicyOperation.DEPOSIT
+            else "Withdrew %.2f. New balance: %.2f",
+            amount,
+            balance,
+            extra=self._log_extra,
+        )
+
+    def apply_batch(self, ops: Iterable[Tuple[PolicyOperation, float]]) -> float:
+        """
+        Applies a batch of deposits and withdrawals atomically and returns the updated balance.
+        Every policy is evaluated once per supported operation with all the amounts of the batch.
+
+        Args:
+            ops (Iterable[Tuple[PolicyOperation, float]]): Pairs of operation and amount.
+                Every amount must be greater than zero.
+
+        Returns:
+            float: The updated account balance.
+
+        Example:
+            >>> account = SimpleBankAccount(balance=100)
+            >>> account.apply_batch([(PolicyOperation.DEPOSIT, 50), (PolicyOperation.WITHDRAW, 30)])
+            120
+        """
+        timer = self._start_timer("batch")
+
+        try:
+            balance = self._apply_batch(ops, timer)
+        except Exception:
+            timer.finish(rejected=True)
+            raise
+
+        timer.finish()
+        return balance
+
+    def _apply_batch(self, ops: Iterable[Tuple[PolicyOperation, float]], timer: OperationTimer) -> float:
+        deposits, withdrawals = split_batch(ops)
+
+        if not deposits and not withdrawals:
+            return self.get_balance()
+
+        delta = sum(map(self._to_balance_units, deposits)) - sum(
+            map(self._to_balance_units, withdrawals)
+        )
+
+        deposited = sum(deposits)
+        withdrawn = sum(withdrawals)
+        timer.phase("validation")
+
+        with self._lock:
+            if deposits:
+                self._check_policies(PolicyOperation.DEPOSIT, deposits, batch=True)
+            if withdrawals:
+                self._check_policies(PolicyOperation.WITHDRAW, withdrawals, batch=True)
+            timer.phase("policies")
+
+            self._balance += delta
+            balance = self.get_balance()
+            if self._journal is not None:
+                self._record_batch(deposits, withdrawals, balance)
+            if deposits:
+                commit_policies(self._policies_for(PolicyOperation.DEPOSIT), self, deposits)
+            if withdrawals:
+                commit_policies(self._policies_for(PolicyOperation.WITHDRAW), self, withdrawals)
+            if self._balance_listeners:
+                self._notify_balance_change(deposited - withdrawn)
+            timer.phase("balance_update")
+
+        self._logger.info(
+            "Applied batch of %d operations (deposited %.2f, withdrew %.2f). New balance: %.2f",
+            len(deposits) + len(withdrawals),
+            deposited,
+            withdrawn,
+            balance,
+            extra=self._log_extra,
+        )
+        timer.phase("logging")
+        return balance
+
+    def _record_batch(self, deposits: List[float], withdrawals: List[float], balance: float):
+        records = [(RecordKind.DEPOSIT, amount) for amount in deposits]
+        records += [(RecordKind.WITHDRAW, amount) for amount in withdrawals]
+
+        for kind, amount in records[:-1]:
+            self._journal.record(kind, self.account_id, amount)
+        kind, amount = records[-1]
+        self._journal.record(kind, self.account_id, amount, balance)
 
     def get_balance(self) -> float:
         """
@@ -120,3 +461,166 @@ class SimpleBankAccount(BankAccount):
             200
         """
         return self._balance
+
+
+def transfer(
+    src: SimpleBankAccount, dst: SimpleBankAccount, amount: float
+) -> Tuple[float, float]:
+    """
+    Moves an amount from one account to another atomically and returns both updated balances.
+    Both accounts must be SimpleBankAccount instances, see transfer_many.
+
+    Args:
+        src (SimpleBankAccount): The account to withdraw from.
+        dst (SimpleBankAccount): The account to deposit into.
+        amount (float): The amount to transfer. Must be greater than zero.
+
+    Returns:
+        Tuple[float, float]: The updated balances of the source and destination accounts.
+
+    Example:
+        >>> src, dst = SimpleBankAccount(balance=100), SimpleBankAccount()
+        >>> transfer(src, dst, 40)
+        (60, 40)
+    """
+    return transfer_many([(src, dst, amount)])[0]
+
+
+def transfer_many(
+    transfers: Iterable[Tuple[SimpleBankAccount, SimpleBankAccount, float]],
+) -> List[Tuple[float, float]]:
+    """
+    Applies many transfers atomically: either every transfer is applied or, if any of them
+    is invalid or rejected by a policy, none is. Policies are evaluated against the balances
+    before the batch. The locks of every involved account are acquired in a global order,
+    so concurrent transfers cannot deadlock.
+
+    Transfers lock, update and journal both accounts directly, so they only support
+    SimpleBankAccount instances and subclasses, other BankAccount implementations raise
+    a TypeError.
+
+    Args:
+        transfers (Iterable[Tuple[SimpleBankAccount, SimpleBankAccount, float]]): Triples of
+            source account, destination account and amount.
+
+    Returns:
+        List[Tuple[float, float]]: The source and destination balances after each transfer.
+    """
+    start = time.perf_counter()
+    prepared = _prepare_transfers(transfers)
+    accounts = {id(account): account for src, dst, *_ in prepared for account in (src, dst)}
+    timer = _start_transfer_timer(accounts.values(), start)
+
+    try:
+        balances = _apply_transfers(accounts, prepared, timer)
+
+        for (src, dst, amount, *_), (src_balance, _) in zip(prepared, balances):
+            src._logger.info(
+                "Transferred %.2f to account %s. New balance: %.2f",
+                amount,
+                dst.account_id,
+                src_balance,
+                extra=src._log_extra,
+            )
+        timer.phase("logging")
+    except Exception:
+        timer.finish(rejected=True)
+        raise
+
+    timer.finish()
+    return balances
+
+
+_PreparedTransfer = Tuple[SimpleBankAccount, SimpleBankAccount, float, float, float]
+
+
+def _prepare_transfers(
+    transfers: Iterable[Tuple[SimpleBankAccount, SimpleBankAccount, float]],
+) -> List[_PreparedTransfer]:
+    prepared = []
+    for src, dst, amount in transfers:
+        for account in (src, dst):
+            if not isinstance(account, SimpleBankAccount):
+                raise TypeError(
+                    f"Transfers only support SimpleBankAccount instances, got {type(account).__name__}"
+                )
+        if src is dst:
+            raise ValueError("Source and destination accounts must be different")
+        if amount <= 0:
+            raise ValueError("Amount must be greater than zero")
+        prepared.append(
+            (src, dst, amount, src._to_balance_units(amount), dst._to_balance_units(amount))
+        )
+    return prepared
+
+
+def _group_transfer_amounts(
+    prepared: List[_PreparedTransfer],
+) -> Tuple[Tuple[PolicyOperation, Dict[int, List[float]]], ...]:
+    withdrawals: Dict[int, List[float]] = {}
+    deposits: Dict[int, List[float]] = {}
+    for src, dst, amount, *_ in prepared:
+        withdrawals.setdefault(id(src), []).append(amount)
+        deposits.setdefault(id(dst), []).append(amount)
+    return (PolicyOperation.WITHDRAW, withdrawals), (PolicyOperation.DEPOSIT, deposits)
+
+
+def _start_transfer_timer(
+    accounts: Iterable[SimpleBankAccount], start: float
+) -> OperationTimer:
+    # A transfer is recorded once by every instrumentation of the accounts it involves.
+    instrumentations = {
+        id(account._instrumentation): account._instrumentation
+        for account in accounts
+        if account._instrumentation is not None
+    }
+    if not instrumentations:
+        return _NO_TIMER
+
+    timer = OperationTimer(tuple(instrumentations.values()), "transfer", start)
+    timer.phase("validation")
+    return timer
+
+
+def _apply_transfers(
+    accounts: Dict[int, SimpleBankAccount],
+    prepared: List[_PreparedTransfer],
+    timer: OperationTimer,
+) -> List[Tuple[float, float]]:
+    with ExitStack() as stack:
+        for key in sorted(accounts):
+            stack.enter_context(accounts[key]._lock)
+
+        # Amounts are grouped per account so policies check them together.
+        grouped = _group_transfer_amounts(prepared)
+        for operation, amounts_by_account in grouped:
+            for key, amounts in amounts_by_account.items():
+                accounts[key]._check_policies(operation, amounts)
+        timer.phase("policies")
+
+        balances = _commit_transfers(prepared)
+        for operation, amounts_by_account in grouped:
+            for key, amounts in amounts_by_account.items():
+                account = accounts[key]
+                commit_policies(account._policies_for(operation), account, amounts)
+        timer.phase("balance_update")
+
+    return balances
+
+
+def _commit_transfers(prepared: List[_PreparedTransfer]) -> List[Tuple[float, float]]:
+    balances: List[Tuple[float, float]] = []
+    for src, dst, amount, src_delta, dst_delta in prepared:
+        src._balance -= src_delta
+        dst._balance += dst_delta
+        src_balance, dst_balance = src.get_balance(), dst.get_balance()
+        balances.append((src_balance, dst_balance))
+        if src._journal is not None:
+            src._journal.record(RecordKind.WITHDRAW, src.account_id, amount, src_balance)
+        if dst._journal is not None:
+            dst._journal.record(RecordKind.DEPOSIT, dst.account_id, amount, dst_balance)
+        if src._balance_listeners:
+            src._notify_balance_change(-amount)
+        if dst._balance_listeners:
+            dst._notify_balance_change(amount)
+    return balances
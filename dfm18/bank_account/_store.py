@@ -0,0 +1,260 @@
+from typing import Dict, Iterable, List, Optional, Sequence, Tuple, Union
+
+from array import array
+
+from ._base import BankAccount
+
+from ._minor_units import to_minor_units
+
+from ._simple import split_batch
+
+from .policies import Policy, PolicyOperation
+
+from .policies._base import apply_policy_batch, check_policies, commit_policies
+
+
+# Range of the int64 balances of an AccountStore, in minor units.
+_MIN_BALANCE = -(1 << 63)
+_MAX_BALANCE = (1 << 63) - 1
+
+
+class AccountStore:
+    def __init__(self, minor_units: int = 100):
+        """
+        Initializes a columnar store keeping the balances of many accounts in a single
+        int64 array of minor units. Accounts sharing the same policies share one policy set.
+
+        Args:
+            minor_units (int, optional): Number of minor units in one unit of currency. Defaults to 100.
+
+        Example:
+            >>> store = AccountStore()
+            >>> first = store.add_account(balance=100)
+            >>> second = store.add_account(balance=50)
+            >>> store.deposit_many([first, second], [10, 20])
+            >>> store.account(second).balance
+            70.0
+        """
+        if minor_units <= 0:
+            raise ValueError("Minor units must be greater than zero")
+
+        self.minor_units = minor_units
+        self._balances = array("q")
+        self._policy_set_ids = array("I")
+        self._policy_sets: List[Tuple[Policy, ...]] = [()]
+        self._policy_set_index: Dict[Tuple[Policy, ...], int] = {(): 0}
+        self._policies_by_operation: Dict[
+            Tuple[int, PolicyOperation], Tuple[Policy, ...]
+        ] = {}
+
+    def __len__(self) -> int:
+        return len(self._balances)
+
+    def add_account(
+        self, balance: float = 0, policies: Optional[Sequence[Policy]] = None
+    ) -> int:
+        """
+        Adds an account to the store.
+
+        Args:
+            balance (float, optional): Initial account balance. Defaults to 0.
+            policies (Optional[Sequence[Policy]], optional): Policies to enforce on operations. Defaults to None.
+
+        Returns:
+            int: The index of the new account.
+        """
+        policy_set = tuple(policies or ())
+        policy_set_id = self._policy_set_index.get(policy_set)
+        if policy_set_id is None:
+            policy_set_id = len(self._policy_sets)
+            self._policy_sets.append(policy_set)
+            self._policy_set_index[policy_set] = policy_set_id
+
+        self._balances.append(to_minor_units(balance, self.minor_units))
+        self._policy_set_ids.append(policy_set_id)
+        return len(self._balances) - 1
+
+    def account(self, index: int) -> "StoredAccount":
+        """
+        Returns a lightweight view of an account of the store.
+
+        Args:
+            index (int): The index of the account.
+
+        Returns:
+            StoredAccount: A view conforming to the BankAccount protocol.
+        """
+        if not 0 <= index < len(self._balances):
+            raise IndexError("Account index out of range")
+        return StoredAccount(self, index)
+
+    def get_balance(self, index: int) -> float:
+        return self._balances[index] / self.minor_units
+
+    def policies(self, index: int) -> Tuple[Policy, ...]:
+        return self._policy_sets[self._policy_set_ids[index]]
+
+    def deposit_many(
+        self, indices: Sequence[int], amounts: Union[float, Sequence[float]]
+    ):
+        """
+        Deposits amounts into many accounts at once. Either every deposit is applied or,
+        if any of them is invalid or rejected by a policy, none is.
+
+        Args:
+            indices (Sequence[int]): Indices of the accounts.
+            amounts (Union[float, Sequence[float]]): One amount per account, or a single amount for all of them.
+        """
+        self._apply_many(indices, amounts, PolicyOperation.DEPOSIT, 1)
+
+    def withdraw_many(
+        self, indices: Sequence[int], amounts: Union[float, Sequence[float]]
+    ):
+        """
+        Withdraws amounts from many accounts at once. Either every withdrawal is applied or,
+        if any of them is invalid or rejected by a policy, none is.
+
+        Args:
+            indices (Sequence[int]): Indices of the accounts.
+            amounts (Union[float, Sequence[float]]): One amount per account, or a single amount for all of them.
+        """
+        self._apply_many(indices, amounts, PolicyOperation.WITHDRAW, -1)
+
+    def _apply_many(
+        self,
+        indices: Sequence[int],
+        amounts: Union[float, Sequence[float]],
+        operation: PolicyOperation,
+        sign: int,
+    ):
+        if isinstance(amounts, (int, float)):
+            amounts = [amounts] * len(indices)
+        elif len(amounts) != len(indices):
+            raise ValueError("Indices and amounts must have the same length")
+
+        if amounts and min(amounts) <= 0:
+            raise ValueError("Amount must be greater than zero")
+
+        size = len(self._balances)
+        if indices and not (0 <= min(indices) and max(indices) < size):
+            raise IndexError("Account index out of range")
+
+        new_balances = self._new_balances(indices, amounts, sign)
+
+        # Amounts of the same account are grouped so policies check them together.
+        policy_set_ids = self._policy_set_ids
+        grouped: Dict[int, List[float]] = {}
+        for index, amount in zip(indices, amounts):
+            if policy_set_ids[index]:
+                grouped.setdefault(index, []).append(amount)
+
+        for index, account_amounts in grouped.items():
+            policies = self._policies_for(policy_set_ids[index], operation)
+            check_policies(policies, StoredAccount(self, index), account_amounts)
+
+        balances = self._balances
+        for index, balance in new_balances.items():
+            balances[index] = balance
+
+        for index, account_amounts in grouped.items():
+            policies = self._policies_for(policy_set_ids[index], operation)
+            commit_policies(policies, StoredAccount(self, index), account_amounts)
+
+    def _new_balances(self, indices: Sequence[int], amounts: Sequence[float], sign: int) -> Dict[int, int]:
+        # Every new balance is range-checked before any is written, so an overflow applies nothing.
+        minor_units = self.minor_units
+        balances = self._balances
+        new_balances: Dict[int, int] = {}
+        for index, amount in zip(indices, amounts):
+            new_balances[index] = new_balances.get(index, balances[index]) + sign * to_minor_units(
+                amount, minor_units
+            )
+
+        if new_balances and not (
+            _MIN_BALANCE <= min(new_balances.values()) and max(new_balances.values()) <= _MAX_BALANCE
+        ):
+            raise OverflowError("Balance out of the range of the store")
+        return new_balances
+
+    def _policies_for(
+        self, policy_set_id: int, operation: PolicyOperation
+    ) -> Tuple[Policy, ...]:
+        key = (policy_set_id, operation)
+        policies = self._policies_by_operation.get(key)
+        if policies is None:
+            policies = tuple(
+                policy
+                for policy in self._policy_sets[policy_set_id]
+                if policy.supports(operation)
+            )
+            self._policies_by_operation[key] = policies
+        return policies
+
+
+class StoredAccount(BankAccount):
+    __slots__ = ("_store", "index", "__weakref__")
+
+    def __init__(self, store: AccountStore, index: int):
+        """
+        Initializes a view of an account kept in an AccountStore. Views are created on demand;
+        views of the same account are equal and share the state policies keep for the account.
+
+        Args:
+            store (AccountStore): The store keeping the account.
+            index (int): The index of the account in the store.
+        """
+        self._store = store
+        self.index = index
+
+    def __eq__(self, other: object) -> bool:
+        if not isinstance(other, StoredAccount):
+            return NotImplemented
+        return self._store is other._store and self.index == other.index
+
+    def __hash__(self) -> int:
+        return hash((id(self._store), self.index))
+
+    def policy_state_key(self) -> Tuple["AccountStore", int]:
+        return self._store, self.index
+
+    @property
+    def policies(self) -> Tuple[Policy, ...]:
+        return self._store.policies(self.index)
+
+    def deposit(self, amount: float) -> float:
+        self._store.deposit_many([self.index], [amount])
+        return self.get_balance()
+
+    def withdraw(self, amount: float) -> float:
+        self._store.withdraw_many([self.index], [amount])
+        return self.get_balance()
+
+    def apply_batch(self, ops: Iterable[Tuple[PolicyOperation, float]]) -> float:
+        deposits, withdrawals = split_batch(ops)
+
+        store = self._store
+        policy_set_id = store._policy_set_ids[self.index]
+        for operation, amounts in (
+            (PolicyOperation.DEPOSIT, deposits),
+            (PolicyOperation.WITHDRAW, withdrawals),
+        ):
+            if amounts and policy_set_id:
+                for policy in store._policies_for(policy_set_id, operation):
+                    apply_policy_batch(policy, self, amounts)
+
+        minor_units = store.minor_units
+        store._balances[self.index] += sum(
+            to_minor_units(amount, minor_units) for amount in deposits
+        ) - sum(to_minor_units(amount, minor_units) for amount in withdrawals)
+
+        if policy_set_id:
+            for operation, amounts in (
+                (PolicyOperation.DEPOSIT, deposits),
+                (PolicyOperation.WITHDRAW, withdrawals),
+            ):
+                if amounts:
+                    commit_policies(store._policies_for(policy_set_id, operation), self, amounts)
+        return self.get_balance()
+
+    def get_balance(self) -> float:
+        return self._store.get_balance(self.index)
@@ -1,2 +1,10 @@
 class WithdrawalTimeRestrictionError(Exception):
     pass
+
+
+class WithdrawalRateLimitError(Exception):
+    pass
+
+
+class WithdrawalAmountLimitError(Exception):
+    pass
@@ -1,5 +1,23 @@
-__all__ = ["Policy", "PolicyOperation", "WithdrawalTimeRestrictionPolicy"]
+__all__ = [
+    "AllOfPolicy",
+    "AnyOfPolicy",
+    "CachedHourClock",
+    "Policy",
+    "PolicyOperation",
+    "PolicyStats",
+    "WithdrawalAmountLimitPolicy",
+    "WithdrawalRateLimitPolicy",
+    "WithdrawalTimeRestrictionPolicy",
+]
 
 
 from ._base import Policy, PolicyOperation
-from ._withdrawal_time_restriction import WithdrawalTimeRestrictionPolicy
+from ._withdrawal_time_restriction import (
+    CachedHourClock,
+    WithdrawalTimeRestrictionPolicy,
+)
+from ._withdrawal_velocity import (
+    WithdrawalAmountLimitPolicy,
+    WithdrawalRateLimitPolicy,
+)
+from ._composite import AllOfPolicy, AnyOfPolicy, PolicyStats
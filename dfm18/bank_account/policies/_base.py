@@ -1,4 +1,4 @@
-from typing import Protocol, runtime_checkable
+from typing import Any, Dict, Hashable, Iterable, Optional, Protocol, Sequence, runtime_checkable
 
 from abc import abstractmethod
 
@@ -6,6 +6,8 @@ from enum import Flag, auto
 
 from .._base import BankAccount
 
+import weakref
+
 
 class PolicyOperation(Flag):
     DEPOSIT = auto()
@@ -19,3 +21,92 @@ class Policy(Protocol):
 
     @abstractmethod
     def supports(self, operation: PolicyOperation) -> bool: ...
+
+
+def apply_policy_batch(policy: Policy, account: BankAccount, amounts: Sequence[float]):
+    """
+    Applies a policy to the amounts of a batch. Like commit, apply_batch(account, amounts) is
+    an optional method outside the Policy protocol: policies whose outcome does not depend on
+    every amount define it to be evaluated once per batch, others are applied to every amount.
+
+    Args:
+        policy (Policy): The policy to apply.
+        account (BankAccount): The account the batch is applied to, before any change.
+        amounts (Sequence[float]): The amounts of the batch for a supported operation.
+    """
+    apply_batch = getattr(policy, "apply_batch", None)
+    if apply_batch is not None:
+        apply_batch(account, amounts)
+        return
+
+    for amount in amounts:
+        policy.apply(account, amount)
+
+
+def check_policies(policies: Iterable[Policy], account: BankAccount, amounts: Sequence[float]):
+    """
+    Applies policies to the amounts of one operation on an account, with apply for a single
+    amount and apply_batch for several, so policies check the amounts together.
+
+    Args:
+        policies (Iterable[Policy]): The policies supporting the operation.
+        account (BankAccount): The account the amounts are applied to, before any change.
+        amounts (Sequence[float]): The amounts of the operation.
+    """
+    if len(amounts) == 1:
+        amount = amounts[0]
+        for policy in policies:
+            policy.apply(account, amount)
+    else:
+        for policy in policies:
+            apply_policy_batch(policy, account, amounts)
+
+
+def commit_policies(policies: Iterable[Policy], account: BankAccount, amounts: Sequence[float]):
+    """
+    Notifies policies that amounts were applied to an account. Policies tracking usage, such as
+    rate limits, only check it in apply and apply_batch and record it in an optional
+    commit(account, amounts) method, so operations rejected or rolled back use no quota.
+
+    Args:
+        policies (Iterable[Policy]): The policies that accepted the amounts.
+        account (BankAccount): The account the amounts were applied to.
+        amounts (Sequence[float]): The applied amounts.
+    """
+    for policy in policies:
+        commit = getattr(policy, "commit", None)
+        if commit is not None:
+            commit(account, amounts)
+
+
+class AccountStates:
+    def __init__(self):
+        """
+        Initializes a map of per-account policy state, released with the account. Accounts
+        defining policy_state_key() -> (owner, key), such as the views of an AccountStore,
+        share the state of their key, kept as long as the owner.
+        """
+        self._states: "weakref.WeakKeyDictionary[Any, Dict[Hashable, Any]]" = (
+            weakref.WeakKeyDictionary()
+        )
+
+    def __len__(self) -> int:
+        return sum(len(states) for states in self._states.values())
+
+    @staticmethod
+    def _key(account: BankAccount):
+        # Looked up on the type, like special methods, so only classes opt in.
+        policy_state_key = getattr(type(account), "policy_state_key", None)
+        return (account, None) if policy_state_key is None else policy_state_key(account)
+
+    def get(self, account: BankAccount) -> Optional[Any]:
+        owner, key = self._key(account)
+        states = self._states.get(owner)
+        return None if states is None else states.get(key)
+
+    def set(self, account: BankAccount, state: Any):
+        owner, key = self._key(account)
+        states = self._states.get(owner)
+        if states is None:
+            states = self._states[owner] = {}
+        states[key] = state
@@ -0,0 +1,175 @@
+from typing import Callable, List, Sequence, Tuple
+
+from abc import abstractmethod
+
+from ._base import Policy, PolicyOperation, apply_policy_batch, commit_policies
+
+from .._base import BankAccount
+
+import time
+
+
+class PolicyStats:
+    __slots__ = ("evaluations", "rejections", "total_ns")
+
+    def __init__(self):
+        self.evaluations = 0
+        self.rejections = 0
+        self.total_ns = 0
+
+    @property
+    def rejection_rate(self) -> float:
+        return self.rejections / self.evaluations if self.evaluations else 0.0
+
+    @property
+    def mean_ns(self) -> float:
+        return self.total_ns / self.evaluations if self.evaluations else 0.0
+
+    def __repr__(self) -> str:
+        return (
+            f"PolicyStats(evaluations={self.evaluations}, rejections={self.rejections}, "
+            f"mean_ns={self.mean_ns:.0f})"
+        )
+
+
+class _CompositePolicy(Policy):
+    def __init__(
+        self,
+        policies: Sequence[Policy],
+        operation: PolicyOperation,
+        reorder_interval: int = 1000,
+    ):
+        if operation not in (PolicyOperation.DEPOSIT, PolicyOperation.WITHDRAW):
+            raise ValueError("A composite policy applies to a single operation")
+        if reorder_interval < 0:
+            raise ValueError("Reorder interval must not be negative")
+
+        self.supported_operations = operation
+        self.reorder_interval = reorder_interval
+        self._entries: List[Tuple[Policy, PolicyStats]] = [
+            (policy, PolicyStats()) for policy in policies if policy.supports(operation)
+        ]
+        self._evaluations = 0
+
+    @property
+    def policies(self) -> Tuple[Policy, ...]:
+        """
+        Retrieves the policies in their current evaluation order.
+        """
+        return tuple(policy for policy, _ in self._entries)
+
+    @property
+    def stats(self) -> List[Tuple[Policy, PolicyStats]]:
+        """
+        Retrieves the evaluation statistics of every policy, in evaluation order.
+        """
+        return list(self._entries)
+
+    def supports(self, operation: PolicyOperation) -> bool:
+        return bool(self.supported_operations & operation)
+
+    def apply(self, account: BankAccount, amount: float):
+        self._evaluate(lambda policy: policy.apply(account, amount))
+
+    def apply_batch(self, account: BankAccount, amounts: Sequence[float]):
+        self._evaluate(lambda policy: apply_policy_batch(policy, account, amounts))
+
+    def commit(self, account: BankAccount, amounts: Sequence[float]):
+        # Every composed policy records the applied amounts, whichever policies were evaluated.
+        commit_policies(self.policies, account, amounts)
+
+    @abstractmethod
+    def _evaluate(self, apply: Callable[[Policy], None]):
+        pass
+
+    def _run(self, policy: Policy, stats: PolicyStats, apply: Callable[[Policy], None]):
+        start = time.perf_counter_ns()
+        try:
+            apply(policy)
+        except Exception:
+            stats.rejections += 1
+            raise
+        finally:
+            stats.evaluations += 1
+            stats.total_ns += time.perf_counter_ns() - start
+
+    def _count_evaluation(self):
+        self._evaluations += 1
+        if self.reorder_interval and self._evaluations % self.reorder_interval == 0:
+            # Sorted into a new list swapped in at once: list.sort empties the list while
+            # sorting, so concurrent evaluations would see no policy at all.
+            self._entries = sorted(self._entries, key=lambda entry: self._priority(entry[1]))
+
+    @abstractmethod
+    def _priority(self, stats: PolicyStats) -> float:
+        pass
+
+
+class AllOfPolicy(_CompositePolicy):
+    def __init__(
+        self,
+        policies: Sequence[Policy],
+        operation: PolicyOperation,
+        reorder_interval: int = 1000,
+    ):
+        """
+        Initializes a policy accepting an operation only when every policy accepts it.
+        Evaluation stops at the first rejection and, every reorder_interval evaluations,
+        policies are reordered to evaluate first the ones that are cheap and reject often.
+
+        Args:
+            policies (Sequence[Policy]): The composed policies. Policies not supporting the operation are ignored.
+            operation (PolicyOperation): The single operation the policy applies to.
+            reorder_interval (int, optional): Evaluations between reorderings, 0 to keep the given order. Defaults to 1000.
+        """
+        super().__init__(policies, operation, reorder_interval)
+
+    def _evaluate(self, apply: Callable[[Policy], None]):
+        try:
+            for policy, stats in self._entries:
+                self._run(policy, stats, apply)
+        finally:
+            self._count_evaluation()
+
+    def _priority(self, stats: PolicyStats) -> float:
+        # Expected cost of reaching a rejection: cheap policies that reject often go first.
+        return stats.mean_ns / max(stats.rejection_rate, 1e-9)
+
+
+class AnyOfPolicy(_CompositePolicy):
+    def __init__(
+        self,
+        policies: Sequence[Policy],
+        operation: PolicyOperation,
+        reorder_interval: int = 1000,
+    ):
+        """
+        Initializes a policy accepting an operation when at least one policy accepts it,
+        raising the rejection of the last policy otherwise. Evaluation stops at the first
+        acceptance and, every reorder_interval evaluations, policies are reordered to
+        evaluate first the ones that are cheap and accept often.
+
+        Args:
+            policies (Sequence[Policy]): The composed policies. Policies not supporting the operation are ignored.
+            operation (PolicyOperation): The single operation the policy applies to.
+            reorder_interval (int, optional): Evaluations between reorderings, 0 to keep the given order. Defaults to 1000.
+        """
+        super().__init__(policies, operation, reorder_interval)
+
+    def _evaluate(self, apply: Callable[[Policy], None]):
+        try:
+            rejection = None
+            for policy, stats in self._entries:
+                try:
+                    self._run(policy, stats, apply)
+                    return
+                except Exception as e:
+                    rejection = e
+
+            if rejection is not None:
+                raise rejection
+        finally:
+            self._count_evaluation()
+
+    def _priority(self, stats: PolicyStats) -> float:
+        return stats.mean_ns / max(1 - stats.rejection_rate, 1e-9)
@@ -1,3 +1,5 @@
+from typing import Callable, Optional, Sequence
+
 from ._base import Policy, PolicyOperation
 
 from .._base import BankAccount
@@ -6,22 +8,78 @@ from ..exceptions import WithdrawalTimeRestrictionError
 
 from datetime import datetime
 
+import time
+
+
+class CachedHourClock:
+    def __init__(self):
+        """
+        Initializes a clock returning the current local hour. The hour is read from the
+        wall clock only once per hour, the rest of the calls compare a monotonic timestamp.
+
+        Example:
+            >>> clock = CachedHourClock()
+            >>> 0 <= clock() <= 23
+            True
+        """
+        self._hour = 0
+        self._expires_at = float("-inf")
+
+    def __call__(self) -> int:
+        if time.monotonic() >= self._expires_at:
+            now = datetime.now()
+            elapsed = now.minute * 60 + now.second + now.microsecond / 1_000_000
+            self._hour = now.hour
+            self._expires_at = time.monotonic() + 3600 - elapsed
+        return self._hour
+
 
 class WithdrawalTimeRestrictionPolicy(Policy):
-    def __init__(self, start_hour: int, end_hour: int):
+    def __init__(
+        self,
+        start_hour: int,
+        end_hour: int,
+        clock: Optional[Callable[[], int]] = None,
+    ):
+        """
+        Initializes a policy allowing withdrawals only between two hours, both included.
+        When start_hour is greater than end_hour the window wraps around midnight.
+
+        Args:
+            start_hour (int): First allowed hour, between 0 and 24.
+            end_hour (int): Last allowed hour, between 0 and 24.
+            clock (Optional[Callable[[], int]], optional): Returns the current hour. Defaults to a CachedHourClock.
+
+        Example:
+            >>> policy = WithdrawalTimeRestrictionPolicy(22, 6, clock=lambda: 23)
+            >>> policy.is_allowed_hour(23), policy.is_allowed_hour(12)
+            (True, False)
+        """
         if not (0 <= start_hour <= 24) or not (0 <= end_hour <= 24):
             raise ValueError("Start hour and end hour must be a valid hour")
         self.start_hour = start_hour
         self.end_hour = end_hour
         self.supported_operations = PolicyOperation.WITHDRAW
+        self.clock = clock if clock is not None else CachedHourClock()
 
-    def apply(self, account: BankAccount, amount: float):
-        now = datetime.now()
+        if start_hour <= end_hour:
+            allowed_hours = range(start_hour, end_hour + 1)
+        else:
+            allowed_hours = [*range(start_hour, 24), *range(0, end_hour + 1)]
+        self._allowed_hours = sum(1 << hour for hour in allowed_hours if hour < 24)
 
-        if not (self.start_hour <= now.hour <= self.end_hour):
+    def is_allowed_hour(self, hour: int) -> bool:
+        return bool(self._allowed_hours >> hour & 1)
+
+    def apply(self, account: BankAccount, amount: float):
+        if not self._allowed_hours >> self.clock() & 1:
             raise WithdrawalTimeRestrictionError(
                 f"Withdrawals are only allowed between {self.start_hour} and {self.end_hour} hours."
             )
 
+    def apply_batch(self, account: BankAccount, amounts: Sequence[float]):
+        if amounts:
+            self.apply(account, sum(amounts))
+
     def supports(self, operation: PolicyOperation) -> bool:
         return bool(self.supported_operations & operation)
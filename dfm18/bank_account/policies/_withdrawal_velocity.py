@@ -0,0 +1,164 @@
+from typing import Callable, List, Sequence
+
+from ._base import AccountStates, Policy, PolicyOperation
+
+from .._base import BankAccount
+
+from ..exceptions import WithdrawalAmountLimitError, WithdrawalRateLimitError
+
+import time
+
+
+class WithdrawalRateLimitPolicy(Policy):
+    def __init__(
+        self,
+        max_withdrawals: int,
+        window_seconds: float,
+        clock: Callable[[], float] = time.monotonic,
+    ):
+        """
+        Initializes a policy allowing at most max_withdrawals withdrawals per account in any
+        rolling window. Every account keeps a ring buffer with the times of its last
+        max_withdrawals withdrawals, so a check is O(1) and uses bounded memory. Withdrawals
+        are only recorded once applied, so rejected ones do not count.
+
+        Args:
+            max_withdrawals (int): Maximum number of withdrawals in a window.
+            window_seconds (float): Length of the rolling window in seconds.
+            clock (Callable[[], float], optional): Returns the current time in seconds. Defaults to time.monotonic.
+
+        Example:
+            >>> from dfm18.bank_account import SimpleBankAccount
+            >>> policy = WithdrawalRateLimitPolicy(2, 60, clock=lambda: 0)
+            >>> account = SimpleBankAccount(balance=100, policies=[policy])
+            >>> account.withdraw(1), account.withdraw(1)
+            (99, 98)
+            >>> account.withdraw(1)
+            Traceback (most recent call last):
+            ...
+            dfm18.bank_account.exceptions.WithdrawalRateLimitError: At most 2 withdrawals are allowed every 60 seconds.
+        """
+        if max_withdrawals <= 0 or window_seconds <= 0:
+            raise ValueError("Max withdrawals and window must be greater than zero")
+
+        self.max_withdrawals = max_withdrawals
+        self.window_seconds = window_seconds
+        self.clock = clock
+        self.supported_operations = PolicyOperation.WITHDRAW
+        self._windows = AccountStates()
+
+    def apply(self, account: BankAccount, amount: float):
+        self.apply_batch(account, (amount,))
+
+    def apply_batch(self, account: BankAccount, amounts: Sequence[float]):
+        count = len(amounts)
+        if not count:
+            return
+
+        window = self._windows.get(account)
+        if count <= self.max_withdrawals and window is None:
+            return
+        # Times are ordered from the head, so the count-th oldest one must have left the window.
+        if count > self.max_withdrawals or (
+            self.clock() - window[1][(window[0] + count - 1) % self.max_withdrawals]
+            < self.window_seconds
+        ):
+            raise WithdrawalRateLimitError(
+                f"At most {self.max_withdrawals} withdrawals are allowed every {self.window_seconds} seconds."
+            )
+
+    def commit(self, account: BankAccount, amounts: Sequence[float]):
+        window = self._windows.get(account)
+        if window is None:
+            window = [0, [float("-inf")] * self.max_withdrawals]
+            self._windows.set(account, window)
+
+        now = self.clock()
+        head, times = window
+        for _ in amounts:
+            times[head] = now
+            head = (head + 1) % self.max_withdrawals
+        window[0] = head
+
+    def supports(self, operation: PolicyOperation) -> bool:
+        return bool(self.supported_operations & operation)
+
+
+class WithdrawalAmountLimitPolicy(Policy):
+    def __init__(
+        self,
+        max_amount: float,
+        window_seconds: float,
+        buckets: int = 60,
+        clock: Callable[[], float] = time.monotonic,
+    ):
+        """
+        Initializes a policy limiting the amount withdrawn from an account in a rolling window.
+        Every account keeps the withdrawn amounts in a ring of time buckets and their running
+        total, so a check is O(1) amortized; the window slides one bucket at a time. Amounts
+        are only recorded once withdrawn, so rejected withdrawals do not count.
+
+        Args:
+            max_amount (float): Maximum amount withdrawn in a window.
+            window_seconds (float): Length of the rolling window in seconds.
+            buckets (int, optional): Number of buckets the window is divided in. Defaults to 60.
+            clock (Callable[[], float], optional): Returns the current time in seconds. Defaults to time.monotonic.
+        """
+        if max_amount <= 0 or window_seconds <= 0 or buckets <= 0:
+            raise ValueError("Max amount, window and buckets must be greater than zero")
+
+        self.max_amount = max_amount
+        self.window_seconds = window_seconds
+        self.buckets = buckets
+        self.clock = clock
+        self.supported_operations = PolicyOperation.WITHDRAW
+        self._bucket_seconds = window_seconds / buckets
+        self._windows = AccountStates()
+
+    def withdrawn(self, account: BankAccount) -> float:
+        """
+        Retrieves the amount withdrawn from an account in the current window.
+        """
+        window = self._windows.get(account)
+        if window is None:
+            return 0.0
+        self._advance(window, int(self.clock() // self._bucket_seconds))
+        return window[1]
+
+    def _advance(self, window: List, bucket: int):
+        last_bucket, _, amounts = window
+        if bucket - last_bucket >= self.buckets:
+            amounts[:] = [0.0] * self.buckets
+            window[1] = 0.0
+        else:
+            for expired in range(last_bucket + 1, bucket + 1):
+                index = expired % self.buckets
+                window[1] -= amounts[index]
+                amounts[index] = 0.0
+        window[0] = max(last_bucket, bucket)
+
+    def apply(self, account: BankAccount, amount: float):
+        self.apply_batch(account, (amount,))
+
+    def apply_batch(self, account: BankAccount, amounts: Sequence[float]):
+        if amounts and self.withdrawn(account) + sum(amounts) > self.max_amount:
+            raise WithdrawalAmountLimitError(
+                f"At most {self.max_amount} can be withdrawn every {self.window_seconds} seconds."
+            )
+
+    def commit(self, account: BankAccount, amounts: Sequence[float]):
+        bucket = int(self.clock() // self._bucket_seconds)
+
+        window = self._windows.get(account)
+        if window is None:
+            window = [bucket, 0.0, [0.0] * self.buckets]
+            self._windows.set(account, window)
+        else:
+            self._advance(window, bucket)
+
+        total = sum(amounts)
+        window[1] += total
+        window[2][window[0] % self.buckets] += total
+
+    def supports(self, operation: PolicyOperation) -> bool:
+        return bool(self.supported_operations & operation)
@@ -1,3 +1,17 @@
+from typing import Any, Callable, Iterable, List, Optional, Sequence, Tuple, Union
+
+from array import array
+
+from itertools import repeat
+
+import operator
+
+try:
+    import numpy as np
+except ImportError:  # pragma: no cover - NumPy is optional
+    np = None
+
+
 def add(num1: int, num2: int) -> int:
     return num1 + num2
 
@@ -12,3 +26,110 @@ def multiply(num1: int, num2: int) -> int:
 
 def divide(num1: int, num2: int) -> int:
     return num1 // num2
+
+
+Operand = Union[int, float, Sequence[int], Sequence[float], array, "np.ndarray"]
+
+
+def add_elementwise(num1: Operand, num2: Operand) -> Union[List, array, "np.ndarray"]:
+    """
+    Adds two operands element by element. Scalars and single-element sequences are
+    broadcast to the length of the other operand. The result is a NumPy array when an
+    operand is one, an array.array when an operand is one, and a list otherwise.
+
+    Example:
+        >>> add_elementwise([1, 2, 3], 10)
+        [11, 12, 13]
+    """
+    return _elementwise(operator.add, num1, num2)
+
+
+def subtract_elementwise(num1: Operand, num2: Operand) -> Union[List, array, "np.ndarray"]:
+    """
+    Subtracts two operands element by element, broadcasting like add_elementwise.
+    """
+    return _elementwise(operator.sub, num1, num2)
+
+
+def multiply_elementwise(num1: Operand, num2: Operand) -> Union[List, array, "np.ndarray"]:
+    """
+    Multiplies two operands element by element, broadcasting like add_elementwise.
+    """
+    return _elementwise(operator.mul, num1, num2)
+
+
+def divide_elementwise(
+    num1: Operand, num2: Operand, zero_division: Optional[Union[int, float]] = None
+) -> Union[List, array, "np.ndarray"]:
+    """
+    Floor divides two operands element by element, broadcasting like add_elementwise.
+
+    Args:
+        num1 (Operand): The dividends.
+        num2 (Operand): The divisors.
+        zero_division (Optional[Union[int, float]], optional): The result of the divisions by zero.
+            Defaults to None, raising ZeroDivisionError like divide.
+
+    Returns:
+        Union[List, array, np.ndarray]: The quotients.
+
+    Raises:
+        ZeroDivisionError: If a divisor is zero and zero_division is None.
+
+    Example:
+        >>> divide_elementwise([7, 8, 9], [2, 0, 3], zero_division=0)
+        [3, 0, 3]
+    """
+    if np is not None and (isinstance(num1, np.ndarray) or isinstance(num2, np.ndarray)):
+        num1, num2 = np.broadcast_arrays(np.asarray(num1), np.asarray(num2))
+        zero = num2 == 0
+        if not zero.any():
+            return np.floor_divide(num1, num2)
+        if zero_division is None:
+            raise ZeroDivisionError("integer division or modulo by zero")
+        return np.where(zero, zero_division, np.floor_divide(num1, np.where(zero, 1, num2)))
+
+    # The membership test runs in C, so only operands with a zero divisor pay for a
+    # Python-level call per element.
+    if zero_division is None or not (num2 == 0 if isinstance(num2, (int, float)) else 0 in num2):
+        return _elementwise(operator.floordiv, num1, num2)
+
+    def floordiv(dividend, divisor):
+        return dividend // divisor if divisor else zero_division
+
+    return _elementwise(floordiv, num1, num2)
+
+
+def _elementwise(
+    operation: Callable[[Any, Any], Any], num1: Operand, num2: Operand
+) -> Union[List, array, "np.ndarray"]:
+    if np is not None and (isinstance(num1, np.ndarray) or isinstance(num2, np.ndarray)):
+        return operation(np.asarray(num1), np.asarray(num2))
+
+    values1, length1 = _broadcastable(num1)
+    values2, length2 = _broadcastable(num2)
+    if length1 is not None and length2 is not None and length1 != length2 and 1 not in (length1, length2):
+        raise ValueError(f"Operands cannot be broadcast together: lengths {length1} and {length2}")
+
+    if length1 is None and length2 is None:
+        return operation(num1, num2)
+    if length1 == 1 and length2 != 1:
+        values1 = repeat(num1[0])
+    if length2 == 1 and length1 != 1:
+        values2 = repeat(num2[0])
+
+    # map runs the loop in C: with an operator function, no Python-level call is made per element.
+    result = list(map(operation, values1, values2))
+
+    typecode = next((num.typecode for num in (num1, num2) if isinstance(num, array)), None)
+    if typecode is None:
+        return result
+    if typecode not in "fd" and any(isinstance(value, float) for value in result):
+        typecode = "d"
+    return array(typecode, result)
+
+
+def _broadcastable(num: Operand) -> Tuple[Iterable, Optional[int]]:
+    if isinstance(num, (int, float)):
+        return repeat(num), None
+    return num, len(num)
@@ -0,0 +1,289 @@
+from typing import Any, Callable, Dict, Hashable, Iterable, List, Mapping, Optional, Tuple, Union
+
+from collections import OrderedDict
+
+from . import calculator
+
+import weakref
+
+
+Number = Union[int, float]
+
+_OPERATIONS: Dict[str, Tuple[str, Callable[[Any, Any], Any], Callable[..., Any]]] = {
+    "add": ("+", calculator.add, calculator.add_elementwise),
+    "subtract": ("-", calculator.subtract, calculator.subtract_elementwise),
+    "multiply": ("*", calculator.multiply, calculator.multiply_elementwise),
+    "divide": ("//", calculator.divide, calculator.divide_elementwise),
+}
+
+# Expressions are interned, so structurally equal subexpressions are the same object.
+_interned: "weakref.WeakValueDictionary[Hashable, Expression]" = weakref.WeakValueDictionary()
+
+
+class Expression:
+    __slots__ = ("_compiled", "__weakref__")
+
+    _compiled: Optional["CompiledExpression"]
+
+    def __add__(self, other: Union["Expression", Number]) -> "Expression":
+        return _operation("add", self, other)
+
+    def __radd__(self, other: Number) -> "Expression":
+        return _operation("add", other, self)
+
+    def __sub__(self, other: Union["Expression", Number]) -> "Expression":
+        return _operation("subtract", self, other)
+
+    def __rsub__(self, other: Number) -> "Expression":
+        return _operation("subtract", other, self)
+
+    def __mul__(self, other: Union["Expression", Number]) -> "Expression":
+        return _operation("multiply", self, other)
+
+    def __rmul__(self, other: Number) -> "Expression":
+        return _operation("multiply", other, self)
+
+    def __floordiv__(self, other: Union["Expression", Number]) -> "Expression":
+        return _operation("divide", self, other)
+
+    def __rfloordiv__(self, other: Number) -> "Expression":
+        return _operation("divide", other, self)
+
+    def compile(self) -> "CompiledExpression":
+        """
+        Compiles the expression, once, into a sequence of calculator calls.
+        """
+        if self._compiled is None:
+            self._compiled = CompiledExpression(self)
+        return self._compiled
+
+    def evaluate(self, **variables: Any) -> Any:
+        """
+        Evaluates the expression for the given variable values.
+
+        Example:
+            >>> x = variable("x")
+            >>> ((x + 1) * (x + 1)).evaluate(x=2)
+            9
+        """
+        return self.compile().evaluate(variables)
+
+
+class Constant(Expression):
+    __slots__ = ("value",)
+
+    def __init__(self, value: Number):
+        self.value = value
+
+    def __repr__(self) -> str:
+        return repr(self.value)
+
+
+class Variable(Expression):
+    __slots__ = ("name",)
+
+    def __init__(self, name: str):
+        self.name = name
+
+    def __repr__(self) -> str:
+        return self.name
+
+
+class Operation(Expression):
+    __slots__ = ("operation", "left", "right")
+
+    def __init__(self, operation: str, left: Expression, right: Expression):
+        self.operation = operation
+        self.left = left
+        self.right = right
+
+    def __repr__(self) -> str:
+        return f"({self.left!r} {_OPERATIONS[self.operation][0]} {self.right!r})"
+
+
+def _intern(key: Hashable, create: Callable[[], Expression]) -> Expression:
+    expression = _interned.get(key)
+    if expression is None:
+        expression = create()
+        expression._compiled = None
+        _interned[key] = expression
+    return expression
+
+
+def constant(value: Number) -> Constant:
+    """
+    Creates an expression with a constant value.
+    """
+    return _intern(("constant", type(value), repr(value)), lambda: Constant(value))
+
+
+def variable(name: str) -> Variable:
+    """
+    Creates an expression whose value is provided at evaluation.
+    """
+    return _intern(("variable", name), lambda: Variable(name))
+
+
+def _operation(
+    operation: str, left: Union[Expression, Number], right: Union[Expression, Number]
+) -> Expression:
+    left = left if isinstance(left, Expression) else constant(left)
+    right = right if isinstance(right, Expression) else constant(right)
+
+    if isinstance(left, Constant) and isinstance(right, Constant):
+        try:
+            return constant(_OPERATIONS[operation][1](left.value, right.value))
+        except ZeroDivisionError:
+            pass  # Left to fail at evaluation, like the eager call would.
+
+    # Only int identities are dropped: x * 1.0 still makes an int x a float.
+    if isinstance(right, Constant) and type(right.value) is int:
+        if (operation in ("add", "subtract") and right.value == 0) or (
+            operation == "multiply" and right.value == 1
+        ):
+            return left
+    if isinstance(left, Constant) and type(left.value) is int:
+        if (operation == "add" and left.value == 0) or (operation == "multiply" and left.value == 1):
+            return right
+
+    return _intern(
+        (operation, id(left), id(right)), lambda: Operation(operation, left, right)
+    )
+
+
+class CompiledExpression:
+    def __init__(self, expression: Expression, cache_size: int = 1024):
+        """
+        Initializes an expression ready for evaluation. Shared subexpressions are computed
+        once per evaluation, and results are memoized per variable values in a bounded
+        LRU cache.
+
+        Args:
+            expression (Expression): The expression to compile.
+            cache_size (int, optional): Results kept in the cache. Defaults to 1024.
+
+        Example:
+            >>> x, y = variable("x"), variable("y")
+            >>> compiled = ((x + y) * (x + y) - 2 * 3).compile()
+            >>> compiled.evaluate({"x": 1, "y": 2})
+            3
+            >>> compiled.evaluate_rows([{"x": 1, "y": 2}, {"x": 2, "y": 2}])
+            [3, 10]
+        """
+        self.expression = expression
+        self.cache_size = cache_size
+        self._cache: "OrderedDict[Tuple, Any]" = OrderedDict()
+
+        slots: Dict[int, int] = {}
+        self._values: List[Any] = []
+        self._variables: List[Tuple[str, int]] = []
+        self._steps: List[Tuple[str, int, int, int]] = []
+
+        # Iterative post-order traversal, so deep expressions do not hit the recursion limit.
+        stack: List[Tuple[Expression, bool]] = [(expression, False)]
+        while stack:
+            node, visited = stack.pop()
+            if id(node) in slots:
+                continue
+            if isinstance(node, Operation) and not visited:
+                stack.append((node, True))
+                stack.append((node.right, False))
+                stack.append((node.left, False))
+                continue
+
+            slot = slots[id(node)] = len(self._values)
+            if isinstance(node, Constant):
+                self._values.append(node.value)
+            elif isinstance(node, Variable):
+                self._values.append(None)
+                self._variables.append((node.name, slot))
+            else:
+                self._values.append(None)
+                self._steps.append(
+                    (node.operation, slots[id(node.left)], slots[id(node.right)], slot)
+                )
+
+        self.variables: Tuple[str, ...] = tuple(name for name, _ in self._variables)
+
+    def __len__(self) -> int:
+        """
+        Retrieves the number of calculator calls of an evaluation.
+        """
+        return len(self._steps)
+
+    def _run(self, variables: Mapping[str, Any], elementwise: bool) -> Any:
+        values = list(self._values)
+        for name, slot in self._variables:
+            try:
+                values[slot] = variables[name]
+            except KeyError:
+                raise KeyError(f"Missing value for variable: {name}") from None
+
+        index = 2 if elementwise else 1
+        for operation, left, right, slot in self._steps:
+            values[slot] = _OPERATIONS[operation][index](values[left], values[right])
+        return values[-1]
+
+    def evaluate(self, variables: Optional[Mapping[str, Any]] = None) -> Any:
+        """
+        Evaluates the expression for the given variable values.
+
+        Args:
+            variables (Optional[Mapping[str, Any]], optional): The value of every variable. Defaults to None.
+
+        Returns:
+            Any: The value of the expression.
+
+        Raises:
+            KeyError: If a variable has no value.
+        """
+        variables = variables or {}
+        try:
+            # Values equal across types, like 3 and 3.0, may evaluate differently.
+            key = tuple((type(value), value) for value in (variables[name] for name in self.variables))
+            hash(key)
+        except (KeyError, TypeError):
+            return self._run(variables, elementwise=False)
+
+        if key in self._cache:
+            self._cache.move_to_end(key)
+            return self._cache[key]
+
+        result = self._run(variables, elementwise=False)
+        self._cache[key] = result
+        if len(self._cache) > self.cache_size:
+            self._cache.popitem(last=False)
+        return result
+
+    def evaluate_columns(self, columns: Mapping[str, Any]) -> Any:
+        """
+        Evaluates the expression over columns of variable values in one pass, calling the
+        element-wise calculator operations once per step of the expression.
+
+        Args:
+            columns (Mapping[str, Any]): The values of every variable, as sequences, arrays or scalars.
+
+        Returns:
+            Any: The value of the expression for every row.
+        """
+        return self._run(columns, elementwise=True)
+
+    def evaluate_rows(self, rows: Iterable[Mapping[str, Any]]) -> List[Any]:
+        """
+        Evaluates the expression for every row of variable values.
+
+        Args:
+            rows (Iterable[Mapping[str, Any]]): The value of every variable, per row.
+
+        Returns:
+            List[Any]: The value of the expression for every row.
+        """
+        rows = list(rows)
+        if not rows:
+            return []
+
+        columns = {name: [row[name] for row in rows] for name in self.variables}
+        result = self.evaluate_columns(columns)
+        if isinstance(result, (int, float)):
+            return [result] * len(rows)
+        return list(result)
@@ -1,17 +1,84 @@
-from typing import List
+from typing import Callable, Dict, Iterable, List, NamedTuple, Optional, Set, Tuple
+
+from bisect import bisect_left
+
+from collections import OrderedDict
+
+from concurrent.futures import ProcessPoolExecutor
 
 from .bank_account import BankAccount
 
 from email_validator import validate_email, EmailNotValidError
 
+import math
+
+
+EMAIL_CACHE_SIZE = 65536
+
+
+class RecordError(NamedTuple):
+    index: int
+    record: Tuple[str, str]
+    error: str
+
+
+def _normalize_email(email: str) -> str:
+    return _email_cache_key(email.strip())
+
+
+def _email_cache_key(email: str) -> str:
+    # Domains are case-insensitive, so lowercasing them does not change validity.
+    local, at, domain = email.rpartition("@")
+    return f"{local}{at}{domain.lower()}" if at else email
+
+
+def _email_error(email: str) -> Optional[str]:
+    try:
+        validate_email(email, check_deliverability=False)
+    except EmailNotValidError as e:
+        return f"Invalid email: {str(e)}"
+    return None
+
+
+class _EmailErrorCache:
+    def __init__(self, max_size: int):
+        self.max_size = max_size
+        self._entries: "OrderedDict[str, Optional[str]]" = OrderedDict()
+
+    def __contains__(self, email: str) -> bool:
+        return email in self._entries
+
+    def __getitem__(self, email: str) -> Optional[str]:
+        self._entries.move_to_end(email)
+        return self._entries[email]
+
+    def __setitem__(self, email: str, error: Optional[str]):
+        self._entries[email] = error
+        self._entries.move_to_end(email)
+        if len(self._entries) > self.max_size:
+            self._entries.popitem(last=False)
+
+    def clear(self):
+        self._entries.clear()
+
+
+_email_errors = _EmailErrorCache(EMAIL_CACHE_SIZE)
+
 
 class User:
-    def __init__(self, name: str, email: str):
+    def __init__(self, name: str, email: str, track_balance: bool = False):
         self._validate_email(email)
+        self._init_attributes(name, email, track_balance)
 
+    def _init_attributes(self, name: str, email: str, track_balance: bool):
         self.name = name
         self.email = email
         self.accounts: List[BankAccount] = []
+        self.track_balance = track_balance
+        self._tracked_balance = 0.0
+        self._untracked_accounts: List[BankAccount] = []
+        self._balance_listeners: List[Callable[["User", float], None]] = []
+        self._untracked_account_listeners: List[Callable[["User", BankAccount], None]] = []
 
     def _validate_email(self, email: str):
         try:
@@ -19,8 +86,259 @@ class User:
         except EmailNotValidError as e:
             raise ValueError(f"Invalid email: {str(e)}")
 
+    @classmethod
+    def from_records(
+        cls,
+        records: Iterable[Tuple[str, str]],
+        track_balance: bool = False,
+        processes: Optional[int] = None,
+    ) -> Tuple[List["User"], List[RecordError]]:
+        """
+        Creates users from (name, email) records, validating every distinct email once.
+        Emails are validated and stored as given, like the constructor does, and results are
+        memoized per email with its domain lowercased in a bounded LRU cache shared by every
+        call. Invalid records, including emails that are not strings, are reported instead
+        of aborting the batch.
+
+        Args:
+            records (Iterable[Tuple[str, str]]): The name and email of every user.
+            track_balance (bool, optional): Creates users tracking their total balance. Defaults to False.
+            processes (Optional[int], optional): Validates emails not cached yet in a pool of this many
+                processes. Defaults to None, validating in the current process.
+
+        Returns:
+            Tuple[List[User], List[RecordError]]: The created users and the errors of the invalid records.
+
+        Example:
+            >>> users, errors = User.from_records([("Ann", "ann@example.com"), ("Bob", "bob")])
+            >>> [user.name for user in users], [error.index for error in errors]
+            (['Ann'], [1])
+        """
+        records = list(records)
+        keys = [_email_cache_key(email) if isinstance(email, str) else None for _, email in records]
+        errors_by_key: Dict[Optional[str], Optional[str]] = {None: "Invalid email: The email must be a string."}
+        pending: List[str] = []
+        for key in dict.fromkeys(keys):
+            if key is None:
+                continue
+            if key in _email_errors:
+                errors_by_key[key] = _email_errors[key]
+            else:
+                pending.append(key)
+
+        if processes is not None and processes > 1 and len(pending) > 1:
+            with ProcessPoolExecutor(max_workers=processes) as executor:
+                chunksize = max(1, len(pending) // (processes * 4))
+                results = list(executor.map(_email_error, pending, chunksize=chunksize))
+        else:
+            results = [_email_error(key) for key in pending]
+
+        for key, error in zip(pending, results):
+            errors_by_key[key] = error
+            _email_errors[key] = error
+
+        users: List[User] = []
+        errors: List[RecordError] = []
+        for index, ((name, email), key) in enumerate(zip(records, keys)):
+            error = errors_by_key[key]
+            if error is not None:
+                errors.append(RecordError(index, (name, email), error))
+                continue
+
+            user = cls.__new__(cls)
+            user._init_attributes(name, email, track_balance)
+            users.append(user)
+
+        return users, errors
+
     def add_account(self, account: BankAccount):
         self.accounts.append(account)
 
+        if not self.track_balance:
+            return
+
+        add_balance_listener = getattr(account, "add_balance_listener", None)
+        if add_balance_listener is None:
+            self._untracked_accounts.append(account)
+            for listener in self._untracked_account_listeners:
+                listener(self, account)
+            return
+
+        add_balance_listener(self._on_balance_change)
+        self._on_balance_change(account, account.get_balance())
+
+    def _on_balance_change(self, account: BankAccount, delta: float):
+        self._tracked_balance += delta
+        for listener in self._balance_listeners:
+            listener(self, delta)
+
+    def add_balance_listener(self, listener: Callable[["User", float], None]):
+        """
+        Registers a callback invoked with the user and the change of its tracked total balance.
+        Only users tracking their total balance notify changes.
+        """
+        self._balance_listeners.append(listener)
+
+    def remove_balance_listener(self, listener: Callable[["User", float], None]):
+        self._balance_listeners.remove(listener)
+
     def get_total_balance(self) -> float:
+        if self.track_balance:
+            return self._tracked_balance + self._get_untracked_balance()
         return sum(account.get_balance() for account in self.accounts)
+
+    def _get_untracked_balance(self) -> float:
+        # Accounts without balance listeners cannot be tracked and are summed on every read.
+        return sum(account.get_balance() for account in self._untracked_accounts)
+
+    def is_total_balance_consistent(self) -> bool:
+        """
+        Checks that the tracked total balance matches the sum of the account balances.
+        """
+        expected = sum(account.get_balance() for account in self.accounts)
+        return math.isclose(self.get_total_balance(), expected, abs_tol=1e-6)
+
+
+class UserRegistry:
+    def __init__(self):
+        """
+        Initializes a registry of users indexed by normalized email and by name prefix.
+        The total balance of users tracking their balance is maintained incrementally.
+
+        Example:
+            >>> registry = UserRegistry()
+            >>> registry.add(User("Ann Smith", "ann@example.com"))
+            >>> registry.get("ANN@example.COM").name
+            'Ann Smith'
+            >>> [user.name for user in registry.find_by_name_prefix("ann")]
+            ['Ann Smith']
+        """
+        self._users: Dict[str, User] = {}
+        # Names are sorted lazily: added names wait in _unsorted_names and removed names stay
+        # in _removed_names until the next prefix search, so adding and removing are O(1)
+        # and a bulk load is sorted once.
+        self._names: List[Tuple[str, str]] = []
+        self._unsorted_names: List[Tuple[str, str]] = []
+        self._removed_names: Set[Tuple[str, str]] = set()
+        self._tracked_balance = 0.0
+        self._untracked_users: Dict[str, User] = {}
+        # Tracked users owning accounts without balance listeners, which are summed on reads.
+        self._users_with_untracked_accounts: Dict[str, User] = {}
+
+    def __len__(self) -> int:
+        return len(self._users)
+
+    def __contains__(self, email: str) -> bool:
+        return self._key(email) in self._users
+
+    @staticmethod
+    def _key(email: str) -> str:
+        return _normalize_email(email).casefold()
+
+    def add(self, user: User):
+        """
+        Adds a user to the registry.
+
+        Args:
+            user (User): The user to add.
+
+        Raises:
+            ValueError: If a user with the same email is already registered.
+        """
+        key = self._key(user.email)
+        if key in self._users:
+            raise ValueError(f"Email already registered: {user.email}")
+
+        self._users[key] = user
+        name = (user.name.casefold(), key)
+        if name in self._removed_names:
+            self._removed_names.discard(name)
+        else:
+            self._unsorted_names.append(name)
+
+        if user.track_balance:
+            user.add_balance_listener(self._on_balance_change)
+            user._untracked_account_listeners.append(self._on_untracked_account)
+            self._tracked_balance += user._tracked_balance
+            if user._untracked_accounts:
+                self._users_with_untracked_accounts[key] = user
+        else:
+            self._untracked_users[key] = user
+
+    def remove(self, email: str) -> User:
+        """
+        Removes the user registered with an email.
+
+        Args:
+            email (str): The email of the user.
+
+        Returns:
+            User: The removed user.
+
+        Raises:
+            KeyError: If no user is registered with the email.
+        """
+        key = self._key(email)
+        user = self._users.pop(key)
+
+        self._removed_names.add((user.name.casefold(), key))
+
+        if user.track_balance:
+            user.remove_balance_listener(self._on_balance_change)
+            user._untracked_account_listeners.remove(self._on_untracked_account)
+            self._tracked_balance -= user._tracked_balance
+            self._users_with_untracked_accounts.pop(key, None)
+        else:
+            del self._untracked_users[key]
+        return user
+
+    def get(self, email: str) -> Optional[User]:
+        return self._users.get(self._key(email))
+
+    def find_by_name_prefix(self, prefix: str) -> List[User]:
+        """
+        Retrieves the users whose name starts with a prefix, ignoring case, sorted by name.
+
+        Args:
+            prefix (str): The prefix of the names.
+
+        Returns:
+            List[User]: The matching users.
+        """
+        self._sort_names()
+        prefix = prefix.casefold()
+        users: List[User] = []
+
+        position = bisect_left(self._names, (prefix, ""))
+        while position < len(self._names):
+            name = self._names[position]
+            if not name[0].startswith(prefix):
+                break
+            if name not in self._removed_names:
+                users.append(self._users[name[1]])
+            position += 1
+        return users
+
+    def _sort_names(self):
+        if self._unsorted_names:
+            # The sorted names form one run, so sorting costs O(n + k log k) for k added names.
+            self._names.extend(self._unsorted_names)
+            self._names.sort()
+            self._unsorted_names.clear()
+        if len(self._removed_names) > len(self._names) // 4:
+            removed = self._removed_names
+            self._names = [name for name in self._names if name not in removed]
+            removed.clear()
+
+    def _on_balance_change(self, user: User, delta: float):
+        self._tracked_balance += delta
+
+    def _on_untracked_account(self, user: User, account: BankAccount):
+        self._users_with_untracked_accounts[self._key(user.email)] = user
+
+    def get_total_balance(self) -> float:
+        return (
+            self._tracked_balance
+            + sum(user._get_untracked_balance() for user in self._users_with_untracked_accounts.values())
+            + sum(user.get_total_balance() for user in self._untracked_users.values())
+        )
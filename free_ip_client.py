@@ -1,12 +1,51 @@
-from typing import Dict, TypedDict
+from typing import (
+    Callable,
+    Dict,
+    Iterable,
+    Iterator,
+    List,
+    Optional,
+    Protocol,
+    Sequence,
+    Tuple,
+    TypedDict,
+    TypeVar,
+    Union,
+    runtime_checkable,
+)
+
+from abc import abstractmethod
+
+from array import array
+
+from bisect import bisect_right
+
+from collections import OrderedDict
+
+from concurrent.futures import ThreadPoolExecutor
 
 import requests
 
+from requests.adapters import HTTPAdapter
+
+import asyncio
+import csv
 import ipaddress
+import json
+import math
+import mmap
+import sqlite3
+import struct
+import sys
+import threading
+import time
+import weakref
 
 
 FREE_IP_API_URL = "https://freeipapi.com/api/json"
 
+T = TypeVar("T")
+
 
 class Location(TypedDict):
     country: str
@@ -14,11 +53,30 @@ class Location(TypedDict):
     city: str
 
 
-def get_location(ip: str) -> Location:
-    ipaddress.ip_address(ip)
+def get_location(
+    ip: str,
+    index: Optional["LocationIndex"] = None,
+    cache: Optional["LocationCacheBackend"] = None,
+) -> Location:
+    address = ipaddress.ip_address(ip)
+    if index is not None:
+        location = index.lookup(address)
+        if location is not None:
+            return location
+    if cache is not None:
+        location = cache.get(str(address))
+        if location is not None:
+            return location
     response = requests.get(f"{FREE_IP_API_URL}/{ip}")
     response.raise_for_status()
     data: Dict[str, str] = response.json()
+    location = _to_location(data)
+    if cache is not None:
+        cache.set(str(address), location)
+    return location
+
+
+def _to_location(data: Dict[str, str]) -> Location:
     return {
         "country": data["countryName"],
         "region": data["regionName"],
@@ -26,5 +84,753 @@ def get_location(ip: str) -> Location:
     }
 
 
+def normalize_ip(ip: str) -> str:
+    """
+    Validates an IP address and returns its canonical representation.
+
+    >>> normalize_ip("2001:DB8:0:0::1")
+    '2001:db8::1'
+    """
+    return str(ipaddress.ip_address(ip.strip()))
+
+
+_MIN_PENDING_RANGES = 1024
+
+
+class _RangeTable:
+    def __init__(self, width: int):
+        """
+        Sorted, non-overlapping address ranges of one IP version with the id of their
+        location. Ranges are kept in three packed columns, which may be slices of a
+        memory-mapped file, and searched by bisection: starts and ends are native
+        unsigned 32-bit integers for IPv4 and 16-byte big-endian keys for IPv6, so both
+        sort as the addresses they encode. Added ranges are kept in small sorted lists
+        and merged into the columns once there are enough of them.
+
+        Args:
+            width (int): Bytes of an address, 4 for IPv4 and 16 for IPv6.
+        """
+        self.width = width
+        self._set_columns(b"", b"", b"")
+        self._pending_starts: List[int] = []
+        self._pending_ends: List[int] = []
+        self._pending_ids: List[int] = []
+
+    def __len__(self) -> int:
+        return len(self._ids) + len(self._pending_ids)
+
+    def _set_columns(self, starts: bytes, ends: bytes, ids: bytes):
+        self._columns = (starts, ends, ids)
+        if self.width == 4:
+            self._starts = memoryview(starts).cast("I")
+            self._ends = memoryview(ends).cast("I")
+        else:
+            self._starts = _PackedKeys(starts, self.width)
+            self._ends = _PackedKeys(ends, self.width)
+        self._ids = memoryview(ids).cast("I")
+
+    def _key(self, value: int) -> Union[int, bytes]:
+        return value if self.width == 4 else value.to_bytes(self.width, "big")
+
+    def _encode(self, value: int) -> bytes:
+        return value.to_bytes(self.width, sys.byteorder if self.width == 4 else "big")
+
+    def _to_int(self, key: Union[int, bytes]) -> int:
+        return key if self.width == 4 else int.from_bytes(key, "big")
+
+    def lookup(self, value: int) -> Optional[int]:
+        key = self._key(value)
+        position = bisect_right(self._starts, key) - 1
+        if position >= 0 and key <= self._ends[position]:
+            return self._ids[position]
+
+        position = bisect_right(self._pending_starts, value) - 1
+        if position >= 0 and value <= self._pending_ends[position]:
+            return self._pending_ids[position]
+        return None
+
+    def add(self, start: int, end: int, location_id: int):
+        if self._overlaps(self._starts, self._ends, self._key(start), self._key(end)) or self._overlaps(
+            self._pending_starts, self._pending_ends, start, end
+        ):
+            raise ValueError("Networks of a location index must not overlap")
+
+        position = bisect_right(self._pending_starts, start)
+        self._pending_starts.insert(position, start)
+        self._pending_ends.insert(position, end)
+        self._pending_ids.insert(position, location_id)
+
+        # Merging copies the columns, so it waits for a number of ranges growing with them.
+        if len(self._pending_ids) >= max(_MIN_PENDING_RANGES, math.isqrt(len(self._ids))):
+            self.merge()
+
+    @staticmethod
+    def _overlaps(starts: Sequence, ends: Sequence, start: Union[int, bytes], end: Union[int, bytes]) -> bool:
+        position = bisect_right(starts, start)
+        return (position > 0 and ends[position - 1] >= start) or (
+            position < len(starts) and starts[position] <= end
+        )
+
+    def merge(self):
+        """
+        Merges the added ranges into the columns. The columns are copied once, in slices
+        between the positions of the added ranges.
+        """
+        if not self._pending_ids:
+            return
+
+        width = self.width
+        columns = [[], [], []]
+        previous = 0
+        for start, end, location_id in zip(self._pending_starts, self._pending_ends, self._pending_ids):
+            position = bisect_right(self._starts, self._key(start))
+            values = (self._encode(start), self._encode(end), location_id.to_bytes(4, sys.byteorder))
+            for pieces, column, item_width, value in zip(columns, self._columns, (width, width, 4), values):
+                pieces.append(column[previous * item_width:position * item_width])
+                pieces.append(value)
+            previous = position
+        for pieces, column, item_width in zip(columns, self._columns, (width, width, 4)):
+            pieces.append(column[previous * item_width:])
+
+        self._set_columns(*(b"".join(pieces) for pieces in columns))
+        self._pending_starts.clear()
+        self._pending_ends.clear()
+        self._pending_ids.clear()
+
+    def ranges(self) -> Iterator[Tuple[int, int, int]]:
+        self.merge()
+        for start, end, location_id in zip(self._starts, self._ends, self._ids):
+            yield self._to_int(start), self._to_int(end), location_id
+
+    @classmethod
+    def from_sorted(cls, width: int, ranges: Sequence[Tuple[int, int, int]]) -> "_RangeTable":
+        table = cls(width)
+        table._set_columns(
+            b"".join(table._encode(start) for start, _, _ in ranges),
+            b"".join(table._encode(end) for _, end, _ in ranges),
+            array("I", [location_id for _, _, location_id in ranges]).tobytes(),
+        )
+        return table
+
+
+class _PackedKeys:
+    def __init__(self, buffer: bytes, width: int):
+        """
+        Read-only sequence of the fixed-width keys packed in a buffer, which bisect can
+        search without unpacking the buffer.
+        """
+        self._buffer = memoryview(buffer)
+        self._width = width
+
+    def __len__(self) -> int:
+        return len(self._buffer) // self._width
+
+    def __getitem__(self, position: int) -> bytes:
+        if not 0 <= position < len(self):
+            raise IndexError(position)
+        return self._buffer[position * self._width:(position + 1) * self._width].tobytes()
+
+
+class LocationIndex:
+    CSV_FIELDS = ["network", "country", "region", "city"]
+    FILE_MAGIC = b"LIDX"
+    _HEADER = struct.Struct("<4s?3xQQQ")
+
+    def __init__(self):
+        """
+        Initializes an offline index of non-overlapping IP networks and their locations.
+        Networks are kept in a sorted binary table per IP version, searched by bisection,
+        which from_file maps from disk without reading it.
+
+        Example:
+            >>> index = LocationIndex()
+            >>> index.add("8.8.8.0/24", {"country": "USA", "region": "CALIFORNIA", "city": "MOUNTAIN VIEW"})
+            >>> index.lookup("8.8.8.8")["city"]
+            'MOUNTAIN VIEW'
+            >>> index.lookup("8.8.4.4") is None
+            True
+        """
+        self._tables: Dict[int, _RangeTable] = {4: _RangeTable(4), 6: _RangeTable(16)}
+        self._locations: List[Location] = []
+        self._location_ids: Dict[Tuple[str, str, str], int] = {}
+        self._lock = threading.Lock()
+
+    def __len__(self) -> int:
+        return len(self._tables[4]) + len(self._tables[6])
+
+    def _location_id(self, location: Location) -> int:
+        key = (location["country"], location["region"], location["city"])
+        location_id = self._location_ids.get(key)
+        if location_id is None:
+            location_id = self._location_ids[key] = len(self._locations)
+            self._locations.append(location)
+        return location_id
+
+    @classmethod
+    def from_networks(cls, networks: Iterable[Tuple[str, Location]]) -> "LocationIndex":
+        """
+        Builds an index from networks and their locations, sorting them once.
+
+        Args:
+            networks (Iterable[Tuple[str, Location]]): Pairs of network in CIDR notation and location.
+
+        Returns:
+            LocationIndex: The built index.
+
+        Raises:
+            ValueError: If a network is invalid or overlaps another one.
+
+        Example:
+            >>> index = LocationIndex.from_networks([("10.0.0.0/8", {"country": "A", "region": "B", "city": "C"})])
+            >>> index.lookup("10.1.2.3")["city"]
+            'C'
+        """
+        index = cls()
+        ranges: Dict[int, List[Tuple[int, int, int]]] = {4: [], 6: []}
+        for network, location in networks:
+            parsed = ipaddress.ip_network(network, strict=False)
+            ranges[parsed.version].append(
+                (int(parsed.network_address), int(parsed.broadcast_address), index._location_id(location))
+            )
+
+        for version, version_ranges in ranges.items():
+            version_ranges.sort(key=lambda entry: entry[0])
+            for previous, current in zip(version_ranges, version_ranges[1:]):
+                if current[0] <= previous[1]:
+                    raise ValueError("Networks of a location index must not overlap")
+            index._tables[version] = _RangeTable.from_sorted(index._tables[version].width, version_ranges)
+        return index
+
+    @classmethod
+    def from_csv(cls, path: str) -> "LocationIndex":
+        """
+        Loads an index from a CSV file with network, country, region and city columns.
+
+        Args:
+            path (str): Path of the CSV file.
+
+        Returns:
+            LocationIndex: The loaded index.
+
+        Raises:
+            ValueError: If a network is invalid or overlaps another one.
+        """
+        with open(path, newline="") as file:
+            return cls.from_networks(
+                (row["network"], {"country": row["country"], "region": row["region"], "city": row["city"]})
+                for row in csv.DictReader(file)
+            )
+
+    def to_csv(self, path: str):
+        """
+        Writes the index to a CSV file readable by from_csv.
+
+        Args:
+            path (str): Path of the CSV file.
+        """
+        with open(path, "w", newline="") as file, self._lock:
+            writer = csv.DictWriter(file, fieldnames=self.CSV_FIELDS)
+            writer.writeheader()
+            for version, address_class in ((4, ipaddress.IPv4Address), (6, ipaddress.IPv6Address)):
+                for start, end, location_id in self._tables[version].ranges():
+                    for network in ipaddress.summarize_address_range(
+                        address_class(start), address_class(end)
+                    ):
+                        writer.writerow({"network": str(network), **self._locations[location_id]})
+
+    @classmethod
+    def from_file(cls, path: str) -> "LocationIndex":
+        """
+        Maps an index written by to_file into memory. Its tables are searched in place, so
+        loading takes the time of reading its locations, whatever the number of networks.
+
+        Args:
+            path (str): Path of the index file.
+
+        Returns:
+            LocationIndex: The loaded index.
+
+        Raises:
+            ValueError: If the file is not an index file of this machine's byte order.
+        """
+        with open(path, "rb") as file:
+            mapped = mmap.mmap(file.fileno(), 0, access=mmap.ACCESS_READ)
+        buffer = memoryview(mapped)
+
+        if len(buffer) < cls._HEADER.size:
+            raise ValueError("Not a location index file")
+        magic, little_endian, count_v4, count_v6, locations_size = cls._HEADER.unpack_from(buffer)
+        if magic != cls.FILE_MAGIC:
+            raise ValueError("Not a location index file")
+        if little_endian != (sys.byteorder == "little"):
+            raise ValueError("The location index file was written with another byte order")
+        if len(buffer) != cls._HEADER.size + count_v4 * 12 + count_v6 * 36 + locations_size:
+            raise ValueError("The location index file is truncated")
+
+        index = cls()
+        offset = cls._HEADER.size
+        for version, count in ((4, count_v4), (6, count_v6)):
+            table = index._tables[version]
+            columns = []
+            for item_width in (table.width, table.width, 4):
+                columns.append(buffer[offset:offset + count * item_width])
+                offset += count * item_width
+            table._set_columns(*columns)
+
+        for country, region, city in json.loads(bytes(buffer[offset:])):
+            index._location_id({"country": country, "region": region, "city": city})
+        return index
+
+    def to_file(self, path: str):
+        """
+        Writes the index to a binary file readable by from_file.
+
+        Args:
+            path (str): Path of the index file.
+        """
+        with self._lock:
+            tables = [self._tables[4], self._tables[6]]
+            for table in tables:
+                table.merge()
+            locations = json.dumps(
+                [[location["country"], location["region"], location["city"]] for location in self._locations]
+            ).encode()
+
+            with open(path, "wb") as file:
+                file.write(
+                    self._HEADER.pack(
+                        self.FILE_MAGIC, sys.byteorder == "little", len(tables[0]), len(tables[1]), len(locations)
+                    )
+                )
+                for table in tables:
+                    for column in table._columns:
+                        file.write(column)
+                file.write(locations)
+
+    def add(self, network: str, location: Location):
+        """
+        Adds a network to the index.
+
+        Args:
+            network (str): The network in CIDR notation. Host bits are ignored.
+            location (Location): The location of every address of the network.
+
+        Raises:
+            ValueError: If the network is invalid or overlaps a network of the index.
+        """
+        parsed = ipaddress.ip_network(network, strict=False)
+
+        with self._lock:
+            self._tables[parsed.version].add(
+                int(parsed.network_address), int(parsed.broadcast_address), self._location_id(location)
+            )
+
+    def lookup(
+        self, ip: Union[str, ipaddress.IPv4Address, ipaddress.IPv6Address]
+    ) -> Optional[Location]:
+        """
+        Retrieves the location of the network containing an IP address.
+
+        Args:
+            ip (Union[str, IPv4Address, IPv6Address]): The IP address.
+
+        Returns:
+            Optional[Location]: The location, or None if no network of the index contains the address.
+        """
+        address = ipaddress.ip_address(ip) if isinstance(ip, str) else ip
+
+        with self._lock:
+            location_id = self._tables[address.version].lookup(int(address))
+        return self._locations[location_id] if location_id is not None else None
+
+
+@runtime_checkable
+class LocationCacheBackend(Protocol):
+    hits: int
+    misses: int
+
+    @abstractmethod
+    def get(self, ip: str) -> Optional[Location]: ...
+
+    @abstractmethod
+    def set(self, ip: str, location: Location): ...
+
+
+class LocationCache(LocationCacheBackend):
+    def __init__(self, max_size: int = 1024, ttl: float = 3600):
+        """
+        Initializes a thread-safe in-memory cache of locations, evicting the least recently
+        used entry when full and expiring entries after a time to live.
+
+        Args:
+            max_size (int, optional): Maximum number of cached locations. Defaults to 1024.
+            ttl (float, optional): Seconds a location stays cached. Defaults to 3600.
+        """
+        if max_size <= 0:
+            raise ValueError("Max size must be greater than zero")
+
+        self.max_size = max_size
+        self.ttl = ttl
+        self.hits = 0
+        self.misses = 0
+        self._entries: "OrderedDict[str, Tuple[float, Location]]" = OrderedDict()
+        self._lock = threading.Lock()
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+    def get(self, ip: str) -> Optional[Location]:
+        with self._lock:
+            entry = self._entries.get(ip)
+            if entry is None:
+                self.misses += 1
+                return None
+
+            expires_at, location = entry
+            if expires_at <= time.monotonic():
+                del self._entries[ip]
+                self.misses += 1
+                return None
+
+            self._entries.move_to_end(ip)
+            self.hits += 1
+            return location
+
+    def set(self, ip: str, location: Location):
+        with self._lock:
+            self._entries[ip] = (time.monotonic() + self.ttl, location)
+            self._entries.move_to_end(ip)
+            if len(self._entries) > self.max_size:
+                self._entries.popitem(last=False)
+
+
+class SqliteLocationCache(LocationCacheBackend):
+    def __init__(self, path: str, max_size: int = 100_000, ttl: float = 86400):
+        """
+        Initializes a cache of locations persisted in a SQLite database, so it survives
+        restarts and can be shared by several processes. Entries expire after a time to
+        live and the entries closest to expiring are evicted when the cache is full.
+
+        Args:
+            path (str): Path of the SQLite database.
+            max_size (int, optional): Maximum number of cached locations. Defaults to 100000.
+            ttl (float, optional): Seconds a location stays cached. Defaults to 86400.
+        """
+        if max_size <= 0:
+            raise ValueError("Max size must be greater than zero")
+
+        self.path = path
+        self.max_size = max_size
+        self.ttl = ttl
+        self.hits = 0
+        self.misses = 0
+        self._lock = threading.Lock()
+        self._connection = sqlite3.connect(
+            path, timeout=30, isolation_level=None, check_same_thread=False
+        )
+        self._connection.execute("PRAGMA journal_mode=WAL")
+        self._connection.execute("BEGIN IMMEDIATE")
+        try:
+            self._connection.execute(
+                "CREATE TABLE IF NOT EXISTS locations ("
+                "ip TEXT PRIMARY KEY, country TEXT, region TEXT, city TEXT, expires_at REAL)"
+            )
+            self._connection.execute(
+                "CREATE INDEX IF NOT EXISTS locations_expires_at ON locations (expires_at)"
+            )
+            # The number of rows is kept by triggers, so writes never count the whole table.
+            self._connection.execute(
+                "CREATE TABLE IF NOT EXISTS location_count (id INTEGER PRIMARY KEY CHECK (id = 0), count INTEGER)"
+            )
+            self._connection.execute(
+                "INSERT OR IGNORE INTO location_count SELECT 0, COUNT(*) FROM locations"
+            )
+            self._connection.execute(
+                "CREATE TRIGGER IF NOT EXISTS locations_inserted AFTER INSERT ON locations "
+                "BEGIN UPDATE location_count SET count = count + 1; END"
+            )
+            self._connection.execute(
+                "CREATE TRIGGER IF NOT EXISTS locations_deleted AFTER DELETE ON locations "
+                "BEGIN UPDATE location_count SET count = count - 1; END"
+            )
+            self._connection.execute("COMMIT")
+        except BaseException:
+            self._connection.execute("ROLLBACK")
+            raise
+
+    def __enter__(self) -> "SqliteLocationCache":
+        return self
+
+    def __exit__(self, *exc_info):
+        self.close()
+
+    def __len__(self) -> int:
+        with self._lock:
+            (count,) = self._connection.execute(
+                "SELECT COUNT(*) FROM locations WHERE expires_at > ?", (time.time(),)
+            ).fetchone()
+        return count
+
+    def close(self):
+        self._connection.close()
+
+    def get(self, ip: str) -> Optional[Location]:
+        with self._lock:
+            row = self._connection.execute(
+                "SELECT country, region, city FROM locations WHERE ip = ? AND expires_at > ?",
+                (ip, time.time()),
+            ).fetchone()
+
+            if row is None:
+                self.misses += 1
+                return None
+
+            self.hits += 1
+        return {"country": row[0], "region": row[1], "city": row[2]}
+
+    def set(self, ip: str, location: Location):
+        now = time.time()
+
+        with self._lock:
+            connection = self._connection
+            connection.execute("BEGIN IMMEDIATE")
+            try:
+                # An upsert updates existing rows in place, so it does not change the row count.
+                connection.execute(
+                    "INSERT INTO locations VALUES (?, ?, ?, ?, ?) ON CONFLICT (ip) DO UPDATE SET "
+                    "country = excluded.country, region = excluded.region, city = excluded.city, "
+                    "expires_at = excluded.expires_at",
+                    (ip, location["country"], location["region"], location["city"], now + self.ttl),
+                )
+                connection.execute("DELETE FROM locations WHERE expires_at <= ?", (now,))
+                (count,) = connection.execute("SELECT count FROM location_count").fetchone()
+                if count > self.max_size:
+                    connection.execute(
+                        "DELETE FROM locations WHERE ip IN ("
+                        "SELECT ip FROM locations ORDER BY expires_at LIMIT ?)",
+                        (count - self.max_size,),
+                    )
+                connection.execute("COMMIT")
+            except BaseException:
+                connection.execute("ROLLBACK")
+                raise
+
+
+class FreeIpClient:
+    def __init__(
+        self,
+        base_url: str = FREE_IP_API_URL,
+        pool_size: int = 10,
+        timeout: Union[float, Tuple[float, float]] = (3.05, 10),
+        cache: Optional[LocationCacheBackend] = None,
+        max_workers: int = 8,
+        retries: int = 3,
+        backoff: float = 0.5,
+        index: Optional[LocationIndex] = None,
+        populate_index: bool = False,
+        populate_prefixes: Tuple[int, int] = (24, 48),
+    ):
+        """
+        Initializes a geolocation client reusing pooled connections and caching results.
+
+        Args:
+            base_url (str, optional): URL of the geolocation API. Defaults to FREE_IP_API_URL.
+            pool_size (int, optional): Maximum number of kept-alive connections. Defaults to 10.
+            timeout (Union[float, Tuple[float, float]], optional): Connect and read timeouts in seconds.
+                Defaults to (3.05, 10).
+            cache (Optional[LocationCacheBackend], optional): Cache of locations, such as a
+                SqliteLocationCache to keep them across restarts. Defaults to a new LocationCache.
+            max_workers (int, optional): Maximum number of concurrent requests of get_locations and
+                of the asynchronous API. Defaults to 8.
+            retries (int, optional): Times the asynchronous API retries a request answered with
+                429 or a 5xx status. Defaults to 3.
+            backoff (float, optional): Seconds before the first retry, doubled on every retry. Defaults to 0.5.
+            index (Optional[LocationIndex], optional): Offline index consulted before the API. Defaults to None.
+            populate_index (bool, optional): Adds the network of every location fetched from the API
+                to the index. Defaults to False.
+            populate_prefixes (Tuple[int, int], optional): Prefix lengths of the IPv4 and IPv6 networks
+                added to the index. Defaults to (24, 48).
+        """
+        self.base_url = base_url
+        self.timeout = timeout
+        self.cache = cache if cache is not None else LocationCache()
+        self.max_workers = max_workers
+        self.retries = retries
+        self.backoff = backoff
+        self.index = index
+        self.populate_index = populate_index
+        self.populate_prefixes = populate_prefixes
+        # Asyncio primitives are bound to the loop they are used in, so every loop gets its own.
+        self._loop_states: "weakref.WeakKeyDictionary[asyncio.AbstractEventLoop, Tuple]" = (
+            weakref.WeakKeyDictionary()
+        )
+
+        self.session = requests.Session()
+        adapter = HTTPAdapter(pool_connections=1, pool_maxsize=pool_size)
+        self.session.mount("http://", adapter)
+        self.session.mount("https://", adapter)
+
+    def __enter__(self) -> "FreeIpClient":
+        return self
+
+    def __exit__(self, *exc_info):
+        self.close()
+
+    def close(self):
+        self.session.close()
+
+    def get_location(self, ip: str) -> Location:
+        """
+        Retrieves the location of an IP address, from the cache when possible.
+
+        Args:
+            ip (str): The IP address.
+
+        Returns:
+            Location: The location of the IP address.
+        """
+        ip = normalize_ip(ip)
+
+        location = self._lookup(ip)
+        if location is None:
+            location = self._fetch(ip)
+            self._store(ip, location)
+        return location
+
+    def get_locations(self, ips: Iterable[str]) -> Dict[str, Location]:
+        """
+        Retrieves the locations of many IP addresses, requesting each distinct address
+        at most once and concurrently.
+
+        Args:
+            ips (Iterable[str]): The IP addresses.
+
+        Returns:
+            Dict[str, Location]: The location of every given IP address.
+        """
+        normalized = {ip: normalize_ip(ip) for ip in ips}
+        unique_ips = list(dict.fromkeys(normalized.values()))
+
+        if len(unique_ips) <= 1 or self.max_workers <= 1:
+            locations = {ip: self.get_location(ip) for ip in unique_ips}
+        else:
+            workers = min(self.max_workers, len(unique_ips))
+            with ThreadPoolExecutor(max_workers=workers) as executor:
+                locations = dict(
+                    zip(unique_ips, executor.map(self.get_location, unique_ips))
+                )
+
+        return {ip: locations[normalized_ip] for ip, normalized_ip in normalized.items()}
+
+    async def aget_location(self, ip: str) -> Location:
+        """
+        Retrieves the location of an IP address without blocking the event loop.
+        Concurrent lookups of the same address share a single request, and cache
+        backends other than the in-memory LocationCache are called in a worker thread.
+
+        Args:
+            ip (str): The IP address.
+
+        Returns:
+            Location: The location of the IP address.
+        """
+        ip = normalize_ip(ip)
+
+        location = await self._call_cache(self._lookup, ip)
+        if location is not None:
+            return location
+
+        _, in_flight = self._loop_state()
+        task = in_flight.get(ip)
+        if task is None:
+            task = asyncio.ensure_future(self._afetch(ip))
+            in_flight[ip] = task
+            task.add_done_callback(lambda _: in_flight.pop(ip, None))
+
+        return await asyncio.shield(task)
+
+    async def aget_locations(self, ips: Iterable[str]) -> Dict[str, Location]:
+        """
+        Retrieves the locations of many IP addresses concurrently, with at most
+        max_workers requests in flight.
+
+        Args:
+            ips (Iterable[str]): The IP addresses.
+
+        Returns:
+            Dict[str, Location]: The location of every given IP address.
+        """
+        normalized = {ip: normalize_ip(ip) for ip in ips}
+        unique_ips = list(dict.fromkeys(normalized.values()))
+
+        results = await asyncio.gather(*(self.aget_location(ip) for ip in unique_ips))
+        locations = dict(zip(unique_ips, results))
+
+        return {ip: locations[normalized_ip] for ip, normalized_ip in normalized.items()}
+
+    def _loop_state(self) -> Tuple[asyncio.Semaphore, Dict[str, "asyncio.Task[Location]"]]:
+        loop = asyncio.get_running_loop()
+        state = self._loop_states.get(loop)
+        if state is None:
+            state = self._loop_states[loop] = (asyncio.Semaphore(self.max_workers), {})
+        return state
+
+    async def _afetch(self, ip: str) -> Location:
+        semaphore, _ = self._loop_state()
+        async with semaphore:
+            for attempt in range(self.retries + 1):
+                response = await asyncio.to_thread(self._request, ip)
+                if attempt == self.retries or not _is_retryable(response):
+                    break
+                await asyncio.sleep(_retry_delay(response, self.backoff * 2**attempt))
+
+        response.raise_for_status()
+        location = _to_location(response.json())
+        await self._call_cache(self._store, ip, location)
+        return location
+
+    async def _call_cache(self, function: Callable[..., T], *args) -> T:
+        # Persistent backends may wait on I/O or on locks held by other processes.
+        if isinstance(self.cache, LocationCache):
+            return function(*args)
+        return await asyncio.to_thread(function, *args)
+
+    def _lookup(self, ip: str) -> Optional[Location]:
+        if self.index is not None:
+            location = self.index.lookup(ip)
+            if location is not None:
+                return location
+        return self.cache.get(ip)
+
+    def _store(self, ip: str, location: Location):
+        self.cache.set(ip, location)
+
+        if self.index is not None and self.populate_index:
+            address = ipaddress.ip_address(ip)
+            prefix = self.populate_prefixes[0 if address.version == 4 else 1]
+            try:
+                self.index.add(f"{ip}/{prefix}", location)
+            except ValueError:
+                # A more specific network of the index already covers part of this one.
+                pass
+
+    def _request(self, ip: str) -> requests.Response:
+        return self.session.get(f"{self.base_url}/{ip}", timeout=self.timeout)
+
+    def _fetch(self, ip: str) -> Location:
+        response = self._request(ip)
+        response.raise_for_status()
+        return _to_location(response.json())
+
+
+def _is_retryable(response: requests.Response) -> bool:
+    return response.status_code == 429 or response.status_code >= 500
+
+
+def _retry_delay(response: requests.Response, default: float) -> float:
+    retry_after = response.headers.get("Retry-After", "")
+    return float(retry_after) if retry_after.isdigit() else default
+
+
 if __name__ == "__main__":
     print(get_location("8.8.8.8"))  # Google IP
@@ -0,0 +1,111 @@
+import unittest
+
+from unittest.mock import Mock
+
+from dfm18.bank_account import AccountStore, BankAccount
+
+from dfm18.bank_account.policies import Policy, PolicyOperation
+
+
+class TestAccountStore(unittest.TestCase):
+    def setUp(self):
+        self.store = AccountStore()
+        self.indices = [self.store.add_account(balance=100) for _ in range(3)]
+
+    def test_add_account(self):
+        self.assertEqual(len(self.store), 3)
+        self.assertEqual(self.indices, [0, 1, 2])
+        self.assertEqual(self.store.get_balance(1), 100)
+
+    def test_account_view_conforms_to_bank_account(self):
+        account = self.store.account(0)
+
+        self.assertIsInstance(account, BankAccount)
+        self.assertEqual(account.deposit(50), 150)
+        self.assertEqual(account.withdraw(25.5), 124.5)
+        self.assertEqual(account.balance, 124.5)
+        self.assertEqual(
+            account.apply_batch(
+                [(PolicyOperation.DEPOSIT, 0.5), (PolicyOperation.WITHDRAW, 25)]
+            ),
+            100,
+        )
+
+    def test_account_on_invalid_index_raises_exception(self):
+        with self.assertRaises(IndexError):
+            self.store.account(3)
+
+    def test_deposit_many_and_withdraw_many(self):
+        self.store.deposit_many([0, 2], [10, 20])
+        self.store.withdraw_many([0, 1, 2], 5)
+
+        self.assertEqual(
+            [self.store.get_balance(index) for index in self.indices], [105, 95, 115]
+        )
+
+    def test_bulk_operation_on_invalid_amount_applies_nothing(self):
+        with self.assertRaises(ValueError):
+            self.store.deposit_many([0, 1], [10, 0])
+        with self.assertRaises(ValueError):
+            self.store.deposit_many([0, 1], [10])
+        with self.assertRaises(IndexError):
+            self.store.withdraw_many([0, 5], 10)
+
+        self.assertEqual(
+            [self.store.get_balance(index) for index in self.indices], [100] * 3
+        )
+
+    def test_bulk_operation_on_balance_overflow_applies_nothing(self):
+        near_limit = self.store.add_account()
+        self.store._balances[near_limit] = (1 << 63) - 100
+
+        with self.assertRaises(OverflowError):
+            self.store.deposit_many([0, 1, near_limit, 2], [10, 10, 1, 10])
+        with self.assertRaises(OverflowError):
+            self.store.deposit_many([near_limit] * 2, 0.5)
+
+        self.assertEqual([self.store.get_balance(index) for index in self.indices], [100, 100, 100])
+        self.assertEqual(self.store._balances[near_limit], (1 << 63) - 100)
+
+    def test_accounts_with_same_policies_share_a_policy_set(self):
+        policy = Mock(spec=Policy)
+        first = self.store.add_account(policies=[policy])
+        second = self.store.add_account(policies=[policy])
+
+        self.assertEqual(len(self.store._policy_sets), 2)
+        self.assertIs(self.store.policies(first), self.store.policies(second))
+
+    def test_policy_violation_applies_nothing(self):
+        policy = Mock(spec=Policy)
+        policy.supports.return_value = True
+        policy.apply_batch = Mock(side_effect=Exception("Policy Restriction"))
+        restricted = self.store.add_account(balance=100, policies=[policy])
+
+        with self.assertRaises(Exception):
+            self.store.withdraw_many([0, restricted, restricted], 10)
+
+        self.assertEqual(self.store.get_balance(0), 100)
+        self.assertEqual(self.store.get_balance(restricted), 100)
+        policy.supports.assert_called_once_with(PolicyOperation.WITHDRAW)
+        policy.apply_batch.assert_called_once_with(self.store.account(restricted), [10, 10])
+
+    def test_account_views_are_not_kept(self):
+        policy = Mock(spec=Policy)
+        policy.supports.return_value = True
+        index = self.store.add_account(balance=100, policies=[policy])
+
+        self.store.withdraw_many([index], 10)
+
+        self.assertFalse(hasattr(self.store, "_views"))
+        self.assertEqual(self.store.account(index), self.store.account(index))
+        self.assertNotEqual(self.store.account(index), self.store.account(0))
+
+    def test_apply_batch_with_policy_without_apply_batch(self):
+        policy = Mock(spec=["supports", "apply"])
+        policy.supports.return_value = True
+        index = self.store.add_account(balance=100, policies=[policy])
+
+        self.store.account(index).apply_batch([(PolicyOperation.DEPOSIT, 10), (PolicyOperation.DEPOSIT, 20)])
+
+        self.assertEqual(policy.apply.call_count, 2)
+        self.assertEqual(self.store.get_balance(index), 130)
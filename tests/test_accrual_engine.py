@@ -0,0 +1,94 @@
+import unittest
+
+from unittest.mock import Mock
+
+from dfm18.bank_account import (
+    AccountStore,
+    AccrualEngine,
+    MinorUnitsBankAccount,
+    RateSchedule,
+    SimpleBankAccount,
+)
+from dfm18.bank_account.policies import Policy, PolicyOperation
+
+
+def _rejecting_policy(operation: PolicyOperation) -> Mock:
+    policy = Mock(spec=Policy)
+    policy.supports.side_effect = lambda op: bool(op & operation)
+    policy.apply.side_effect = Exception("Policy Restriction")
+    return policy
+
+
+class TestRateSchedule(unittest.TestCase):
+    def test_accruals_use_highest_reached_tier(self):
+        schedule = RateSchedule([(1000, 0.02), (0, 0.01)])
+
+        self.assertEqual(list(schedule.accruals([0, 99900, 100000])), [0, 999, 2000])
+
+    def test_negative_balances_earn_no_interest(self):
+        schedule = RateSchedule([(0, 0.01)])
+
+        self.assertEqual(list(schedule.accruals([-10000])), [0])
+
+    def test_fee_is_waived_from_balance(self):
+        schedule = RateSchedule([], fee=5, fee_waiver_balance=1000)
+
+        self.assertEqual(list(schedule.accruals([99999, 100000])), [-500, 0])
+
+    def test_negative_fee_raises_exception(self):
+        with self.assertRaises(ValueError):
+            RateSchedule([], fee=-1)
+
+
+class TestAccrualEngine(unittest.TestCase):
+    def setUp(self):
+        self.engine = AccrualEngine(RateSchedule([(0, 0.01)], fee=1), chunk_size=2)
+
+    def test_accrue(self):
+        accounts = [MinorUnitsBankAccount(balance=balance) for balance in (1000, 50, 0)]
+
+        result = self.engine.accrue(accounts)
+
+        self.assertEqual([account.get_balance() for account in accounts], [1009, 49.5, -1])
+        self.assertEqual(result.applied, 3)
+        self.assertEqual(result.credited, 9)
+        self.assertEqual(result.debited, 1.5)
+        self.assertEqual(result.errors, [])
+
+    def test_accrue_reports_rejected_accruals(self):
+        policy = _rejecting_policy(PolicyOperation.DEPOSIT)
+        accounts = [SimpleBankAccount(balance=1000, policies=[policy]), SimpleBankAccount(balance=1000)]
+
+        result = self.engine.accrue(accounts)
+
+        self.assertEqual(accounts[0].get_balance(), 1000)
+        self.assertEqual(accounts[1].get_balance(), 1009)
+        self.assertEqual(result.applied, 1)
+        self.assertEqual(len(result.errors), 1)
+        self.assertEqual(result.errors[0].index, 0)
+        self.assertEqual(result.errors[0].amount, 9)
+
+    def test_accrue_store(self):
+        store = AccountStore()
+        policy = _rejecting_policy(PolicyOperation.WITHDRAW)
+        first = store.add_account(balance=1000)
+        second = store.add_account(balance=10, policies=[policy])
+        third = store.add_account(balance=200, policies=[policy])
+
+        result = self.engine.accrue_store(store)
+
+        self.assertEqual(store.get_balance(first), 1009)
+        self.assertEqual(store.get_balance(second), 10)
+        self.assertEqual(store.get_balance(third), 201)
+        self.assertEqual(result.applied, 2)
+        self.assertEqual([error.index for error in result.errors], [second])
+
+    def test_accrue_store_with_different_minor_units_raises_exception(self):
+        with self.assertRaises(ValueError):
+            self.engine.accrue_store(AccountStore(minor_units=1000))
+
+    def test_compute_in_process_pool(self):
+        engine = AccrualEngine(RateSchedule([(0, 0.01)], fee=1), processes=2, chunk_size=2)
+        balances = [100000, 5000, 0, 20000, 300]
+
+        self.assertEqual(list(engine.compute(balances)), list(self.engine.compute(balances)))
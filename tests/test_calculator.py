@@ -1,5 +1,7 @@
 import unittest
 
+from array import array
+
 from dfm18 import calculator
 
 
@@ -45,3 +47,58 @@ class TestCalculator(unittest.TestCase):
         self.assertEqual(calculator.divide(32, 8), 4)
         with self.assertRaises(ZeroDivisionError):
             _ = calculator.divide(1, 0)
+
+
+class TestElementwiseCalculator(unittest.TestCase):
+    def test_add_elementwise(self):
+        self.assertEqual(calculator.add_elementwise([1, 2, 3], [4, 5, 6]), [5, 7, 9])
+        self.assertEqual(calculator.add_elementwise((1, -2), (-1, 2)), [0, 0])
+
+    def test_subtract_elementwise(self):
+        self.assertEqual(calculator.subtract_elementwise([10, 5], [3, 8]), [7, -3])
+
+    def test_multiply_elementwise(self):
+        self.assertEqual(calculator.multiply_elementwise([3, -6], [3, 4]), [9, -24])
+
+    def test_divide_elementwise(self):
+        self.assertEqual(calculator.divide_elementwise([45, 20, -7], [9, 5, 2]), [5, 4, -4])
+
+    def test_scalars_are_broadcast(self):
+        self.assertEqual(calculator.add_elementwise([1, 2, 3], 1), [2, 3, 4])
+        self.assertEqual(calculator.subtract_elementwise(10, [1, 2]), [9, 8])
+        self.assertEqual(calculator.multiply_elementwise([2], [1, 2, 3]), [2, 4, 6])
+        self.assertEqual(calculator.add_elementwise(3, 2), 5)
+
+    def test_operands_with_different_lengths_raise_exception(self):
+        with self.assertRaises(ValueError):
+            calculator.add_elementwise([1, 2], [1, 2, 3])
+
+    def test_array_operands_return_array(self):
+        result = calculator.add_elementwise(array("q", [1, 2]), [3, 4])
+
+        self.assertEqual(result, array("q", [4, 6]))
+
+    def test_divide_elementwise_by_zero_raises_exception(self):
+        with self.assertRaises(ZeroDivisionError):
+            calculator.divide_elementwise([1, 2], [1, 0])
+
+    def test_divide_elementwise_by_zero_with_zero_division(self):
+        self.assertEqual(calculator.divide_elementwise([1, 2], [0, 2], zero_division=0), [0, 1])
+        self.assertEqual(
+            calculator.divide_elementwise(array("q", [1, 2]), 0, zero_division=-1),
+            array("q", [-1, -1]),
+        )
+        self.assertEqual(calculator.divide_elementwise([7, 8], [2, 3], zero_division=0), [3, 2])
+        self.assertEqual(calculator.divide_elementwise(7, 0, zero_division=5), 5)
+
+    @unittest.skipIf(calculator.np is None, "NumPy is not installed")
+    def test_numpy_operands(self):
+        np = calculator.np
+        result = calculator.add_elementwise(np.array([1, 2, 3]), 1)
+        self.assertEqual(result.tolist(), [2, 3, 4])
+
+        result = calculator.divide_elementwise(np.array([1, 4]), np.array([0, 2]), zero_division=0)
+        self.assertEqual(result.tolist(), [0, 2])
+
+        with self.assertRaises(ZeroDivisionError):
+            calculator.divide_elementwise(np.array([1, 4]), 0)
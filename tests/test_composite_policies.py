@@ -0,0 +1,151 @@
+import threading
+import unittest
+
+from unittest.mock import Mock
+
+from dfm18.bank_account import SimpleBankAccount
+
+from dfm18.bank_account.policies import (
+    AllOfPolicy,
+    AnyOfPolicy,
+    Policy,
+    PolicyOperation,
+)
+
+
+def _policy(rejects: bool = False, operation=PolicyOperation.WITHDRAW) -> Mock:
+    policy = Mock(spec=Policy)
+    policy.supports.side_effect = lambda op: bool(op & operation)
+    policy.apply_batch = Mock()
+    if rejects:
+        policy.apply.side_effect = Exception("Policy Restriction")
+        policy.apply_batch.side_effect = Exception("Policy Restriction")
+    return policy
+
+
+class TestAllOfPolicy(unittest.TestCase):
+    def setUp(self):
+        self.account = SimpleBankAccount(balance=1000)
+
+    def test_initialization_with_multiple_operations_raises_exception(self):
+        with self.assertRaises(ValueError):
+            AllOfPolicy([], PolicyOperation.DEPOSIT | PolicyOperation.WITHDRAW)
+
+    def test_policies_not_supporting_operation_are_ignored(self):
+        deposit_policy = _policy(operation=PolicyOperation.DEPOSIT)
+        policy = AllOfPolicy([deposit_policy, _policy()], PolicyOperation.WITHDRAW)
+
+        self.assertEqual(len(policy.policies), 1)
+        self.assertTrue(policy.supports(PolicyOperation.WITHDRAW))
+        self.assertFalse(policy.supports(PolicyOperation.DEPOSIT))
+
+    def test_apply_evaluates_every_policy(self):
+        first, second = _policy(), _policy()
+        policy = AllOfPolicy([first, second], PolicyOperation.WITHDRAW)
+
+        policy.apply(self.account, 100)
+
+        first.apply.assert_called_once_with(self.account, 100)
+        second.apply.assert_called_once_with(self.account, 100)
+
+    def test_apply_stops_at_first_rejection(self):
+        first, second = _policy(rejects=True), _policy()
+        policy = AllOfPolicy([first, second], PolicyOperation.WITHDRAW)
+
+        with self.assertRaises(Exception):
+            policy.apply(self.account, 100)
+
+        second.apply.assert_not_called()
+        self.assertEqual(policy.stats[0][1].rejections, 1)
+        self.assertEqual(policy.stats[1][1].evaluations, 0)
+
+    def test_policies_are_reordered_to_reject_early(self):
+        accepting, rejecting = _policy(), _policy(rejects=True)
+        policy = AllOfPolicy([accepting, rejecting], PolicyOperation.WITHDRAW, reorder_interval=2)
+
+        for _ in range(2):
+            with self.assertRaises(Exception):
+                policy.apply(self.account, 100)
+
+        self.assertEqual(policy.policies, (rejecting, accepting))
+
+        with self.assertRaises(Exception):
+            policy.apply(self.account, 100)
+        self.assertEqual(accepting.apply.call_count, 2)
+
+    def test_concurrent_reordering_never_skips_policies(self):
+        class Accept:
+            def supports(self, operation):
+                return True
+
+            def apply(self, account, amount):
+                pass
+
+        class Reject(Accept):
+            def apply(self, account, amount):
+                raise Exception("Policy Restriction")
+
+        policy = AllOfPolicy(
+            [Accept() for _ in range(20)] + [Reject()], PolicyOperation.WITHDRAW, reorder_interval=1
+        )
+        accepted = []
+
+        def evaluate():
+            for _ in range(2000):
+                try:
+                    policy.apply(self.account, 1)
+                    accepted.append(True)
+                except Exception:
+                    pass
+
+        threads = [threading.Thread(target=evaluate) for _ in range(8)]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+
+        self.assertEqual(accepted, [])
+
+    def test_apply_batch(self):
+        first = _policy()
+        policy = AllOfPolicy([first], PolicyOperation.WITHDRAW)
+        self.account.add_policy(policy)
+
+        self.account.apply_batch([(PolicyOperation.WITHDRAW, 10), (PolicyOperation.WITHDRAW, 20)])
+
+        first.apply_batch.assert_called_once_with(self.account, [10, 20])
+
+
+class TestAnyOfPolicy(unittest.TestCase):
+    def setUp(self):
+        self.account = SimpleBankAccount(balance=1000)
+
+    def test_apply_stops_at_first_acceptance(self):
+        rejecting, accepting, other = _policy(rejects=True), _policy(), _policy()
+        policy = AnyOfPolicy([rejecting, accepting, other], PolicyOperation.WITHDRAW)
+
+        policy.apply(self.account, 100)
+
+        other.apply.assert_not_called()
+
+    def test_apply_when_every_policy_rejects_raises_exception(self):
+        policy = AnyOfPolicy(
+            [_policy(rejects=True), _policy(rejects=True)], PolicyOperation.WITHDRAW
+        )
+        self.account.add_policy(policy)
+
+        with self.assertRaises(Exception) as context:
+            self.account.withdraw(100)
+
+        self.assertEqual(str(context.exception), "Policy Restriction")
+        self.assertEqual(self.account.balance, 1000)
+
+    def test_policies_are_reordered_to_accept_early(self):
+        rejecting, accepting = _policy(rejects=True), _policy()
+        policy = AnyOfPolicy([rejecting, accepting], PolicyOperation.WITHDRAW, reorder_interval=1)
+
+        policy.apply(self.account, 100)
+        policy.apply(self.account, 100)
+
+        self.assertEqual(policy.policies, (accepting, rejecting))
+        self.assertEqual(rejecting.apply.call_count, 1)
@@ -0,0 +1,82 @@
+import unittest
+
+from dfm18.expression import Constant, constant, variable
+
+
+class TestExpression(unittest.TestCase):
+    def setUp(self):
+        self.x = variable("x")
+        self.y = variable("y")
+
+    def test_evaluate(self):
+        expression = (self.x + 3) * self.y - self.x // 2
+
+        self.assertEqual(expression.evaluate(x=5, y=2), 14)
+
+    def test_evaluate_with_missing_variable_raises_exception(self):
+        with self.assertRaises(KeyError):
+            (self.x + self.y).evaluate(x=1)
+
+    def test_constants_are_folded(self):
+        expression = (constant(2) + 3) * 4
+
+        self.assertIsInstance(expression, Constant)
+        self.assertEqual(expression.value, 20)
+
+    def test_identities_are_simplified(self):
+        self.assertIs(self.x + 0, self.x)
+        self.assertIs(1 * (self.x - 0), self.x)
+
+    def test_float_identities_keep_float_results(self):
+        result = (self.x * 1.0).evaluate(x=3)
+
+        self.assertEqual(result, 3.0)
+        self.assertIsInstance(result, float)
+        self.assertIsInstance((0.0 + self.x).evaluate(x=3), float)
+        self.assertIsInstance(((self.x * 1.0) // 2).evaluate(x=3), float)
+        self.assertEqual(((self.x * 1.0) // 2).evaluate(x=3), 1.0)
+
+    def test_division_by_zero_fails_at_evaluation(self):
+        expression = constant(1) // 0
+
+        with self.assertRaises(ZeroDivisionError):
+            expression.evaluate()
+
+    def test_common_subexpressions_are_shared(self):
+        expression = (self.x + self.y) * (self.x + self.y)
+
+        self.assertIs(expression.left, expression.right)
+        self.assertEqual(len(expression.compile()), 2)
+
+    def test_compile_is_memoized(self):
+        expression = self.x * 2
+
+        self.assertIs(expression.compile(), expression.compile())
+
+    def test_cached_results_depend_on_value_types(self):
+        compiled = (self.x // 2).compile()
+
+        self.assertEqual(compiled.evaluate({"x": 3}), 1)
+        result = compiled.evaluate({"x": 3.0})
+        self.assertEqual(result, 1.0)
+        self.assertIsInstance(result, float)
+
+    def test_deep_expressions(self):
+        expression = self.x
+        for _ in range(10000):
+            expression = expression * 1 + self.y
+
+        self.assertEqual(expression.evaluate(x=1, y=2), 20001)
+
+    def test_evaluate_rows(self):
+        compiled = ((self.x - self.y) * 3).compile()
+
+        self.assertEqual(
+            compiled.evaluate_rows([{"x": 5, "y": 1}, {"x": 2, "y": 4}]), [12, -6]
+        )
+        self.assertEqual(compiled.evaluate_rows([]), [])
+
+    def test_evaluate_columns(self):
+        compiled = (self.x * 2 + self.y).compile()
+
+        self.assertEqual(compiled.evaluate_columns({"x": [1, 2, 3], "y": 10}), [12, 14, 16])
@@ -1,10 +1,33 @@
+from typing import Optional
+
 import unittest
 
 from unittest.mock import patch, Mock
 
-from requests.exceptions import RequestException
+from requests.exceptions import HTTPError, RequestException
+
+import asyncio
+import os
+import random
+import tempfile
+import threading
+import time
+
+from free_ip_client import (
+    get_location,
+    FreeIpClient,
+    LocationCache,
+    LocationIndex,
+    SqliteLocationCache,
+    FREE_IP_API_URL,
+)
+
 
-from free_ip_client import get_location, FREE_IP_API_URL
+API_RESPONSE = {
+    "countryName": "USA",
+    "cityName": "MIAMI",
+    "regionName": "FLORIDA",
+}
 
 
 class TestFreeIpClient(unittest.TestCase):
@@ -49,3 +72,412 @@ class TestFreeIpClient(unittest.TestCase):
     def test_get_location_on_invalid_ip_raises_exception(self):
         with self.assertRaises(ValueError):
             get_location("invalid_ip_address")
+
+    @patch("free_ip_client.requests.get")
+    def test_get_location_consults_index_first(self, mock_get: Mock):
+        index = LocationIndex()
+        index.add("8.8.8.0/24", {"country": "USA", "region": "CA", "city": "MV"})
+
+        self.assertEqual(get_location("8.8.8.8", index=index)["region"], "CA")
+        mock_get.assert_not_called()
+
+
+class TestLocationIndex(unittest.TestCase):
+    def setUp(self):
+        self.index = LocationIndex()
+        self.index.add("10.0.0.0/8", {"country": "A", "region": "A", "city": "A"})
+        self.index.add("192.168.1.0/24", {"country": "B", "region": "B", "city": "B"})
+        self.index.add("2001:db8::/32", {"country": "C", "region": "C", "city": "C"})
+
+    def test_lookup(self):
+        self.assertEqual(len(self.index), 3)
+        self.assertEqual(self.index.lookup("10.255.255.255")["country"], "A")
+        self.assertEqual(self.index.lookup("192.168.1.0")["country"], "B")
+        self.assertEqual(self.index.lookup("2001:db8::1")["country"], "C")
+
+    def test_lookup_outside_networks_returns_none(self):
+        self.assertIsNone(self.index.lookup("9.255.255.255"))
+        self.assertIsNone(self.index.lookup("11.0.0.0"))
+        self.assertIsNone(self.index.lookup("192.168.2.1"))
+        self.assertIsNone(self.index.lookup("::ffff"))
+
+    def test_add_overlapping_network_raises_exception(self):
+        location = {"country": "D", "region": "D", "city": "D"}
+        with self.assertRaises(ValueError):
+            self.index.add("10.1.0.0/16", location)
+        with self.assertRaises(ValueError):
+            self.index.add("192.168.0.0/16", location)
+
+    def test_csv_round_trip(self):
+        with tempfile.TemporaryDirectory() as directory:
+            path = os.path.join(directory, "index.csv")
+            self.index.to_csv(path)
+            loaded = LocationIndex.from_csv(path)
+
+        self.assertEqual(len(loaded), 3)
+        self.assertEqual(loaded.lookup("10.1.2.3")["city"], "A")
+        self.assertEqual(loaded.lookup("2001:db8:ffff::1")["city"], "C")
+
+    def test_file_round_trip(self):
+        with tempfile.TemporaryDirectory() as directory:
+            path = os.path.join(directory, "index.bin")
+            self.index.to_file(path)
+            loaded = LocationIndex.from_file(path)
+
+            self.assertEqual(len(loaded), 3)
+            self.assertEqual(loaded.lookup("10.1.2.3")["city"], "A")
+            self.assertEqual(loaded.lookup("192.168.1.255")["city"], "B")
+            self.assertEqual(loaded.lookup("2001:db8:ffff::1")["city"], "C")
+            self.assertIsNone(loaded.lookup("192.168.2.1"))
+
+            loaded.add("11.0.0.0/8", {"country": "D", "region": "D", "city": "D"})
+            with self.assertRaises(ValueError):
+                loaded.add("10.1.0.0/16", {"country": "D", "region": "D", "city": "D"})
+            self.assertEqual(loaded.lookup("11.1.2.3")["city"], "D")
+            del loaded
+
+    def test_from_file_on_other_file_raises_exception(self):
+        with tempfile.TemporaryDirectory() as directory:
+            path = os.path.join(directory, "index.csv")
+            self.index.to_csv(path)
+
+            with self.assertRaises(ValueError):
+                LocationIndex.from_file(path)
+
+    def test_many_added_networks_are_merged_in_order(self):
+        location = {"country": "D", "region": "D", "city": "D"}
+        networks = list(range(5000))
+        random.Random(0).shuffle(networks)
+        for network in networks:
+            self.index.add(f"172.{network >> 8}.{network & 255}.0/24", location)
+            self.index.add(f"2001:db9:{network:x}::/48", location)
+
+        self.assertEqual(len(self.index), 10003)
+        self.assertEqual(self.index.lookup("172.19.135.1")["city"], "D")
+        self.assertEqual(self.index.lookup("2001:db9:1387::1")["city"], "D")
+        self.assertIsNone(self.index.lookup("172.20.0.1"))
+        self.assertIsNone(self.index.lookup("2001:db9:1388::1"))
+        self.assertEqual(self.index.lookup("10.1.2.3")["city"], "A")
+        with self.assertRaises(ValueError):
+            self.index.add("172.16.0.0/12", location)
+
+    def test_from_csv_with_overlapping_networks_raises_exception(self):
+        with tempfile.TemporaryDirectory() as directory:
+            path = os.path.join(directory, "index.csv")
+            with open(path, "w") as file:
+                file.write("network,country,region,city\n")
+                file.write("10.0.0.0/8,A,A,A\n")
+                file.write("10.1.0.0/16,B,B,B\n")
+
+            with self.assertRaises(ValueError):
+                LocationIndex.from_csv(path)
+
+
+class TestLocationCache(unittest.TestCase):
+    def test_get_returns_cached_location(self):
+        cache = LocationCache()
+        cache.set("8.8.8.8", {"country": "USA", "region": "FLORIDA", "city": "MIAMI"})
+
+        self.assertEqual(cache.get("8.8.8.8")["city"], "MIAMI")
+        self.assertIsNone(cache.get("1.1.1.1"))
+
+    def test_least_recently_used_location_is_evicted(self):
+        cache = LocationCache(max_size=2)
+        location = {"country": "USA", "region": "FLORIDA", "city": "MIAMI"}
+
+        cache.set("1.1.1.1", location)
+        cache.set("2.2.2.2", location)
+        cache.get("1.1.1.1")
+        cache.set("3.3.3.3", location)
+
+        self.assertEqual(len(cache), 2)
+        self.assertIsNotNone(cache.get("1.1.1.1"))
+        self.assertIsNone(cache.get("2.2.2.2"))
+
+    @patch("free_ip_client.time.monotonic")
+    def test_expired_location_is_not_returned(self, mock_monotonic: Mock):
+        cache = LocationCache(ttl=60)
+        mock_monotonic.return_value = 1000
+        cache.set("8.8.8.8", {"country": "USA", "region": "FLORIDA", "city": "MIAMI"})
+
+        mock_monotonic.return_value = 1059
+        self.assertIsNotNone(cache.get("8.8.8.8"))
+        mock_monotonic.return_value = 1060
+        self.assertIsNone(cache.get("8.8.8.8"))
+        self.assertEqual(len(cache), 0)
+
+
+class TestSqliteLocationCache(unittest.TestCase):
+    LOCATION = {"country": "USA", "region": "FLORIDA", "city": "MIAMI"}
+
+    def setUp(self):
+        directory = tempfile.TemporaryDirectory()
+        self.addCleanup(directory.cleanup)
+        self.path = os.path.join(directory.name, "locations.db")
+
+    def _open(self, **kwargs) -> SqliteLocationCache:
+        cache = SqliteLocationCache(self.path, **kwargs)
+        self.addCleanup(cache.close)
+        return cache
+
+    def test_locations_persist_across_instances(self):
+        cache = self._open()
+        cache.set("8.8.8.8", self.LOCATION)
+        cache.close()
+
+        reopened = self._open()
+        self.assertEqual(reopened.get("8.8.8.8"), self.LOCATION)
+        self.assertIsNone(reopened.get("1.1.1.1"))
+        self.assertEqual((reopened.hits, reopened.misses), (1, 1))
+
+    def test_locations_are_shared_between_connections(self):
+        writer = self._open()
+        reader = self._open()
+
+        writer.set("8.8.8.8", self.LOCATION)
+
+        self.assertEqual(reader.get("8.8.8.8"), self.LOCATION)
+
+    @patch("free_ip_client.time.time")
+    def test_expired_location_is_not_returned(self, mock_time: Mock):
+        cache = self._open(ttl=60)
+        mock_time.return_value = 1000
+        cache.set("8.8.8.8", self.LOCATION)
+
+        mock_time.return_value = 1059
+        self.assertIsNotNone(cache.get("8.8.8.8"))
+        mock_time.return_value = 1060
+        self.assertIsNone(cache.get("8.8.8.8"))
+
+    @patch("free_ip_client.time.time")
+    def test_oldest_locations_are_evicted_when_full(self, mock_time: Mock):
+        cache = self._open(max_size=2)
+        for second, ip in enumerate(["1.1.1.1", "2.2.2.2", "3.3.3.3"]):
+            mock_time.return_value = 1000 + second
+            cache.set(ip, self.LOCATION)
+
+        self.assertEqual(len(cache), 2)
+        self.assertIsNone(cache.get("1.1.1.1"))
+        self.assertIsNotNone(cache.get("3.3.3.3"))
+
+    @patch("free_ip_client.time.time")
+    def test_replaced_locations_do_not_count_twice(self, mock_time: Mock):
+        cache = self._open(max_size=2)
+        other = self._open(max_size=2)
+        mock_time.return_value = 1000
+        for _ in range(3):
+            cache.set("1.1.1.1", self.LOCATION)
+        mock_time.return_value = 1001
+        other.set("2.2.2.2", self.LOCATION)
+
+        self.assertEqual(len(cache), 2)
+        self.assertIsNotNone(cache.get("1.1.1.1"))
+
+        mock_time.return_value = 1002
+        cache.set("3.3.3.3", self.LOCATION)
+        self.assertEqual(len(other), 2)
+        self.assertIsNone(other.get("1.1.1.1"))
+
+    @patch("free_ip_client.requests.get")
+    def test_get_location_uses_cache(self, mock_get: Mock):
+        mock_get.return_value.json.return_value = API_RESPONSE
+        cache = self._open()
+
+        get_location("8.8.8.8", cache=cache)
+        get_location("8.8.8.8", cache=cache)
+
+        mock_get.assert_called_once()
+        self.assertEqual((cache.hits, cache.misses), (1, 1))
+
+
+class TestFreeIpClientInstance(unittest.TestCase):
+    def setUp(self):
+        self.client = FreeIpClient(timeout=5)
+        self.addCleanup(self.client.close)
+
+        patcher = patch.object(self.client.session, "get")
+        self.mock_get = patcher.start()
+        self.addCleanup(patcher.stop)
+        self.mock_get.return_value.json.return_value = API_RESPONSE
+
+    def test_get_location_uses_session_with_timeout(self):
+        result = self.client.get_location("8.8.8.8")
+
+        self.assertEqual(result["country"], "USA")
+        self.mock_get.assert_called_once_with(f"{FREE_IP_API_URL}/8.8.8.8", timeout=5)
+
+    def test_get_location_caches_normalized_ip(self):
+        self.client.get_location("2001:DB8::1")
+        self.client.get_location("2001:db8:0:0::1")
+
+        self.assertEqual((self.client.cache.hits, self.client.cache.misses), (1, 1))
+        self.mock_get.assert_called_once_with(
+            f"{FREE_IP_API_URL}/2001:db8::1", timeout=5
+        )
+
+    def test_get_location_does_not_cache_errors(self):
+        self.mock_get.side_effect = [
+            RequestException("Service Unavailable"),
+            Mock(json=lambda: API_RESPONSE),
+        ]
+
+        with self.assertRaises(RequestException):
+            self.client.get_location("8.8.8.8")
+
+        self.assertEqual(self.client.get_location("8.8.8.8")["city"], "MIAMI")
+
+    def test_get_location_on_invalid_ip_raises_exception(self):
+        with self.assertRaises(ValueError):
+            self.client.get_location("invalid_ip_address")
+        self.mock_get.assert_not_called()
+
+    def test_get_location_consults_index_before_api(self):
+        self.client.index = LocationIndex()
+        self.client.index.add("8.8.8.0/24", {"country": "X", "region": "X", "city": "X"})
+
+        self.assertEqual(self.client.get_location("8.8.8.8")["country"], "X")
+        self.mock_get.assert_not_called()
+
+    def test_get_location_populates_index(self):
+        self.client.index = LocationIndex()
+        self.client.populate_index = True
+
+        self.client.get_location("8.8.8.8")
+        self.client.cache = LocationCache()
+
+        self.assertEqual(self.client.get_location("8.8.8.200")["city"], "MIAMI")
+        self.mock_get.assert_called_once()
+        self.assertEqual(self.client.index.lookup("8.8.8.1")["country"], "USA")
+
+    def test_get_locations_requests_each_ip_once(self):
+        ips = ["8.8.8.8", "1.1.1.1", "8.8.8.8", " 1.1.1.1", "9.9.9.9"]
+
+        result = self.client.get_locations(ips)
+
+        self.assertEqual(set(result), set(ips))
+        self.assertEqual(result["9.9.9.9"]["region"], "FLORIDA")
+        self.assertEqual(self.mock_get.call_count, 3)
+
+
+def _response(status_code: int, headers: Optional[dict] = None) -> Mock:
+    response = Mock(status_code=status_code, headers=headers or {})
+    response.json.return_value = API_RESPONSE
+    if status_code >= 400:
+        response.raise_for_status.side_effect = HTTPError(f"{status_code} Error")
+    return response
+
+
+class TestFreeIpClientEventLoops(unittest.TestCase):
+    def test_client_can_be_used_from_successive_event_loops(self):
+        client = FreeIpClient(max_workers=1, backoff=0)
+        self.addCleanup(client.close)
+
+        def slow_get(*args, **kwargs):
+            time.sleep(0.01)
+            return _response(200)
+
+        with patch.object(client.session, "get", side_effect=slow_get):
+            for first in range(2):
+                client.cache = LocationCache()
+                ips = [f"10.0.{first}.{last}" for last in range(3)]
+                self.assertEqual(len(asyncio.run(client.aget_locations(ips))), 3)
+
+
+class TestFreeIpClientAsync(unittest.IsolatedAsyncioTestCase):
+    def setUp(self):
+        self.client = FreeIpClient(timeout=5, max_workers=2, backoff=0)
+        self.addCleanup(self.client.close)
+
+        patcher = patch.object(self.client.session, "get")
+        self.mock_get = patcher.start()
+        self.addCleanup(patcher.stop)
+        self.mock_get.return_value = _response(200)
+
+    async def test_aget_location(self):
+        result = await self.client.aget_location("8.8.8.8")
+
+        self.assertEqual(result["city"], "MIAMI")
+        self.mock_get.assert_called_once_with(f"{FREE_IP_API_URL}/8.8.8.8", timeout=5)
+
+    async def test_aget_location_coalesces_concurrent_lookups(self):
+        results = await asyncio.gather(
+            *(self.client.aget_location("8.8.8.8") for _ in range(10))
+        )
+
+        self.assertEqual(len(results), 10)
+        self.mock_get.assert_called_once()
+        self.assertEqual(self.client._loop_state()[1], {})
+
+    async def test_aget_location_retries_on_retryable_status(self):
+        self.mock_get.side_effect = [_response(429), _response(503), _response(200)]
+
+        result = await self.client.aget_location("8.8.8.8")
+
+        self.assertEqual(result["country"], "USA")
+        self.assertEqual(self.mock_get.call_count, 3)
+
+    async def test_aget_location_raises_after_exhausting_retries(self):
+        self.mock_get.return_value = _response(500)
+
+        with self.assertRaises(HTTPError):
+            await self.client.aget_location("8.8.8.8")
+
+        self.assertEqual(self.mock_get.call_count, self.client.retries + 1)
+
+    async def test_aget_location_does_not_retry_client_errors(self):
+        self.mock_get.return_value = _response(404)
+
+        with self.assertRaises(HTTPError):
+            await self.client.aget_location("8.8.8.8")
+
+        self.mock_get.assert_called_once()
+
+    async def test_aget_location_calls_persistent_cache_off_the_event_loop(self):
+        directory = tempfile.TemporaryDirectory()
+        self.addCleanup(directory.cleanup)
+        cache = SqliteLocationCache(os.path.join(directory.name, "locations.db"))
+        self.addCleanup(cache.close)
+        self.client.cache = cache
+        loop_thread = threading.get_ident()
+        threads = []
+
+        def record_thread(method):
+            def call(*args):
+                threads.append(threading.get_ident())
+                return method(*args)
+
+            return call
+
+        with patch.object(cache, "get", record_thread(cache.get)), patch.object(
+            cache, "set", record_thread(cache.set)
+        ):
+            await self.client.aget_location("8.8.8.8")
+            await self.client.aget_location("8.8.8.8")
+
+        self.assertEqual(len(threads), 3)
+        self.assertNotIn(loop_thread, threads)
+        self.mock_get.assert_called_once()
+
+    async def test_aget_locations_bounds_concurrency(self):
+        running = 0
+        max_running = 0
+        lock = threading.Lock()
+
+        def get(url, timeout):
+            nonlocal running, max_running
+            with lock:
+                running += 1
+                max_running = max(max_running, running)
+            time.sleep(0.01)
+            with lock:
+                running -= 1
+            return _response(200)
+
+        self.mock_get.side_effect = get
+        ips = [f"10.0.0.{index}" for index in range(10)] + ["10.0.0.1"]
+
+        result = await self.client.aget_locations(ips)
+
+        self.assertEqual(len(result), 10)
+        self.assertEqual(self.mock_get.call_count, 10)
+        self.assertLessEqual(max_running, 2)
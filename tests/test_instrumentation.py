@@ -0,0 +1,191 @@
+import json
+import os
+import tempfile
+import unittest
+
+from unittest.mock import Mock
+
+from dfm18.bank_account import (
+    Instrumentation,
+    LatencyHistogram,
+    MinorUnitsBankAccount,
+    SimpleBankAccount,
+    transfer,
+    transfer_many,
+)
+from dfm18.bank_account.policies import Policy, PolicyOperation
+
+
+class TestLatencyHistogram(unittest.TestCase):
+    def test_observe(self):
+        histogram = LatencyHistogram([0.001, 0.01])
+
+        for seconds in (0.0005, 0.001, 0.005, 1):
+            histogram.observe(seconds)
+
+        self.assertEqual(histogram.counts, [2, 1, 1])
+        self.assertEqual(histogram.cumulative_counts(), [2, 3, 4])
+        self.assertEqual(histogram.count, 4)
+        self.assertAlmostEqual(histogram.sum, 1.0065)
+
+    def test_unsorted_buckets_raise_exception(self):
+        with self.assertRaises(ValueError):
+            LatencyHistogram([0.01, 0.001])
+
+
+class TestInstrumentation(unittest.TestCase):
+    def setUp(self):
+        self.instrumentation = Instrumentation()
+
+    def test_operations_are_timed_by_phase(self):
+        account = SimpleBankAccount(balance=100, instrumentation=self.instrumentation)
+
+        self.assertEqual(account.deposit(50), 150)
+        self.assertEqual(account.withdraw(30), 120)
+
+        for name in ("deposit", "withdraw"):
+            self.assertEqual(self.instrumentation.counter(f"{name}.count"), 1)
+            for phase in ("validation", "policies", "balance_update", "logging", "total"):
+                self.assertEqual(self.instrumentation.histogram(f"{name}.{phase}").count, 1)
+
+    def test_policies_are_timed(self):
+        policy = Mock(spec=Policy)
+        policy.supports.return_value = True
+        policy.apply.side_effect = [None, Exception("Policy Restriction")]
+        account = SimpleBankAccount(balance=100, policies=[policy], instrumentation=self.instrumentation)
+
+        account.withdraw(10)
+        with self.assertRaises(Exception):
+            account.withdraw(10)
+
+        self.assertEqual(account.balance, 90)
+        self.assertEqual(self.instrumentation.histogram("policy.Mock").count, 2)
+        self.assertEqual(self.instrumentation.counter("policy.Mock.rejected"), 1)
+        self.assertEqual(self.instrumentation.counter("withdraw.rejected"), 1)
+        self.assertEqual(self.instrumentation.counter("withdraw.count"), 2)
+
+    def test_batches_are_timed_by_phase(self):
+        policy = Mock(spec=Policy)
+        policy.supports.return_value = True
+        policy.apply_batch = Mock()
+        account = SimpleBankAccount(balance=100, policies=[policy], instrumentation=self.instrumentation)
+
+        account.apply_batch([(PolicyOperation.DEPOSIT, 50), (PolicyOperation.WITHDRAW, 30)])
+        policy.apply_batch.side_effect = Exception("Policy Restriction")
+        with self.assertRaises(Exception):
+            account.apply_batch([(PolicyOperation.DEPOSIT, 10)])
+
+        self.assertEqual(account.balance, 120)
+        self.assertEqual(self.instrumentation.counter("batch.count"), 2)
+        self.assertEqual(self.instrumentation.counter("batch.rejected"), 1)
+        for phase in ("policies", "balance_update", "logging"):
+            self.assertEqual(self.instrumentation.histogram(f"batch.{phase}").count, 1)
+        for phase in ("validation", "total"):
+            self.assertEqual(self.instrumentation.histogram(f"batch.{phase}").count, 2)
+        self.assertEqual(self.instrumentation.histogram("policy.Mock").count, 3)
+        self.assertEqual(self.instrumentation.counter("policy.Mock.rejected"), 1)
+
+    def test_transfers_are_timed_by_every_involved_instrumentation(self):
+        other = Instrumentation()
+        src = SimpleBankAccount(balance=100, instrumentation=self.instrumentation)
+        dst = SimpleBankAccount(instrumentation=other)
+        shared = SimpleBankAccount(instrumentation=self.instrumentation)
+
+        transfer(src, dst, 30)
+        transfer_many([(src, shared, 10), (src, dst, 10)])
+
+        self.assertEqual(self.instrumentation.counter("transfer.count"), 2)
+        self.assertEqual(other.counter("transfer.count"), 2)
+        for phase in ("validation", "policies", "balance_update", "logging", "total"):
+            self.assertEqual(self.instrumentation.histogram(f"transfer.{phase}").count, 2)
+            self.assertEqual(other.histogram(f"transfer.{phase}").count, 2)
+
+    def test_rejected_transfers_are_counted(self):
+        policy = Mock(spec=Policy)
+        policy.supports.return_value = True
+        policy.apply.side_effect = Exception("Policy Restriction")
+        src = SimpleBankAccount(balance=100, instrumentation=self.instrumentation)
+        dst = SimpleBankAccount(policies=[policy])
+
+        with self.assertRaises(Exception):
+            transfer(src, dst, 30)
+
+        self.assertEqual(src.balance, 100)
+        self.assertEqual(self.instrumentation.counter("transfer.rejected"), 1)
+        self.assertEqual(self.instrumentation.counter("transfer.count"), 1)
+        self.assertIsNone(self.instrumentation.histogram("transfer.policies"))
+        self.assertIsNone(self.instrumentation.histogram("policy.Mock"))
+
+    def test_invalid_amount_is_counted_as_rejected(self):
+        account = SimpleBankAccount(instrumentation=self.instrumentation)
+
+        with self.assertRaises(ValueError):
+            account.deposit(0)
+
+        self.assertEqual(self.instrumentation.counter("deposit.rejected"), 1)
+        self.assertIsNone(self.instrumentation.histogram("deposit.policies"))
+
+    def test_minor_units_account(self):
+        account = MinorUnitsBankAccount(balance=0.1, instrumentation=self.instrumentation)
+
+        self.assertEqual(account.deposit(0.2), 0.3)
+        self.assertEqual(self.instrumentation.counter("deposit.count"), 1)
+
+    def test_accounts_without_instrumentation_are_not_timed(self):
+        account = SimpleBankAccount()
+
+        account.deposit(10)
+        account.apply_batch([(PolicyOperation.WITHDRAW, 5)])
+        transfer(account, SimpleBankAccount(), 5)
+
+        self.assertEqual(self.instrumentation.to_dict(), {"counters": {}, "histograms": {}})
+
+    def test_export_json(self):
+        self.instrumentation.increment("deposit.count", 2)
+        self.instrumentation.observe("deposit.total", 0.5)
+
+        with tempfile.TemporaryDirectory() as directory:
+            path = os.path.join(directory, "stats.json")
+            self.instrumentation.export(path)
+            with open(path) as file:
+                stats = json.load(file)
+
+        self.assertEqual(stats["counters"], {"deposit.count": 2})
+        self.assertEqual(stats["histograms"]["deposit.total"]["count"], 1)
+        self.assertEqual(stats["histograms"]["deposit.total"]["counts"][-2], 1)
+
+    def test_export_prometheus(self):
+        instrumentation = Instrumentation(prefix="bank", buckets=[0.1, 1])
+        instrumentation.increment("deposit.count")
+        instrumentation.observe("deposit.total", 0.5)
+
+        with tempfile.TemporaryDirectory() as directory:
+            path = os.path.join(directory, "stats.prom")
+            instrumentation.export(path, format="prometheus")
+            with open(path) as file:
+                lines = file.read().splitlines()
+
+        self.assertEqual(
+            lines,
+            [
+                "# TYPE bank_events_total counter",
+                'bank_events_total{name="deposit.count"} 1',
+                "# TYPE bank_duration_seconds histogram",
+                'bank_duration_seconds_bucket{name="deposit.total",le="0.1"} 0',
+                'bank_duration_seconds_bucket{name="deposit.total",le="1"} 1',
+                'bank_duration_seconds_bucket{name="deposit.total",le="+Inf"} 1',
+                'bank_duration_seconds_sum{name="deposit.total"} 0.5',
+                'bank_duration_seconds_count{name="deposit.total"} 1',
+            ],
+        )
+
+    def test_export_with_unsupported_format_raises_exception(self):
+        with self.assertRaises(ValueError):
+            self.instrumentation.export("stats.xml", format="xml")
+
+    def test_reset(self):
+        self.instrumentation.increment("deposit.count")
+
+        self.instrumentation.reset()
+
+        self.assertEqual(self.instrumentation.counter("deposit.count"), 0)
@@ -0,0 +1,107 @@
+import unittest
+
+from unittest.mock import patch
+
+import os
+import tempfile
+
+from dfm18.bank_account import JournalReader, RecordKind, TransactionJournal
+
+
+class TestJournalReader(unittest.TestCase):
+    def setUp(self):
+        directory = tempfile.TemporaryDirectory()
+        self.addCleanup(directory.cleanup)
+        self.path = os.path.join(directory.name, "journal.bin")
+
+    def _write(self, records):
+        with patch("dfm18.bank_account._journal.time.time_ns") as mock_time_ns:
+            with TransactionJournal(self.path) as journal:
+                for timestamp_ns, kind, account_id, amount in records:
+                    mock_time_ns.return_value = timestamp_ns
+                    if kind is RecordKind.SNAPSHOT:
+                        journal.snapshot(account_id, amount)
+                    else:
+                        journal.record(kind, account_id, amount)
+
+    def _open(self, **kwargs) -> JournalReader:
+        reader = JournalReader(self.path, **kwargs)
+        self.addCleanup(reader.close)
+        return reader
+
+    def test_empty_journal(self):
+        open(self.path, "wb").close()
+        reader = self._open()
+
+        self.assertEqual(len(reader), 0)
+        self.assertEqual(list(reader), [])
+        self.assertEqual(reader.summarize(), {})
+
+    def test_iteration(self):
+        self._write(
+            [
+                (1, RecordKind.SNAPSHOT, "acc", 100),
+                (2, RecordKind.DEPOSIT, "acc", 50),
+            ]
+        )
+        reader = self._open()
+
+        records = list(reader)
+        self.assertEqual(len(reader), 2)
+        self.assertEqual(records[1].kind, RecordKind.DEPOSIT)
+        self.assertEqual(records[1].account_id, "acc")
+        self.assertEqual(records[1].timestamp_ns, 2)
+        self.assertEqual(records[1].amount, 50)
+
+    def test_time_range_queries_use_sparse_index(self):
+        self._write(
+            [(timestamp, RecordKind.DEPOSIT, "acc", 1) for timestamp in range(0, 1000, 10)]
+        )
+        reader = self._open(index_interval=7)
+
+        self.assertEqual(len(reader._index), 15)
+        self.assertEqual(reader.find_range(250, 305), (25, 31))
+        self.assertEqual(reader.find_range(None, 5), (0, 1))
+        self.assertEqual(reader.find_range(995, None), (100, 100))
+        self.assertEqual(reader.find_range(500, 100), (50, 50))
+        self.assertEqual(
+            [record.timestamp_ns for record in reader.between(300, 340)],
+            [300, 310, 320, 330],
+        )
+
+    def test_summarize(self):
+        self._write(
+            [
+                (1, RecordKind.SNAPSHOT, "acc", 100),
+                (2, RecordKind.DEPOSIT, "acc", 50),
+                (3, RecordKind.DEPOSIT, "other", 10),
+                (4, RecordKind.WITHDRAW, "acc", 120),
+                (5, RecordKind.SNAPSHOT, "acc", 30),
+                (6, RecordKind.DEPOSIT, "acc", 5),
+            ]
+        )
+        reader = self._open()
+
+        summary = reader.summarize()
+        self.assertEqual(summary["acc"].count, 3)
+        self.assertEqual(summary["acc"].deposited, 55)
+        self.assertEqual(summary["acc"].withdrawn, 120)
+        self.assertEqual(summary["acc"].min_balance, 30)
+        self.assertEqual(summary["acc"].max_balance, 150)
+        self.assertEqual(summary["other"].count, 1)
+
+        ranged = reader.summarize(start_ns=4)
+        self.assertEqual(set(ranged), {"acc"})
+        self.assertEqual(ranged["acc"].count, 2)
+        self.assertEqual(ranged["acc"].min_balance, 30)
+        self.assertEqual(ranged["acc"].max_balance, 35)
+
+    def test_close_releases_mapping(self):
+        self._write([(1, RecordKind.DEPOSIT, "acc", 1)])
+        reader = JournalReader(self.path)
+        list(reader)
+        reader.summarize()
+
+        reader.close()
+
+        self.assertTrue(reader._file.closed)
@@ -0,0 +1,145 @@
+import json
+import os
+import tempfile
+import threading
+import unittest
+
+from unittest.mock import Mock
+
+from dfm18.bank_account import (
+    ImportProgress,
+    LedgerImporter,
+    Posting,
+    SimpleBankAccount,
+    read_postings,
+)
+from dfm18.bank_account.policies import Policy, PolicyOperation
+
+
+class TestLedgerImporter(unittest.TestCase):
+    def setUp(self):
+        self.directory = tempfile.TemporaryDirectory()
+        self.addCleanup(self.directory.cleanup)
+        self.first = SimpleBankAccount(balance=100, account_id="first")
+        self.second = SimpleBankAccount(balance=100, account_id="second")
+        self.accounts = {"first": self.first, "second": self.second}
+
+    def _write(self, name: str, content: str) -> str:
+        path = os.path.join(self.directory.name, name)
+        with open(path, "w", newline="") as file:
+            file.write(content)
+        return path
+
+    def test_read_postings_from_csv(self):
+        path = self._write("ledger.csv", "account_id,operation,amount\nfirst,Deposit,10.5\nfirst,withdraw,x\n")
+
+        rows = list(read_postings(path))
+
+        self.assertEqual(rows[0], (2, Posting("first", PolicyOperation.DEPOSIT, 10.5)))
+        self.assertEqual(rows[1][0], 3)
+        self.assertEqual(rows[1][1].error, "Invalid amount: 'x'")
+
+    def test_read_postings_with_non_finite_amount(self):
+        path = self._write("ledger.csv", "account_id,operation,amount\nfirst,deposit,inf\nfirst,deposit,NaN\n")
+
+        rows = list(read_postings(path))
+
+        self.assertEqual([row.error for _, row in rows], ["Invalid amount: 'inf'", "Invalid amount: 'NaN'"])
+
+    def test_read_postings_from_jsonl(self):
+        path = self._write(
+            "ledger.jsonl",
+            json.dumps({"account_id": "first", "operation": "withdrawal", "amount": 5}) + "\n\n{\n[]\n",
+        )
+
+        rows = list(read_postings(path))
+
+        self.assertEqual(rows[0], (1, Posting("first", PolicyOperation.WITHDRAW, 5.0)))
+        self.assertEqual([line for line, _ in rows[1:]], [3, 4])
+        self.assertTrue(rows[1][1].error.startswith("Invalid JSON"))
+        self.assertEqual(rows[2][1].error, "Row must be a JSON object")
+
+    def test_read_postings_with_unsupported_format_raises_exception(self):
+        with self.assertRaises(ValueError):
+            list(read_postings("ledger.txt", format="xml"))
+
+    def test_import_file(self):
+        path = self._write(
+            "ledger.csv",
+            "account_id,operation,amount\n"
+            "first,deposit,50\n"
+            "second,withdraw,30\n"
+            "first,withdraw,20\n"
+            "third,deposit,10\n"
+            "second,refund,10\n",
+        )
+        progress = []
+        importer = LedgerImporter(self.accounts, batch_size=2, progress=progress.append)
+
+        counters = importer.import_file(path)
+
+        self.assertEqual(self.first.get_balance(), 130)
+        self.assertEqual(self.second.get_balance(), 70)
+        self.assertEqual(counters, ImportProgress(rows_read=5, rows_applied=3, rows_rejected=2, batches=3))
+        self.assertEqual(len(progress), 3)
+        self.assertEqual(
+            [(error.line, error.error) for error in importer.errors],
+            [(5, "Unknown account: third"), (6, "Unsupported operation: 'refund'")],
+        )
+
+    def test_rejected_postings_of_an_account_are_not_applied(self):
+        policy = Mock(spec=Policy)
+        policy.supports.return_value = True
+        policy.apply_batch = Mock(side_effect=Exception("Policy Restriction"))
+        self.first.add_policy(policy)
+        rows = [
+            (1, Posting("first", PolicyOperation.DEPOSIT, 10)),
+            (2, Posting("second", PolicyOperation.DEPOSIT, 10)),
+        ]
+
+        importer = LedgerImporter(self.accounts)
+        importer.import_rows(rows)
+
+        self.assertEqual(self.first.get_balance(), 100)
+        self.assertEqual(self.second.get_balance(), 110)
+        self.assertEqual(importer.errors[0].line, 1)
+
+    def test_max_errors(self):
+        rows = [(line, Posting("unknown", PolicyOperation.DEPOSIT, 1)) for line in range(10)]
+
+        importer = LedgerImporter(self.accounts, max_errors=3)
+
+        self.assertEqual(importer.import_rows(rows).rows_rejected, 10)
+        self.assertEqual(len(importer.errors), 3)
+
+    def test_reading_is_bounded_by_pending_batches(self):
+        read = []
+        release = threading.Event()
+
+        def rows():
+            for line in range(100):
+                read.append(line)
+                yield line, Posting("first", PolicyOperation.DEPOSIT, 1)
+
+        def progress(_):
+            release.wait(timeout=5)
+
+        importer = LedgerImporter(self.accounts, batch_size=10, max_pending_batches=2, progress=progress)
+        thread = threading.Thread(target=importer.import_rows, args=(rows(),))
+        thread.start()
+        try:
+            self.assertFalse(release.wait(timeout=0.2))
+            self.assertLessEqual(len(read), 10 * 4)
+        finally:
+            release.set()
+            thread.join()
+
+        self.assertEqual(self.first.get_balance(), 200)
+
+    def test_reader_exceptions_are_raised(self):
+        def rows():
+            yield 1, Posting("first", PolicyOperation.DEPOSIT, 1)
+            raise OSError("Read error")
+
+        with self.assertRaises(OSError):
+            LedgerImporter(self.accounts).import_rows(rows())
@@ -0,0 +1,49 @@
+import unittest
+
+from dfm18.bank_account import MinorUnitsBankAccount
+
+from dfm18.bank_account.policies import PolicyOperation
+
+
+class TestMinorUnitsBankAccount(unittest.TestCase):
+    def setUp(self):
+        self.account = MinorUnitsBankAccount(balance=1000)
+
+    def test_initialization(self):
+        self.assertEqual(self.account.balance, 1000)
+        self.assertEqual(self.account.balance_in_minor_units, 100000)
+
+    def test_initialization_on_invalid_minor_units_raises_exception(self):
+        with self.assertRaises(ValueError):
+            MinorUnitsBankAccount(minor_units=0)
+
+    def test_deposit_and_withdraw(self):
+        self.assertEqual(self.account.deposit(0.55), 1000.55)
+        self.assertEqual(self.account.withdraw(100.5), 900.05)
+        self.assertEqual(self.account.balance_in_minor_units, 90005)
+
+    def test_small_operations_do_not_accumulate_rounding_errors(self):
+        account = MinorUnitsBankAccount()
+
+        for _ in range(10000):
+            account.deposit(0.1)
+
+        self.assertEqual(account.balance_in_minor_units, 100000)
+        self.assertEqual(account.balance, 1000)
+
+    def test_amount_smaller_than_minor_unit_raises_exception(self):
+        with self.assertRaises(ValueError):
+            self.account.deposit(0.001)
+        with self.assertRaises(ValueError):
+            self.account.withdraw(0.005)
+        self.assertEqual(self.account.balance_in_minor_units, 100000)
+
+    def test_apply_batch(self):
+        new_balance = self.account.apply_batch(
+            [(PolicyOperation.DEPOSIT, 0.1), (PolicyOperation.WITHDRAW, 0.3)]
+        )
+        self.assertEqual(new_balance, 999.8)
+        self.assertEqual(self.account.balance_in_minor_units, 99980)
+
+    def test_accounts_have_no_instance_dict(self):
+        self.assertFalse(hasattr(self.account, "__dict__"))
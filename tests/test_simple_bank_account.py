@@ -2,23 +2,29 @@ import unittest
 
 from unittest.mock import patch, Mock
 
+import logging
 import os
+import time
 
-from dfm18.bank_account._simple import SimpleBankAccount
+from dfm18.bank_account._logging import QueuedFileHandler
 
-from dfm18.bank_account.policies import Policy
+from dfm18.bank_account._simple import SimpleBankAccount, _log_handlers
+
+from dfm18.bank_account.policies import Policy, PolicyOperation
 
 
 class TestSimpleBankAccount(unittest.TestCase):
     def setUp(self):
+        self.addCleanup(self._remove_log_file)
         self.account = SimpleBankAccount(balance=1000, log_file="transaction.log")
+        self.addCleanup(self.account.close)
 
     def tearDown(self):
-        for handler in self.account._logger.handlers:
-            handler.close()
+        self.account.close()
 
-        if self.account.log_file is not None and os.path.exists(self.account.log_file):
-            os.remove(self.account.log_file)
+    def _remove_log_file(self):
+        if os.path.exists("transaction.log"):
+            os.remove("transaction.log")
 
     @patch("dfm18.bank_account.policies.Policy")
     def test_initialization_with_policies(self, mock_policy: Mock):
@@ -37,7 +43,7 @@ class TestSimpleBankAccount(unittest.TestCase):
         self.assertEqual(len(self.account.policies), 2)
         self.assertIn(mock_policy_1, self.account.policies)
         self.assertIn(mock_policy_2, self.account.policies)
-        self.assertEqual(self.account.policies, policies)
+        self.assertEqual(list(self.account.policies), policies)
 
         mock_policy_1.apply.assert_not_called()
         mock_policy_1.supports.assert_not_called()
@@ -177,3 +183,280 @@ class TestSimpleBankAccount(unittest.TestCase):
             self.assertIn("Deposited 1000.00. New balance: 2000.00", log_file.output[0])
             self.account.withdraw(50)
             self.assertIn("Withdrew 50.00. New balance: 1950.00", log_file.output[1])
+
+    def test_close_releases_log_handler(self):
+        handler = _log_handlers.handler_for("transaction.log")
+        logger = self.account._logger
+        self.account.close()
+
+        self.assertNotIn(handler, logger.handlers)
+        self.assertIsNone(_log_handlers.handler_for("transaction.log"))
+
+    def test_log_file_reuses_its_logger_after_release(self):
+        logger = self.account._logger
+        self.account.close()
+        loggers = len(logging.Logger.manager.loggerDict)
+
+        for _ in range(100):
+            SimpleBankAccount(log_file="transaction.log").close()
+
+        self.assertEqual(len(logging.Logger.manager.loggerDict), loggers)
+        self.account = SimpleBankAccount(log_file="transaction.log")
+        self.assertIs(self.account._logger, logger)
+
+    def test_accounts_share_one_handler_per_log_file(self):
+        accounts = [
+            SimpleBankAccount(balance=10, log_file="transaction.log")
+            for _ in range(100)
+        ]
+
+        self.assertEqual(len(self.account._logger.handlers), 1)
+        for account in accounts:
+            self.assertIs(account._logger, self.account._logger)
+
+        for account in accounts:
+            account.close()
+
+        self.assertIsNotNone(_log_handlers.handler_for("transaction.log"))
+
+    @unittest.skipUnless(os.path.isdir("/proc/self/fd"), "requires /proc/self/fd")
+    def test_open_file_descriptors_do_not_grow_with_accounts(self):
+        def open_fds():
+            return len(os.listdir("/proc/self/fd"))
+
+        accounts = [SimpleBankAccount(log_file="transaction.log") for _ in range(10)]
+        fds = open_fds()
+        accounts += [SimpleBankAccount(log_file="transaction.log") for _ in range(1000)]
+
+        self.assertEqual(open_fds(), fds)
+
+        for account in accounts:
+            account.close()
+
+    def test_log_records_are_written_once_and_tagged_with_account_id(self):
+        other = SimpleBankAccount(
+            balance=10, log_file="transaction.log", account_id="other"
+        )
+
+        self.account.deposit(100)
+        other.deposit(5)
+        other.close()
+
+        with open("transaction.log") as log_file:
+            lines = log_file.read().splitlines()
+
+        self.assertEqual(len(lines), 2)
+        self.assertIn(f"[{self.account.account_id}] Deposited 100.00", lines[0])
+        self.assertIn("[other] Deposited 5.00. New balance: 15.00", lines[1])
+
+    def test_queued_logging_writes_log_file_on_flush(self):
+        self.account.close()
+        self.account = SimpleBankAccount(
+            balance=1000, log_file="transaction.log", queued_logging=True
+        )
+
+        self.account.deposit(100)
+        self.account.withdraw(50)
+        self.account.flush_log()
+
+        with open(self.account.log_file) as log_file:
+            lines = log_file.read().splitlines()
+
+        self.assertEqual(len(lines), 2)
+        self.assertIn("Deposited 100.00. New balance: 1100.00", lines[0])
+        self.assertIn("Withdrew 50.00. New balance: 1050.00", lines[1])
+
+    def test_queued_logging_writes_a_batch_at_once(self):
+        handler = QueuedFileHandler("transaction.log", batch_size=3)
+        self.addCleanup(handler.close)
+        stream = handler._file_handler.stream
+        handler._file_handler.stream = Mock(wraps=stream)
+        logger = logging.getLogger("test_queued_logging_writes_a_batch_at_once")
+        logger.addHandler(handler)
+        self.addCleanup(logger.removeHandler, handler)
+
+        for amount in range(4):
+            logger.warning("Deposited %d", amount, extra={"account_id": "acc"})
+        handler.flush()
+
+        self.assertEqual(handler._file_handler.stream.write.call_count, 2)
+        self.assertEqual(handler._file_handler.stream.flush.call_count, 2)
+        with open("transaction.log") as log_file:
+            self.assertEqual(len(log_file.read().splitlines()), 4)
+
+    def test_queued_logging_reports_write_errors(self):
+        handler = QueuedFileHandler("transaction.log")
+        self.addCleanup(handler._file_handler.stream.close)
+        self.addCleanup(handler.close)
+        handler._file_handler.stream = Mock(**{"write.side_effect": OSError("No space left on device")})
+        handler._file_handler.handleError = Mock()
+        record = logging.makeLogRecord({"msg": "Deposited 1", "account_id": "acc"})
+
+        handler.handle(record)
+        handler.flush()
+
+        handler._file_handler.handleError.assert_called_once_with(record)
+
+    def test_queued_logging_writes_records_after_flush_interval(self):
+        handler = QueuedFileHandler("transaction.log", flush_interval=0.01)
+        self.addCleanup(handler.close)
+        record = logging.makeLogRecord({"msg": "Deposited 1", "account_id": "acc"})
+
+        handler.handle(record)
+
+        for _ in range(500):
+            with open("transaction.log") as log_file:
+                if log_file.read():
+                    break
+            time.sleep(0.01)
+        else:
+            self.fail("The record was not written")
+
+    def test_queued_logging_writes_pending_records_on_close(self):
+        self.account.close()
+        self.account = SimpleBankAccount(
+            balance=1000, log_file="transaction.log", queued_logging=True
+        )
+
+        self.account.deposit(100)
+        self.account.close()
+
+        with open(self.account.log_file) as log_file:
+            self.assertIn("Deposited 100.00. New balance: 1100.00", log_file.read())
+
+    def test_apply_batch(self):
+        new_balance = self.account.apply_batch(
+            [
+                (PolicyOperation.DEPOSIT, 500),
+                (PolicyOperation.WITHDRAW, 200),
+                (PolicyOperation.DEPOSIT, 100),
+            ]
+        )
+        self.assertEqual(new_balance, 1400)
+        self.assertEqual(self.account.balance, 1400)
+
+    def test_apply_batch_on_invalid_amount_applies_nothing(self):
+        with self.assertRaises(ValueError):
+            self.account.apply_batch(
+                [(PolicyOperation.DEPOSIT, 500), (PolicyOperation.WITHDRAW, 0)]
+            )
+        self.assertEqual(self.account.balance, 1000)
+
+    @patch("dfm18.bank_account.policies.Policy")
+    def test_apply_batch_evaluates_policy_once_per_operation(self, mock_policy: Mock):
+        mock_policy.supports.side_effect = lambda operation: (
+            operation == PolicyOperation.WITHDRAW
+        )
+
+        self.account = SimpleBankAccount(balance=1000, policies=[mock_policy])
+        self.account.apply_batch(
+            [
+                (PolicyOperation.WITHDRAW, 100),
+                (PolicyOperation.DEPOSIT, 50),
+                (PolicyOperation.WITHDRAW, 200),
+            ]
+        )
+
+        mock_policy.apply_batch.assert_called_once_with(self.account, [100, 200])
+        mock_policy.apply.assert_not_called()
+
+    @patch("dfm18.bank_account.policies.Policy")
+    def test_apply_batch_on_policy_violation_applies_nothing(self, mock_policy: Mock):
+        mock_policy.apply_batch.side_effect = Exception("Policy Restriction")
+        mock_policy.supports.return_value = True
+
+        self.account = SimpleBankAccount(balance=1000, policies=[mock_policy])
+
+        with self.assertRaises(Exception):
+            self.account.apply_batch(
+                [(PolicyOperation.DEPOSIT, 100), (PolicyOperation.WITHDRAW, 50)]
+            )
+        self.assertEqual(self.account.balance, 1000)
+
+    def test_apply_batch_with_policy_without_apply_batch(self):
+        class MaxDeposit:
+            def supports(self, operation):
+                return operation == PolicyOperation.DEPOSIT
+
+            def apply(self, account, amount):
+                if amount > 100:
+                    raise Exception("Policy Restriction")
+
+        self.assertIsInstance(MaxDeposit(), Policy)
+        self.account = SimpleBankAccount(balance=1000, policies=[MaxDeposit()])
+
+        self.assertEqual(self.account.apply_batch([(PolicyOperation.DEPOSIT, 100)] * 2), 1200)
+        with self.assertRaises(Exception):
+            self.account.apply_batch([(PolicyOperation.DEPOSIT, 100), (PolicyOperation.DEPOSIT, 101)])
+        self.assertEqual(self.account.balance, 1200)
+
+    def test_apply_batch_logs_one_record(self):
+        with self.assertLogs(self.account._logger) as log_file:
+            self.account.apply_batch(
+                [(PolicyOperation.DEPOSIT, 100), (PolicyOperation.WITHDRAW, 50)]
+            )
+
+        self.assertEqual(len(log_file.output), 1)
+        self.assertIn(
+            "Applied batch of 2 operations (deposited 100.00, withdrew 50.00). New balance: 1050.00",
+            log_file.output[0],
+        )
+
+    @patch("dfm18.bank_account.policies.Policy")
+    def test_policy_support_is_resolved_once_per_operation(self, mock_policy: Mock):
+        mock_policy.supports.return_value = True
+
+        self.account = SimpleBankAccount(balance=1000, policies=[mock_policy])
+        self.account.deposit(100)
+        self.account.deposit(100)
+        self.account.withdraw(100)
+
+        self.assertEqual(mock_policy.supports.call_count, 2)
+        self.assertEqual(mock_policy.apply.call_count, 3)
+
+    def test_add_policy_invalidates_resolved_policies(self):
+        self.account.deposit(100)
+
+        policy = Mock(spec=Policy)
+        policy.supports.return_value = True
+        self.account.add_policy(policy)
+        self.account.deposit(100)
+
+        self.assertEqual(self.account.policies, (policy,))
+        policy.apply.assert_called_once_with(self.account, 100)
+
+    def test_remove_policy_invalidates_resolved_policies(self):
+        policy = Mock(spec=Policy)
+        policy.supports.return_value = True
+        self.account.add_policy(policy)
+        self.account.deposit(100)
+
+        self.account.remove_policy(policy)
+        self.account.deposit(100)
+
+        self.assertEqual(self.account.policies, ())
+        policy.apply.assert_called_once_with(self.account, 100)
+
+        with self.assertRaises(ValueError):
+            self.account.remove_policy(policy)
+
+    def test_balance_listeners_receive_balance_changes(self):
+        listener = Mock()
+        self.account.add_balance_listener(listener)
+
+        self.account.deposit(100)
+        self.account.withdraw(30)
+        self.account.apply_batch(
+            [(PolicyOperation.DEPOSIT, 10), (PolicyOperation.WITHDRAW, 5)]
+        )
+        self.account.remove_balance_listener(listener)
+        self.account.deposit(1)
+
+        self.assertEqual(
+            listener.call_args_list,
+            [
+                ((self.account, 100),),
+                ((self.account, -30),),
+                ((self.account, 5),),
+            ],
+        )
@@ -0,0 +1,81 @@
+import unittest
+
+from concurrent.futures import ThreadPoolExecutor
+
+import sys
+import time
+
+from dfm18.bank_account import BankAccount, MinorUnitsBankAccount, SimpleBankAccount
+
+from dfm18.bank_account.policies import Policy, PolicyOperation
+
+
+class InsufficientFundsPolicy(Policy):
+    def apply(self, account: BankAccount, amount: float):
+        balance = account.get_balance()
+        # Lets other threads run between the check and the balance update.
+        time.sleep(0)
+        if balance < amount:
+            raise ValueError("Insufficient funds")
+
+    def supports(self, operation: PolicyOperation) -> bool:
+        return operation == PolicyOperation.WITHDRAW
+
+
+class TestThreadSafeBankAccount(unittest.TestCase):
+    def setUp(self):
+        self.switch_interval = sys.getswitchinterval()
+        sys.setswitchinterval(1e-6)
+
+    def tearDown(self):
+        sys.setswitchinterval(self.switch_interval)
+
+    def _run_concurrently(self, function, threads=16, calls=500):
+        def worker():
+            for _ in range(calls):
+                function()
+
+        with ThreadPoolExecutor(max_workers=threads) as executor:
+            futures = [executor.submit(worker) for _ in range(threads)]
+            for future in futures:
+                future.result()
+
+    def test_concurrent_deposits_are_not_lost(self):
+        account = MinorUnitsBankAccount(thread_safe=True)
+
+        self._run_concurrently(lambda: account.deposit(1))
+
+        self.assertEqual(account.balance, 16 * 500)
+
+    def test_concurrent_withdrawals_respect_policies_atomically(self):
+        account = SimpleBankAccount(
+            balance=1000, policies=[InsufficientFundsPolicy()], thread_safe=True
+        )
+
+        def withdraw():
+            try:
+                account.withdraw(1)
+            except ValueError:
+                pass
+
+        self._run_concurrently(withdraw)
+
+        self.assertEqual(account.balance, 0)
+
+    def test_concurrent_batches_are_atomic(self):
+        account = SimpleBankAccount(thread_safe=True)
+
+        self._run_concurrently(
+            lambda: account.apply_batch(
+                [(PolicyOperation.DEPOSIT, 2), (PolicyOperation.WITHDRAW, 1)]
+            ),
+            calls=200,
+        )
+
+        self.assertEqual(account.balance, 16 * 200)
+
+    def test_accounts_without_thread_safety_share_a_no_op_lock(self):
+        first, second = SimpleBankAccount(), SimpleBankAccount()
+
+        self.assertIs(first._lock, second._lock)
+        self.assertIsNot(SimpleBankAccount(thread_safe=True)._lock, first._lock)
@@ -0,0 +1,163 @@
+import unittest
+
+from unittest.mock import patch, Mock
+
+import os
+import tempfile
+
+from dfm18.bank_account import (
+    FsyncPolicy,
+    MinorUnitsBankAccount,
+    RecordKind,
+    SimpleBankAccount,
+    TransactionJournal,
+    transfer,
+)
+
+from dfm18.bank_account._journal import RECORD_SIZE
+
+from dfm18.bank_account.policies import PolicyOperation
+
+
+class TestTransactionJournal(unittest.TestCase):
+    def setUp(self):
+        directory = tempfile.TemporaryDirectory()
+        self.addCleanup(directory.cleanup)
+        self.path = os.path.join(directory.name, "journal.bin")
+        self.journal = self._open()
+
+    def _open(self, **kwargs) -> TransactionJournal:
+        journal = TransactionJournal(self.path, **kwargs)
+        self.addCleanup(journal.close)
+        return journal
+
+    def test_records_have_fixed_size(self):
+        self.journal.snapshot("acc", 100)
+        self.journal.record(RecordKind.DEPOSIT, "acc", 50)
+        self.journal.flush()
+
+        self.assertEqual(os.path.getsize(self.path), 2 * RECORD_SIZE)
+
+    def test_iteration_returns_records_in_order(self):
+        self.journal.snapshot("acc", 100)
+        self.journal.record(RecordKind.WITHDRAW, "acc", 25.5)
+
+        records = list(self.journal)
+
+        self.assertEqual([record.kind for record in records], [RecordKind.SNAPSHOT, RecordKind.WITHDRAW])
+        self.assertEqual(records[1].account_id, "acc")
+        self.assertEqual(records[1].amount, 25.5)
+
+    def test_account_id_longer_than_16_bytes_raises_exception(self):
+        with self.assertRaises(ValueError):
+            self.journal.snapshot("a" * 17, 100)
+
+    def test_record_snapshot_kind_raises_exception(self):
+        with self.assertRaises(ValueError):
+            self.journal.record(RecordKind.SNAPSHOT, "acc", 100)
+
+    def test_snapshot_is_written_every_interval(self):
+        journal = self._open(snapshot_interval=3)
+        balance = 0
+        for _ in range(7):
+            balance += 10
+            journal.record(RecordKind.DEPOSIT, "acc", 10, balance)
+
+        kinds = [record.kind for record in journal]
+        self.assertEqual(kinds.count(RecordKind.SNAPSHOT), 2)
+        self.assertEqual(kinds[3], RecordKind.SNAPSHOT)
+
+        replayed = journal.replay("acc")
+        self.assertEqual(replayed[0].kind, RecordKind.SNAPSHOT)
+        self.assertEqual(replayed[0].amount, 60)
+        self.assertEqual(len(replayed), 2)
+
+    def test_recover_balance_replays_tail_after_latest_snapshot(self):
+        self.journal.snapshot("acc", 100)
+        self.journal.record(RecordKind.DEPOSIT, "other", 1000)
+        self.journal.record(RecordKind.DEPOSIT, "acc", 50)
+        self.journal.snapshot("acc", 150)
+        self.journal.record(RecordKind.WITHDRAW, "acc", 30)
+
+        self.assertEqual(self.journal.recover_balance("acc"), 120)
+        with self.assertRaises(KeyError):
+            self.journal.recover_balance("missing")
+
+    def test_recover_balance_across_many_chunks(self):
+        self.journal.snapshot("acc", 0)
+        for _ in range(10000):
+            self.journal.record(RecordKind.DEPOSIT, "acc", 1)
+
+        self.assertEqual(self.journal.recover_balance("acc"), 10000)
+
+    def test_incomplete_trailing_record_is_ignored(self):
+        self.journal.snapshot("acc", 100)
+        self.journal.close()
+        with open(self.path, "ab") as file:
+            file.write(b"\x01\x02")
+
+        journal = self._open()
+        self.assertEqual(len(list(journal)), 1)
+
+    def test_records_after_crash_tail_are_aligned(self):
+        self.journal.snapshot("acc", 100)
+        self.journal.close()
+        with open(self.path, "ab") as file:
+            file.write(b"\x02\x61\x63")
+
+        journal = self._open()
+        journal.record(RecordKind.DEPOSIT, "acc", 5)
+        journal.flush()
+
+        self.assertEqual(os.path.getsize(self.path), 2 * RECORD_SIZE)
+        self.assertEqual(journal.recover_balance("acc"), 105)
+
+    @patch("dfm18.bank_account._journal.os.fsync")
+    def test_fsync_policies(self, mock_fsync: Mock):
+        always = self._open(fsync=FsyncPolicy.ALWAYS)
+        always.snapshot("acc", 1)
+        self.assertEqual(mock_fsync.call_count, 1)
+
+        never = self._open(fsync=FsyncPolicy.NEVER)
+        never.snapshot("acc", 1)
+        never.flush()
+        self.assertEqual(mock_fsync.call_count, 1)
+
+        self.journal.snapshot("acc", 1)
+        self.assertEqual(mock_fsync.call_count, 1)
+        self.journal.flush()
+        self.assertEqual(mock_fsync.call_count, 2)
+
+
+class TestJournaledBankAccount(unittest.TestCase):
+    def setUp(self):
+        directory = tempfile.TemporaryDirectory()
+        self.addCleanup(directory.cleanup)
+        self.journal = TransactionJournal(
+            os.path.join(directory.name, "journal.bin"), snapshot_interval=2
+        )
+        self.addCleanup(self.journal.close)
+
+    def test_account_can_be_rebuilt_from_journal(self):
+        account = SimpleBankAccount(balance=100, account_id="acc", journal=self.journal)
+        account.deposit(50)
+        account.withdraw(20)
+        account.apply_batch(
+            [(PolicyOperation.DEPOSIT, 5), (PolicyOperation.WITHDRAW, 10), (PolicyOperation.DEPOSIT, 1)]
+        )
+
+        rebuilt = SimpleBankAccount.from_journal(self.journal, "acc")
+
+        self.assertEqual(rebuilt.balance, 126)
+        rebuilt.deposit(4)
+        self.assertEqual(self.journal.recover_balance("acc"), 130)
+
+    def test_transfers_are_journaled(self):
+        src = MinorUnitsBankAccount(balance=100, account_id="src", journal=self.journal)
+        dst = MinorUnitsBankAccount(balance=0, account_id="dst", journal=self.journal)
+
+        transfer(src, dst, 0.1)
+        transfer(src, dst, 0.2)
+
+        self.assertEqual(MinorUnitsBankAccount.from_journal(self.journal, "src").balance, 99.7)
+        self.assertEqual(MinorUnitsBankAccount.from_journal(self.journal, "dst").balance, 0.3)
@@ -0,0 +1,112 @@
+import unittest
+
+from unittest.mock import Mock
+
+from concurrent.futures import ThreadPoolExecutor
+
+import random
+
+from dfm18.bank_account import (
+    AccountStore,
+    MinorUnitsBankAccount,
+    SimpleBankAccount,
+    transfer,
+    transfer_many,
+)
+
+from dfm18.bank_account.policies import Policy, PolicyOperation
+
+
+class TestTransfer(unittest.TestCase):
+    def setUp(self):
+        self.src = SimpleBankAccount(balance=1000)
+        self.dst = SimpleBankAccount(balance=500)
+
+    def test_transfer(self):
+        self.assertEqual(transfer(self.src, self.dst, 200), (800, 700))
+        self.assertEqual(self.src.balance, 800)
+        self.assertEqual(self.dst.balance, 700)
+
+    def test_transfer_on_invalid_amount_raises_exception(self):
+        with self.assertRaises(ValueError):
+            transfer(self.src, self.dst, 0)
+        with self.assertRaises(ValueError):
+            transfer(self.src, self.src, 100)
+
+    def test_transfer_on_unsupported_account_raises_type_error(self):
+        store = AccountStore()
+        stored = store.account(store.add_account(balance=100))
+
+        with self.assertRaises(TypeError):
+            transfer(self.src, stored, 100)
+        with self.assertRaises(TypeError):
+            transfer_many([(self.src, self.dst, 100), (stored, self.dst, 50)])
+
+        self.assertEqual(self.src.balance, 1000)
+        self.assertEqual(self.dst.balance, 500)
+        self.assertEqual(stored.balance, 100)
+
+    def test_transfer_applies_policies_of_both_accounts(self):
+        src_policy = Mock(spec=Policy)
+        src_policy.supports.side_effect = lambda op: op == PolicyOperation.WITHDRAW
+        dst_policy = Mock(spec=Policy)
+        dst_policy.supports.side_effect = lambda op: op == PolicyOperation.DEPOSIT
+        self.src.add_policy(src_policy)
+        self.dst.add_policy(dst_policy)
+
+        transfer(self.src, self.dst, 100)
+
+        src_policy.apply.assert_called_once_with(self.src, 100)
+        dst_policy.apply.assert_called_once_with(self.dst, 100)
+
+    def test_transfer_on_policy_violation_applies_nothing(self):
+        policy = Mock(spec=Policy)
+        policy.supports.return_value = True
+        policy.apply.side_effect = Exception("Policy Restriction")
+        self.dst.add_policy(policy)
+
+        with self.assertRaises(Exception):
+            transfer(self.src, self.dst, 100)
+
+        self.assertEqual(self.src.balance, 1000)
+        self.assertEqual(self.dst.balance, 500)
+
+    def test_transfer_logs_one_record(self):
+        with self.assertLogs(self.src._logger) as log_file:
+            transfer(self.src, self.dst, 100)
+
+        self.assertEqual(len(log_file.output), 1)
+        self.assertIn(
+            f"Transferred 100.00 to account {self.dst.account_id}. New balance: 900.00",
+            log_file.output[0],
+        )
+
+    def test_transfer_many_is_atomic(self):
+        third = MinorUnitsBankAccount(balance=10)
+
+        balances = transfer_many([(self.src, self.dst, 100), (self.dst, third, 0.5)])
+        self.assertEqual(balances, [(900, 600), (599.5, 10.5)])
+
+        with self.assertRaises(ValueError):
+            transfer_many([(self.src, self.dst, 100), (self.dst, third, 0.001)])
+
+        self.assertEqual(self.src.balance, 900)
+        self.assertEqual(self.dst.balance, 599.5)
+        self.assertEqual(third.balance, 10.5)
+
+    def test_concurrent_transfers_preserve_total_balance(self):
+        accounts = [
+            MinorUnitsBankAccount(balance=1000, thread_safe=True) for _ in range(8)
+        ]
+
+        def worker(seed):
+            rng = random.Random(seed)
+            for _ in range(500):
+                src, dst = rng.sample(accounts, 2)
+                transfer(src, dst, 1)
+
+        with ThreadPoolExecutor(max_workers=8) as executor:
+            for future in [executor.submit(worker, seed) for seed in range(8)]:
+                future.result(timeout=30)
+
+        self.assertEqual(sum(account.balance for account in accounts), 8000)
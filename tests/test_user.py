@@ -6,9 +6,9 @@ from faker import Faker
 
 from email_validator import EmailNotValidError
 
-from dfm18.user import User
+from dfm18.user import User, UserRegistry, _EmailErrorCache
 
-from dfm18.bank_account import BankAccount
+from dfm18.bank_account import AccountStore, BankAccount, SimpleBankAccount
 
 
 class TestUser(unittest.TestCase):
@@ -70,3 +70,191 @@ class TestUser(unittest.TestCase):
 
         account1.get_balance.assert_called_once()
         account2.get_balance.assert_called_once()
+
+    @patch("dfm18.user.validate_email")
+    def test_tracked_total_balance_follows_account_operations(
+        self, mock_validate_email: Mock
+    ):
+        user = User(
+            name=self.faker.name(), email=self.faker.email(), track_balance=True
+        )
+
+        account1 = SimpleBankAccount(balance=100)
+        account2 = SimpleBankAccount(balance=200)
+        user.add_account(account1)
+        user.add_account(account2)
+
+        account1.deposit(50)
+        account2.withdraw(25)
+
+        with patch.object(SimpleBankAccount, "get_balance") as mock_get_balance:
+            self.assertEqual(user.get_total_balance(), 325)
+            mock_get_balance.assert_not_called()
+
+        self.assertTrue(user.is_total_balance_consistent())
+
+    @patch("dfm18.user.validate_email")
+    def test_tracked_total_balance_with_accounts_without_listeners(
+        self, mock_validate_email: Mock
+    ):
+        user = User(
+            name=self.faker.name(), email=self.faker.email(), track_balance=True
+        )
+
+        account1 = SimpleBankAccount(balance=100)
+        account2 = Mock(spec=BankAccount)
+        account2.get_balance.return_value = 200.0
+        user.add_account(account1)
+        user.add_account(account2)
+
+        account1.deposit(50)
+
+        self.assertEqual(user.get_total_balance(), 350.0)
+        self.assertTrue(user.is_total_balance_consistent())
+
+    def test_from_records(self):
+        users, errors = User.from_records(
+            [
+                ("Ann", "ann@example.com"),
+                ("Bob", "invalid-email"),
+                ("Carl", "carl@example.com"),
+            ],
+            track_balance=True,
+        )
+
+        self.assertEqual([user.name for user in users], ["Ann", "Carl"])
+        self.assertEqual(users[1].email, "carl@example.com")
+        self.assertTrue(users[0].track_balance)
+        self.assertEqual(len(errors), 1)
+        self.assertEqual(errors[0].index, 1)
+        self.assertEqual(errors[0].record, ("Bob", "invalid-email"))
+        self.assertTrue(errors[0].error.startswith("Invalid email: "))
+
+    def test_from_records_validates_emails_like_the_constructor(self):
+        with self.assertRaises(ValueError):
+            User("Ann", " ann@example.com ")
+
+        users, errors = User.from_records(
+            [("Ann", " ann@example.com "), ("Bob", None), ("Carl", "carl@example.com")]
+        )
+
+        self.assertEqual([user.email for user in users], ["carl@example.com"])
+        self.assertEqual([error.index for error in errors], [0, 1])
+        self.assertIn("SPACE", errors[0].error)
+        self.assertEqual(errors[1].error, "Invalid email: The email must be a string.")
+
+    @patch("dfm18.user._email_errors", _EmailErrorCache(2))
+    @patch("dfm18.user.validate_email")
+    def test_from_records_validates_each_normalized_email_once(
+        self, mock_validate_email: Mock
+    ):
+        users, errors = User.from_records(
+            [
+                ("Ann", "ann@example.com"),
+                ("Ann", "ann@EXAMPLE.com"),
+                ("Bob", "bob@example.com"),
+            ]
+        )
+        User.from_records([("Bob", "bob@example.com")])
+
+        self.assertEqual(len(users), 3)
+        self.assertEqual(errors, [])
+        self.assertEqual(mock_validate_email.call_count, 2)
+
+    @patch("dfm18.user._email_errors", _EmailErrorCache(2))
+    @patch("dfm18.user.validate_email")
+    def test_from_records_cache_is_bounded(self, mock_validate_email: Mock):
+        User.from_records([("Ann", "ann@example.com"), ("Bob", "bob@example.com")])
+        User.from_records([("Carl", "carl@example.com")])
+        User.from_records([("Ann", "ann@example.com")])
+
+        self.assertEqual(mock_validate_email.call_count, 4)
+
+    @patch("dfm18.user._email_errors", _EmailErrorCache(16))
+    def test_from_records_with_process_pool(self):
+        records = [(self.faker.name(), self.faker.email()) for _ in range(5)]
+        records.append(("Bob", "invalid-email"))
+
+        users, errors = User.from_records(records, processes=2)
+
+        self.assertEqual(len(users), 5)
+        self.assertEqual([error.index for error in errors], [5])
+
+
+class TestUserRegistry(unittest.TestCase):
+    def setUp(self):
+        self.registry = UserRegistry()
+        self.ann = User("Ann Smith", "ann@example.com", track_balance=True)
+        self.anna = User("anna Jones", "anna@example.com")
+        self.bob = User("Bob Brown", "bob@example.com", track_balance=True)
+        for user in [self.ann, self.anna, self.bob]:
+            self.registry.add(user)
+
+    def test_get_by_normalized_email(self):
+        self.assertEqual(len(self.registry), 3)
+        self.assertIs(self.registry.get("Ann@Example.com "), self.ann)
+        self.assertIn("BOB@example.com", self.registry)
+        self.assertIsNone(self.registry.get("carl@example.com"))
+
+    def test_add_on_duplicate_email_raises_exception(self):
+        with self.assertRaises(ValueError):
+            self.registry.add(User("Other Ann", "ANN@example.com"))
+        self.assertEqual(len(self.registry), 3)
+
+    def test_find_by_name_prefix(self):
+        self.assertEqual(self.registry.find_by_name_prefix("AN"), [self.ann, self.anna])
+        self.assertEqual(self.registry.find_by_name_prefix("anna"), [self.anna])
+        self.assertEqual(self.registry.find_by_name_prefix("c"), [])
+
+    def test_remove(self):
+        self.assertIs(self.registry.remove("anna@example.com"), self.anna)
+
+        self.assertEqual(len(self.registry), 2)
+        self.assertEqual(self.registry.find_by_name_prefix("an"), [self.ann])
+        with self.assertRaises(KeyError):
+            self.registry.remove("anna@example.com")
+
+    def test_find_by_name_prefix_after_many_changes(self):
+        self.registry.remove("anna@example.com")
+        self.registry.add(self.anna)
+        self.registry.remove("bob@example.com")
+        users = [User(f"Ann {index:03d}", f"ann{index}@example.com") for index in range(100)]
+        for user in users:
+            self.registry.add(user)
+        for user in users[::2]:
+            self.registry.remove(user.email)
+
+        self.assertEqual(
+            self.registry.find_by_name_prefix("an"), [*users[1::2], self.ann, self.anna]
+        )
+        self.assertEqual(self.registry.find_by_name_prefix("b"), [])
+
+    def test_total_balance_is_maintained_incrementally(self):
+        ann_account = SimpleBankAccount(balance=100)
+        self.ann.add_account(ann_account)
+        self.bob.add_account(SimpleBankAccount(balance=50))
+        untracked_account = Mock(spec=BankAccount)
+        untracked_account.get_balance.return_value = 25.0
+        self.anna.add_account(untracked_account)
+
+        ann_account.withdraw(30)
+        self.assertEqual(self.registry.get_total_balance(), 145)
+
+        self.registry.remove("bob@example.com")
+        self.registry.remove("anna@example.com")
+        ann_account.deposit(10)
+        self.assertEqual(self.registry.get_total_balance(), 80)
+
+    def test_total_balance_includes_untracked_accounts_of_tracked_users(self):
+        store = AccountStore()
+        stored = store.account(store.add_account(balance=100))
+        self.ann.add_account(stored)
+        self.ann.add_account(SimpleBankAccount(balance=50))
+
+        stored.withdraw(50)
+        self.assertEqual(self.ann.get_total_balance(), 100)
+        self.assertEqual(self.registry.get_total_balance(), 100)
+        self.assertEqual(list(self.registry._users_with_untracked_accounts.values()), [self.ann])
+
+        self.registry.remove("ann@example.com")
+        self.assertEqual(self.registry.get_total_balance(), 0)
@@ -7,6 +7,7 @@ from datetime import datetime
 from dfm18.bank_account.policies._base import PolicyOperation
 
 from dfm18.bank_account.policies._withdrawal_time_restriction import (
+    CachedHourClock,
     WithdrawalTimeRestrictionPolicy,
     WithdrawalTimeRestrictionError,
 )
@@ -61,3 +62,58 @@ class TestWithdrawalTimeRestrictionPolicy(unittest.TestCase):
 
         self.assertTrue(policy.supports(policy.supported_operations))
         self.assertFalse(policy.supports(PolicyOperation.DEPOSIT))
+
+    @patch("dfm18.bank_account._base.BankAccount")
+    @patch("dfm18.bank_account.policies._withdrawal_time_restriction.datetime")
+    def test_apply_batch_checks_time_once(
+        self, mock_datetime: Mock, mock_account: Mock
+    ):
+        mock_datetime.now.return_value = datetime(2024, 1, 1, 18, 0, 0, 0)
+        policy = WithdrawalTimeRestrictionPolicy(8, 17)
+
+        with self.assertRaises(WithdrawalTimeRestrictionError):
+            policy.apply_batch(mock_account, [100, 200, 300])
+
+        mock_datetime.now.assert_called_once()
+
+    def test_apply_with_injected_clock(self):
+        hours = iter([10, 18])
+        policy = WithdrawalTimeRestrictionPolicy(8, 17, clock=lambda: next(hours))
+
+        policy.apply(Mock(), 100)
+        with self.assertRaises(WithdrawalTimeRestrictionError):
+            policy.apply(Mock(), 100)
+
+    def test_allowed_hours_wrapping_around_midnight(self):
+        policy = WithdrawalTimeRestrictionPolicy(22, 6)
+
+        for hour in [22, 23, 0, 3, 6]:
+            self.assertTrue(policy.is_allowed_hour(hour))
+        for hour in [7, 12, 21]:
+            self.assertFalse(policy.is_allowed_hour(hour))
+
+    def test_allowed_hours_with_end_hour_24(self):
+        policy = WithdrawalTimeRestrictionPolicy(20, 24)
+
+        self.assertTrue(policy.is_allowed_hour(23))
+        self.assertFalse(policy.is_allowed_hour(0))
+
+    @patch("dfm18.bank_account.policies._withdrawal_time_restriction.time")
+    @patch("dfm18.bank_account.policies._withdrawal_time_restriction.datetime")
+    def test_cached_hour_clock_reads_wall_clock_once_per_hour(
+        self, mock_datetime: Mock, mock_time: Mock
+    ):
+        mock_datetime.now.side_effect = [
+            datetime(2024, 1, 1, 10, 59, 0, 0),
+            datetime(2024, 1, 1, 11, 0, 0, 0),
+        ]
+        mock_time.monotonic.return_value = 1000.0
+        clock = CachedHourClock()
+
+        self.assertEqual(clock(), 10)
+        mock_time.monotonic.return_value = 1059.0
+        self.assertEqual(clock(), 10)
+        mock_time.monotonic.return_value = 1060.0
+        self.assertEqual(clock(), 11)
+
+        self.assertEqual(mock_datetime.now.call_count, 2)
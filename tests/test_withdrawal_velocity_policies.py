@@ -0,0 +1,194 @@
+import unittest
+
+from unittest.mock import Mock
+
+from dfm18.bank_account import AccountStore, SimpleBankAccount, transfer_many
+
+from dfm18.bank_account.policies import (
+    Policy,
+    PolicyOperation,
+    WithdrawalAmountLimitPolicy,
+    WithdrawalRateLimitPolicy,
+)
+
+from dfm18.bank_account.exceptions import (
+    WithdrawalAmountLimitError,
+    WithdrawalRateLimitError,
+)
+
+
+class TestWithdrawalRateLimitPolicy(unittest.TestCase):
+    def setUp(self):
+        self.now = 0.0
+        self.policy = WithdrawalRateLimitPolicy(3, 60, clock=lambda: self.now)
+        self.account = SimpleBankAccount(balance=1000, policies=[self.policy])
+
+    def test_initialization_with_invalid_limits_raises_exception(self):
+        with self.assertRaises(ValueError):
+            WithdrawalRateLimitPolicy(0, 60)
+        with self.assertRaises(ValueError):
+            WithdrawalRateLimitPolicy(1, 0)
+
+    def test_withdraw_over_limit_raises_exception(self):
+        for _ in range(3):
+            self.account.withdraw(10)
+
+        with self.assertRaises(WithdrawalRateLimitError):
+            self.account.withdraw(10)
+        self.assertEqual(self.account.balance, 970)
+
+    def test_apply_does_not_record_withdrawals(self):
+        for _ in range(5):
+            self.policy.apply(self.account, 10)
+
+    def test_window_slides(self):
+        for second in [0, 10, 20]:
+            self.now = second
+            self.account.withdraw(10)
+
+        self.now = 59.9
+        with self.assertRaises(WithdrawalRateLimitError):
+            self.account.withdraw(10)
+
+        self.now = 60
+        self.account.withdraw(10)
+        with self.assertRaises(WithdrawalRateLimitError):
+            self.account.withdraw(10)
+
+        self.now = 70
+        self.account.withdraw(10)
+
+    def test_accounts_have_separate_limits(self):
+        other = SimpleBankAccount(balance=1000, policies=[self.policy])
+        for _ in range(3):
+            self.account.withdraw(10)
+
+        other.withdraw(10)
+
+    def test_state_is_released_with_account(self):
+        SimpleBankAccount(balance=10, policies=[self.policy]).withdraw(10)
+
+        self.assertEqual(len(self.policy._windows), 0)
+
+    def test_supported_operations(self):
+        self.assertTrue(self.policy.supports(PolicyOperation.WITHDRAW))
+        self.assertFalse(self.policy.supports(PolicyOperation.DEPOSIT))
+
+    def test_withdrawals_rejected_by_other_policies_do_not_count(self):
+        restriction = Mock(spec=Policy)
+        restriction.supports.return_value = True
+        restriction.apply.side_effect = [Exception("Policy Restriction")] * 3 + [None] * 3
+        self.account.add_policy(restriction)
+
+        for _ in range(3):
+            with self.assertRaises(Exception):
+                self.account.withdraw(10)
+        for _ in range(3):
+            self.account.withdraw(10)
+
+        self.assertEqual(self.account.balance, 970)
+
+    def test_rejected_batch_does_not_count(self):
+        withdrawals = [(PolicyOperation.WITHDRAW, 10)] * 4
+
+        with self.assertRaises(WithdrawalRateLimitError):
+            self.account.apply_batch(withdrawals)
+        self.account.apply_batch(withdrawals[:3])
+
+        with self.assertRaises(WithdrawalRateLimitError):
+            self.account.withdraw(10)
+        self.assertEqual(self.account.balance, 970)
+
+    def test_transfers_of_one_account_are_checked_together(self):
+        other = SimpleBankAccount()
+
+        with self.assertRaises(WithdrawalRateLimitError):
+            transfer_many([(self.account, other, 10)] * 4)
+        transfer_many([(self.account, other, 10)] * 3)
+
+        self.assertEqual(self.account.balance, 970)
+
+    def test_account_store_views_share_state(self):
+        store = AccountStore()
+        index = store.add_account(balance=100, policies=[self.policy])
+
+        store.withdraw_many([index, index, index], 1)
+        with self.assertRaises(WithdrawalRateLimitError):
+            store.account(index).withdraw(1)
+
+    def test_account_store_state_is_released_with_store(self):
+        store = AccountStore()
+        index = store.add_account(balance=100, policies=[self.policy])
+        store.withdraw_many([index], 1)
+        self.assertEqual(len(self.policy._windows), 1)
+
+        del store
+
+        self.assertEqual(len(self.policy._windows), 0)
+
+
+class TestWithdrawalAmountLimitPolicy(unittest.TestCase):
+    def setUp(self):
+        self.now = 0.0
+        self.policy = WithdrawalAmountLimitPolicy(
+            100, 60, buckets=6, clock=lambda: self.now
+        )
+        self.account = SimpleBankAccount(balance=1000, policies=[self.policy])
+
+    def test_initialization_with_invalid_limits_raises_exception(self):
+        with self.assertRaises(ValueError):
+            WithdrawalAmountLimitPolicy(0, 60)
+        with self.assertRaises(ValueError):
+            WithdrawalAmountLimitPolicy(100, 60, buckets=0)
+
+    def test_withdraw_over_limit_raises_exception(self):
+        self.account.withdraw(60)
+        self.account.withdraw(40)
+
+        with self.assertRaises(WithdrawalAmountLimitError):
+            self.account.withdraw(0.01)
+        self.assertEqual(self.account.balance, 900)
+
+    def test_window_slides_one_bucket_at_a_time(self):
+        self.account.withdraw(60)
+        self.now = 30
+        self.account.withdraw(40)
+
+        self.now = 59
+        self.assertEqual(self.policy.withdrawn(self.account), 100)
+        self.now = 60
+        self.assertEqual(self.policy.withdrawn(self.account), 40)
+        self.account.withdraw(60)
+
+        self.now = 500
+        self.assertEqual(self.policy.withdrawn(self.account), 0)
+
+    def test_apply_batch_checks_total_amount(self):
+        with self.assertRaises(WithdrawalAmountLimitError):
+            self.account.apply_batch(
+                [(PolicyOperation.WITHDRAW, 60), (PolicyOperation.WITHDRAW, 50)]
+            )
+        self.assertEqual(self.policy.withdrawn(self.account), 0)
+
+    def test_rolled_back_transfers_do_not_count(self):
+        other = SimpleBankAccount()
+
+        with self.assertRaises(WithdrawalAmountLimitError):
+            transfer_many([(self.account, other, 60), (self.account, other, 50)])
+
+        self.assertEqual(self.policy.withdrawn(self.account), 0)
+        self.assertEqual(self.account.balance, 1000)
+
+    def test_withdrawals_rejected_by_other_policies_do_not_count(self):
+        restriction = Mock(spec=Policy)
+        restriction.supports.return_value = True
+        restriction.apply.side_effect = Exception("Policy Restriction")
+        self.account.add_policy(restriction)
+
+        with self.assertRaises(Exception):
+            self.account.withdraw(60)
+
+        self.assertEqual(self.policy.withdrawn(self.account), 0)
+
+    def test_withdrawn_for_unknown_account(self):
+        self.assertEqual(self.policy.withdrawn(Mock()), 0)